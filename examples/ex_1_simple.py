@@ -16,4 +16,4 @@ print(f"Scores: {res_con['scores']}")
 
 print(f"Reasoning: {res_con['reasoning']}")
 
-print(json.dumps(result["contradictions"], indent=4))
+print(json.dumps(result["contradictions"].to_dict(), indent=4))
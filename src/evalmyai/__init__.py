@@ -1,3 +1,55 @@
-from evalmyai._evalmyai import Evaluator, OpenAIAuth, AzureAuth
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["Evaluator", "OpenAIAuth", "AzureAuth"]
+# The public names by their module. They are imported on the first access, so that importing
+# a submodule, e.g. the pytest plugin loaded by every pytest session, does not import pandas.
+_EXPORTS = {
+    "Evaluator": "evalmyai._evalmyai",
+    "OpenAIAuth": "evalmyai._evalmyai",
+    "AzureAuth": "evalmyai._evalmyai",
+    "EvaluationConfig": "evalmyai._config",
+    "EvaluationBroker": "evalmyai._broker",
+    "HedgingPolicy": "evalmyai._hedging",
+    "SamplingPolicy": "evalmyai._sampling",
+    "BatchingPolicy": "evalmyai._batching",
+    "SimulatedServer": "evalmyai._simulator",
+    "EvaluationJob": "evalmyai._jobs",
+    "SymbolResult": "evalmyai._result",
+    "Reasoning": "evalmyai._result",
+    "select_shard": "evalmyai._sharding",
+    "merge_shards": "evalmyai._sharding",
+    "preflight_dataset": "evalmyai._validators",
+    "score_frame": "evalmyai._summary",
+    "summarize": "evalmyai._summary",
+    "severity_counts": "evalmyai._summary",
+    "compare_runs": "evalmyai._summary",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'evalmyai' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from evalmyai._evalmyai import Evaluator, OpenAIAuth, AzureAuth
+    from evalmyai._config import EvaluationConfig
+    from evalmyai._broker import EvaluationBroker
+    from evalmyai._hedging import HedgingPolicy
+    from evalmyai._sampling import SamplingPolicy
+    from evalmyai._batching import BatchingPolicy
+    from evalmyai._simulator import SimulatedServer
+    from evalmyai._jobs import EvaluationJob
+    from evalmyai._result import SymbolResult, Reasoning
+    from evalmyai._sharding import select_shard, merge_shards
+    from evalmyai._validators import preflight_dataset
+    from evalmyai._summary import score_frame, summarize, severity_counts, compare_runs
@@ -0,0 +1,117 @@
+import argparse
+import json
+import sys
+
+from evalmyai._broker import EvaluationBroker, DEFAULT_BROKER_ADDRESS, DEFAULT_API_URL
+from evalmyai._simulator import SimulatedServer
+from evalmyai._batching import BatchingPolicy
+from evalmyai._benchmark import run_benchmark, METHODS
+
+
+def main(argv: list = None) -> None:
+    """Runs the evalmyai command line interface."""
+    parser = argparse.ArgumentParser(prog="python -m evalmyai", description="EVALMY.AI tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    broker = commands.add_parser("broker", help="Run a local evaluation broker.")
+    broker.add_argument(
+        "--address",
+        default=DEFAULT_BROKER_ADDRESS,
+        help=f"'host:port' or 'unix:/path/to/socket', defaults to {DEFAULT_BROKER_ADDRESS}.",
+    )
+    broker.add_argument("--rate", type=float, help="Maximal requests per second to the service.")
+    broker.add_argument("--burst", type=int, default=1, help="Requests let through at once.")
+    broker.add_argument("--cache-size", type=int, default=10000, help="Number of cached responses.")
+    broker.add_argument("--pool-size", type=int, default=32, help="Size of the connection pool.")
+    broker.add_argument(
+        "--api-url",
+        default=DEFAULT_API_URL,
+        help=f"The only API address requests are forwarded to, defaults to {DEFAULT_API_URL}.",
+    )
+
+    simulate = commands.add_parser("simulate", help="Run a local simulated evalmy.ai service.")
+    simulate.add_argument("--address", default="127.0.0.1:8080", help="'host:port', defaults to 127.0.0.1:8080.")
+    simulate.add_argument("--latency", type=float, default=0.0, help="Base latency of a request in seconds.")
+    simulate.add_argument("--per-kchar", type=float, default=0.0, help="Latency per 1000 characters in seconds.")
+    simulate.add_argument("--jitter", type=float, default=0.0, help="Std of the log-normal latency noise.")
+    simulate.add_argument("--error-rate", type=float, default=0.0, help="Probability of a failure.")
+    simulate.add_argument("--seed", type=int, help="Seed of the latency noise and failures.")
+
+    bench = commands.add_parser("bench", help="Benchmark the client against a local simulated service.")
+    bench.add_argument("--methods", nargs="+", choices=METHODS, default=METHODS, help="Benchmarked methods.")
+    bench.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16], help="Values of max_workers.")
+    bench.add_argument("--chars", nargs="+", type=int, default=[200], help="Characters of each text.")
+    bench.add_argument("--symbols", nargs="+", type=int, default=[1], help="Numbers of evaluated symbols.")
+    bench.add_argument("--latency", nargs="+", type=float, default=[0.05], help="Base server latencies in seconds.")
+    bench.add_argument("--rows", type=int, default=200, help="Rows of a single run.")
+    bench.add_argument("--per-kchar", type=float, default=0.0, help="Server latency per 1000 characters in seconds.")
+    bench.add_argument("--jitter", type=float, default=0.0, help="Std of the log-normal latency noise.")
+    bench.add_argument("--error-rate", type=float, default=0.0, help="Probability of a server failure.")
+    bench.add_argument("--batch-rows", type=int, help="Batch requests of at most this many rows.")
+    bench.add_argument("--repeat", type=int, default=1, help="Runs of each combination.")
+    bench.add_argument("--seed", type=int, default=0, help="Seed of the data and the server noise.")
+    bench.add_argument("--no-memory", action="store_true", help="Do not trace the Python allocations.")
+    bench.add_argument("--output", help="Path of the JSON report, defaults to the standard output.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "broker":
+        server = EvaluationBroker(
+            address=args.address,
+            rate=args.rate,
+            burst=args.burst,
+            cache_size=args.cache_size,
+            pool_size=args.pool_size,
+            api_url=args.api_url,
+        )
+        print(f"Evalmyai broker listening on {server.server_address}.", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+
+    elif args.command == "simulate":
+        server = SimulatedServer(
+            address=args.address,
+            latency=args.latency,
+            per_kchar=args.per_kchar,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        print(f"Simulated evalmyai service at {server.url}.", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+
+    elif args.command == "bench":
+        report = run_benchmark(
+            methods=args.methods,
+            concurrency=args.concurrency,
+            chars=args.chars,
+            symbols=args.symbols,
+            latency=args.latency,
+            rows=args.rows,
+            per_kchar=args.per_kchar,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            batching=BatchingPolicy(max_rows=args.batch_rows) if args.batch_rows else None,
+            repeat=args.repeat,
+            seed=args.seed,
+            trace_memory=not args.no_memory,
+        )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+            print()
+
+
+if __name__ == "__main__":
+    main()
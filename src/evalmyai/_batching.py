@@ -0,0 +1,74 @@
+from collections.abc import Sequence
+
+# The path of the batch endpoint, relative to the API address.
+BATCH_PATH = "symbol/evaluate/batch/v1"
+
+
+class BatchingPolicy:
+    """
+    Micro-batching policy, packing many entries into a single request to the batch endpoint.
+
+    Entries are packed in their order until the batch has `max_rows` entries or its texts exceed
+    `max_chars` characters, so short entries travel in large batches and long ones in small batches.
+    An entry longer than `max_chars` is sent alone. The authentication, the scoring and the shared
+    context are sent once per batch.
+
+    The batch endpoint is `[url]/symbol/evaluate/batch/v1` of the Evaluator `url`, it is provided
+    e.g. by the local `SimulatedServer`. A request
+    `{"auth", "api_token", "context", "symbols": {symbol: {"version", "scoring", "aggregation"}}, "items": [input_data]}`
+    is answered by `{"results": [...]}` with one item per entry, either `{symbol: {"scores", "reasoning"}}`
+    or `{"error": {"status_code", "message"}}`.
+
+    Args:
+        max_rows (int, optional): The maximal number of entries in a batch. Defaults to 32.
+        max_chars (int, optional): The maximal number of text characters in a batch. Defaults to 100000.
+        combine_symbols (bool, optional): Whether all symbols are evaluated by a single batch request,
+            otherwise a batch is sent for each symbol. Defaults to `True`.
+
+    Raises:
+        ValueError: If any input is invalid.
+
+    Examples
+    --------
+    ```{python}
+    from evalmyai import BatchingPolicy
+
+    evaluator = Evaluator(auth, token, url=server.url, batching=BatchingPolicy(max_rows=64))
+    result = evaluator.evaluate_dataset(data, symbols=["contradictions", "f1"], max_workers=4)
+    ```
+    """
+
+    def __init__(self, max_rows: int = 32, max_chars: int = 100_000, combine_symbols: bool = True):
+        if not isinstance(max_rows, int) or max_rows < 1:
+            raise ValueError("Max rows must be a positive integer.")
+
+        if not isinstance(max_chars, int) or max_chars < 1:
+            raise ValueError("Max chars must be a positive integer.")
+
+        self.max_rows = max_rows
+        self.max_chars = max_chars
+        self.combine_symbols = combine_symbols
+
+    def pack(self, sizes: Sequence[int]) -> list:
+        """
+        Packs entries into batches.
+
+        Args:
+            sizes (Sequence[int]): The text length of each entry.
+
+        Returns:
+            list: A list of batches, each a list of entry positions.
+        """
+        batches = []
+        batch, chars = [], 0
+
+        for i, size in enumerate(sizes):
+            if batch and (len(batch) >= self.max_rows or chars + size > self.max_chars):
+                batches.append(batch)
+                batch, chars = [], 0
+            batch.append(i)
+            chars += size
+
+        if batch:
+            batches.append(batch)
+        return batches
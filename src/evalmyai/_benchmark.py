@@ -0,0 +1,293 @@
+import contextlib
+import copy
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+import numpy as np
+import pandas as pd
+
+from evalmyai._evalmyai import Evaluator, OpenAIAuth, SYMBOLS, DEFAULT_SCORING
+from evalmyai._batching import BatchingPolicy
+from evalmyai._simulator import SimulatedServer
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+METHODS = ["evaluate_batch", "evaluate_dataset", "evaluate_test_case"]
+
+# The quantiles of the task wall time reported by a benchmark run.
+TASK_QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "max": 1.0}
+
+# The simulated server checks only that a token is present.
+BENCHMARK_TOKEN = "0" * 64
+
+VOCABULARY = [
+    "paris", "capital", "france", "river", "seine", "city", "population", "million", "museum", "tower",
+    "built", "century", "known", "largest", "country", "europe", "north", "bank", "founded", "king",
+]
+
+
+def synthetic_entries(rows: int, chars: int, seed: int = 0) -> list:
+    """Generates entries of random words, the actual text differing from the expected one in a few words.
+
+    Args:
+        rows (int): The number of entries.
+        chars (int): The approximate number of characters of each text.
+        seed (int, optional): The seed of the generator. Defaults to 0.
+
+    Returns:
+        list: A list of {"expected", "actual"} dictionaries.
+    """
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(rows):
+        words = []
+        while sum(len(w) + 1 for w in words) < chars:
+            words.append(rng.choice(VOCABULARY))
+        actual = [rng.choice(VOCABULARY) if rng.random() < 0.1 else w for w in words]
+        entries.append({"expected": " ".join(words), "actual": " ".join(actual)})
+    return entries
+
+
+def run_benchmark(
+    methods: Sequence[str] = METHODS,
+    concurrency: Sequence[int] = (1, 4, 16),
+    chars: Sequence[int] = (200,),
+    symbols: Sequence[int] = (1,),
+    latency: Sequence[float] = (0.05,),
+    rows: int = 200,
+    per_kchar: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    batching: BatchingPolicy = None,
+    repeat: int = 1,
+    seed: int = 0,
+    trace_memory: bool = True,
+    isolate_server: bool = True,
+) -> OrderedDict:
+    """Benchmarks the evaluator against a local simulated server.
+
+    Every combination of the method, concurrency, text length, symbol count and server latency is run
+    `repeat` times on the same synthetic data. The server runs in a separate process by default, so that
+    the client CPU time is not mixed with the server work.
+
+    Args:
+        methods (Sequence[str], optional): The benchmarked methods, any of "evaluate_batch",
+            "evaluate_dataset" and "evaluate_test_case". Defaults to all of them.
+        concurrency (Sequence[int], optional): The values of `max_workers`. Defaults to (1, 4, 16).
+        chars (Sequence[int], optional): The characters of the expected and actual texts. Defaults to (200,).
+        symbols (Sequence[int], optional): The numbers of evaluated symbols, at most 3. Defaults to (1,).
+        latency (Sequence[float], optional): The base server latencies in seconds. Defaults to (0.05,).
+        rows (int, optional): The number of rows of a run. Defaults to 200.
+        per_kchar (float, optional): The server latency per thousand characters in seconds. Defaults to 0.
+        jitter (float, optional): The standard deviation of the log-normal latency noise. Defaults to 0.
+        error_rate (float, optional): The probability of a server failure. Defaults to 0.
+        batching (BatchingPolicy, optional): The batching policy of the evaluator. Defaults to `None`.
+        repeat (int, optional): The number of runs of each combination. Defaults to 1.
+        seed (int, optional): The seed of the data and the server noise. Defaults to 0.
+        trace_memory (bool, optional): Whether the peak of the Python allocations is traced, which slows
+            the client down and inflates its CPU time. A tracing started by the caller is kept on, only its
+            peak is reset by every run. Defaults to `True`.
+        isolate_server (bool, optional): Whether the server runs in a separate process, otherwise
+            in a thread of this process. Defaults to `True`.
+
+    Returns:
+        OrderedDict: A JSON-serializable report with the 'environment', the 'parameters', the 'runs',
+            a list with the throughput, CPU time, task time percentiles and memory of every run, and the
+            'curves', the median throughput by concurrency for every other combination. The 'task_seconds'
+            percentiles are the wall times of the scheduled tasks (a request or a batch), including their
+            retries and the waits for the rate limiter, not the bare request latency. The
+            'process_peak_rss_bytes' is the resident memory high-water mark of the whole process so far,
+            not of the single run.
+
+    Raises:
+        ValueError: If any input is invalid.
+    """
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Wrong method: {method}, one of {METHODS} expected.")
+
+    for n in symbols:
+        if not isinstance(n, int) or not 1 <= n <= len(SYMBOLS):
+            raise ValueError(f"Symbols must be integers between 1 and {len(SYMBOLS)}.")
+
+    for name, value in (("Rows", rows), ("Repeat", repeat)):
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"{name} must be a positive integer.")
+
+    runs = []
+
+    for lat in latency:
+        profile = OrderedDict(
+            latency=lat, per_kchar=per_kchar, jitter=jitter, error_rate=error_rate, seed=seed
+        )
+        with _start_server(profile, isolate_server) as url:
+            evaluator = Evaluator(
+                OpenAIAuth(api_key="benchmark", model="simulated"),
+                BENCHMARK_TOKEN,
+                url=url,
+                batching=batching,
+            )
+            for size in chars:
+                entries = synthetic_entries(rows, size, seed)
+                for n_symbols in symbols:
+                    for method in methods:
+                        for workers in concurrency:
+                            for k in range(repeat):
+                                run = OrderedDict(
+                                    method=method,
+                                    concurrency=workers,
+                                    chars=size,
+                                    symbols=n_symbols,
+                                    server_latency=lat,
+                                    repeat=k,
+                                )
+                                run.update(
+                                    _run_once(evaluator, method, entries, SYMBOLS[:n_symbols], workers, trace_memory)
+                                )
+                                runs.append(run)
+
+    return OrderedDict(
+        environment=OrderedDict(
+            python=platform.python_version(),
+            platform=platform.platform(),
+            cpu_count=os.cpu_count(),
+            time=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        ),
+        parameters=OrderedDict(
+            rows=rows,
+            per_kchar=per_kchar,
+            jitter=jitter,
+            error_rate=error_rate,
+            batching=None if batching is None else vars(batching).copy(),
+            repeat=repeat,
+            seed=seed,
+            trace_memory=trace_memory,
+            isolate_server=isolate_server,
+        ),
+        runs=runs,
+        curves=_curves(runs),
+    )
+
+
+def _run_once(
+    evaluator: Evaluator, method: str, entries: list, symbols: list, max_workers: int, trace_memory: bool
+) -> OrderedDict:
+    """Runs a single benchmark call and measures it."""
+    if method == "evaluate_batch":
+        call = lambda: evaluator.evaluate_batch(entries, symbols=symbols, max_workers=max_workers)
+        count_errors = lambda res: sum(e is not None for e in res[1])
+    elif method == "evaluate_dataset":
+        data = pd.DataFrame(entries)
+        call = lambda: evaluator.evaluate_dataset(data, symbols=symbols, max_workers=max_workers)
+        count_errors = lambda res: int(res["error"].notna().sum())
+    else:
+        test_case = {
+            "context": "Benchmark test case.",
+            "scoring": {s: copy.deepcopy(DEFAULT_SCORING[s]) for s in symbols},
+            "items": entries,
+        }
+        call = lambda: evaluator.evaluate_test_case(test_case, max_workers=max_workers)
+        count_errors = lambda res: sum("error" in item for item in res["items"])
+
+    # A tracing started by the caller is left running.
+    start_tracing = trace_memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    try:
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        result = call()
+        seconds = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if start_tracing:
+            tracemalloc.stop()
+
+    actual = evaluator.last_schedule_report.actual
+    actual = actual[~np.isnan(actual)]
+    task_seconds = np.quantile(actual, list(TASK_QUANTILES.values())) if len(actual) else [np.nan] * 4
+
+    return OrderedDict(
+        rows=len(entries),
+        errors=count_errors(result),
+        tasks=len(evaluator.last_schedule_report.actual),
+        seconds=seconds,
+        rows_per_sec=len(entries) / seconds,
+        cpu_seconds=cpu,
+        cpu_ms_per_row=1000 * cpu / len(entries),
+        task_seconds={k: float(v) for k, v in zip(TASK_QUANTILES, task_seconds)},
+        peak_alloc_bytes=peak,
+        process_peak_rss_bytes=_max_rss(),
+    )
+
+
+def _curves(runs: list) -> list:
+    """Groups the runs into throughput versus concurrency curves."""
+    if not runs:
+        return []
+
+    frame = pd.DataFrame(
+        [{k: run[k] for k in ("method", "chars", "symbols", "server_latency", "concurrency", "rows_per_sec")} for run in runs]
+    )
+    keys = ["method", "chars", "symbols", "server_latency"]
+    curves = []
+    for key, group in frame.groupby(keys, sort=False):
+        median = group.groupby("concurrency", sort=False)["rows_per_sec"].median()
+        curve = OrderedDict(zip(keys, (v.item() if hasattr(v, "item") else v for v in key)))
+        curve["concurrency"] = [int(c) for c in median.index]
+        curve["rows_per_sec"] = [float(v) for v in median]
+        curves.append(curve)
+    return curves
+
+
+def _max_rss() -> int:
+    """
+    Returns the high-water mark of the process resident memory in bytes since the process start,
+    `None` if not available.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+@contextlib.contextmanager
+def _start_server(profile: OrderedDict, isolate: bool) -> Iterator[str]:
+    """Runs a simulated server with the given profile, in a child process if `isolate`, yielding its URL."""
+    if not isolate:
+        server = SimulatedServer(**profile).start()
+        try:
+            yield server.url
+        finally:
+            server.shutdown()
+        return
+
+    args = [sys.executable, "-m", "evalmyai", "simulate", "--address", "127.0.0.1:0"]
+    for name, value in profile.items():
+        if value is not None:
+            args += [f"--{name.replace('_', '-')}", str(value)]
+
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, text=True)
+    try:
+        line = process.stdout.readline()
+        if " at " not in line:
+            raise RuntimeError("The simulated server failed to start.")
+        yield line.split(" at ", 1)[1].strip().rstrip(".")
+    finally:
+        process.terminate()
+        process.wait()
+        process.stdout.close()
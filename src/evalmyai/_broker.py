@@ -0,0 +1,445 @@
+import hashlib
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BROKER_ADDRESS = "localhost:8765"
+
+# The time the client waits for the broker on top of the request read timeout, in seconds.
+BROKER_TIMEOUT_MARGIN = 30
+
+# The address of the evalmy.ai API, the broker forwards requests only below it by default.
+DEFAULT_API_URL = "https://evalmy.ai/api"
+
+
+def parse_address(address: str) -> tuple:
+    """Parses a broker address.
+
+    Args:
+        address (str): Either "host:port" or "unix:/path/to/socket".
+
+    Returns:
+        tuple: A tuple (family, address) where family is `socket.AF_INET` or `socket.AF_UNIX`.
+
+    Raises:
+        ValueError: If the address is invalid.
+    """
+    if not isinstance(address, str) or not address:
+        raise ValueError("Broker address must be a non-empty string.")
+
+    if address.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not supported on this platform.")
+        return socket.AF_UNIX, address[len("unix:"):]
+
+    host, sep, port = address.rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"Wrong broker address: {address}, 'host:port' or 'unix:path' expected.")
+    return socket.AF_INET, (host, int(port))
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter, blocking until a request may be sent.
+
+    Args:
+        rate (float): The sustained number of requests per second.
+        burst (int, optional): The maximal number of requests sent at once. Defaults to 1.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError("Rate must be a positive number.")
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError("Burst must be a positive integer.")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Waits for a token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class EvaluationBroker:
+    """
+    Local broker sharing the evalmy.ai requests of many processes on one machine.
+
+    The broker owns a single connection pool, a rate limiter, a table of requests in flight and a cache
+    of successful responses. Identical requests sent concurrently by different clients are sent to
+    the service only once, and repeated requests are answered from the cache. Only evaluated responses
+    are cached, a response without scores or a batch with a failed item is sent again next time.
+    Evaluators use the broker when created with the `broker` argument.
+
+    The broker forwards requests only to addresses below `api_url`, so it cannot be used as an open
+    relay even when listening on a public address.
+
+    Args:
+        address (str, optional): The address to listen on, "host:port" or "unix:/path/to/socket".
+            Defaults to "localhost:8765".
+        rate (float, optional): The maximal number of requests per second sent to the service.
+            Defaults to `None`, no limit.
+        burst (int, optional): The number of requests the rate limiter lets through at once. Defaults to 1.
+        cache_size (int, optional): The number of cached responses, 0 disables the cache. Defaults to 10000.
+        pool_size (int, optional): The size of the connection pool. Defaults to 32.
+        api_url (str, optional): The API address requests are forwarded to, the `url` of the evaluators.
+            Defaults to "https://evalmy.ai/api".
+
+    Examples
+    --------
+    Start the broker once per machine, e.g. from the command line:
+
+    ```bash
+    python -m evalmyai broker --address localhost:8765 --rate 10
+    ```
+
+    and let the evaluators of all processes use it:
+
+    ```{python}
+    evaluator = Evaluator(auth, token, broker="localhost:8765")
+    ```
+    """
+
+    def __init__(
+        self,
+        address: str = DEFAULT_BROKER_ADDRESS,
+        rate: float = None,
+        burst: int = 1,
+        cache_size: int = 10000,
+        pool_size: int = 32,
+        api_url: str = DEFAULT_API_URL,
+    ):
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("Cache size must be a non-negative integer.")
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise ValueError("Pool size must be a positive integer.")
+        if not isinstance(api_url, str) or not api_url.startswith(("http://", "https://")):
+            raise ValueError("API URL must be an 'http://' or 'https://' address.")
+
+        self.api_url = api_url.rstrip("/")
+        self.family, self.address = parse_address(address)
+        self.limiter = RateLimiter(rate, burst) if rate is not None else None
+        self.cache_size = cache_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._stats = OrderedDict(requests=0, upstream=0, cache_hits=0, dedup_hits=0)
+        self._server = None
+
+    def serve_forever(self) -> None:
+        """Runs the broker until `shutdown` is called."""
+        self._get_server().serve_forever()
+
+    def start(self) -> "EvaluationBroker":
+        """Runs the broker in a background thread."""
+        server = self._get_server()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stops the broker and closes its connections."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.session.close()
+
+    @property
+    def server_address(self) -> str:
+        """str: The address the broker listens on, in the format accepted by `Evaluator`."""
+        if self.family == socket.AF_INET:
+            host, port = self._get_server().server_address[:2]
+            return f"{host}:{port}"
+        return f"unix:{self.address}"
+
+    def stats(self) -> OrderedDict:
+        """
+        Returns the broker statistics.
+
+        Returns:
+            OrderedDict: The number of client requests, requests sent to the service, cache hits
+                and requests joined to an identical request in flight.
+        """
+        with self._lock:
+            return OrderedDict(self._stats, cached=len(self._cache))
+
+    def handle(self, request: dict) -> dict:
+        """
+        Handles a single client request.
+
+        Args:
+            request (dict): Either {"url": str, "task": dict, "timeout": ..., "cache": bool} or {"op": "stats"}.
+                With "cache" set to `False` the request is sent to the service in any case.
+
+        Returns:
+            dict: The response {"status_code", "reason", "url", "content"}, or {"error", "message"} if
+                the service could not be reached.
+        """
+        if request.get("op") == "stats":
+            return self.stats()
+
+        if not str(request.get("url", "")).startswith(self.api_url + "/"):
+            return {"error": "Forbidden", "message": f"Only requests to {self.api_url} are forwarded."}
+
+        if not request.get("cache", True):
+            with self._lock:
+                self._stats["requests"] += 1
+            return self._send(request)
+
+        key = hashlib.sha256(
+            json.dumps([request["url"], request["task"]], sort_keys=True).encode()
+        ).hexdigest()
+
+        with self._lock:
+            self._stats["requests"] += 1
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return self._cache[key]
+            if key in self._in_flight:
+                self._stats["dedup_hits"] += 1
+                future, owner = self._in_flight[key], False
+            else:
+                future, owner = Future(), True
+                self._in_flight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            response = self._send(request)
+            with self._lock:
+                if self.cache_size and _cacheable(response):
+                    self._cache[key] = response
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _send(self, request: dict) -> dict:
+        """Sends the request to the service."""
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+        with self._lock:
+            self._stats["upstream"] += 1
+
+        timeout = request.get("timeout")
+        try:
+            response = self.session.post(
+                request["url"],
+                json=request["task"],
+                timeout=tuple(timeout) if isinstance(timeout, list) else timeout,
+            )
+        except requests.exceptions.Timeout as e:
+            return {"error": "Timeout", "message": str(e)}
+        except requests.exceptions.ConnectionError as e:
+            return {"error": "ConnectionError", "message": str(e)}
+
+        return {
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "content": response.text,
+        }
+
+    def _get_server(self) -> socketserver.BaseServer:
+        if self._server is None:
+            broker = self
+
+            class Handler(socketserver.StreamRequestHandler):
+                def handle(self):
+                    for line in self.rfile:
+                        try:
+                            reply = broker.handle(json.loads(line))
+                        except Exception as e:
+                            reply = {"error": "BrokerError", "message": str(e)}
+                        self.wfile.write(json.dumps(reply).encode() + b"\n")
+                        self.wfile.flush()
+
+            if self.family == socket.AF_INET:
+                base = socketserver.ThreadingTCPServer
+            else:
+                base = socketserver.ThreadingUnixStreamServer
+
+            class Server(base):
+                daemon_threads = True
+                allow_reuse_address = True
+
+            self._server = Server(self.address, Handler)
+        return self._server
+
+
+def _cacheable(response: dict) -> bool:
+    """Checks whether a response holds an evaluation, not a failure to be retried."""
+    if response.get("status_code") != 200:
+        return False
+    try:
+        body = json.loads(response["content"])
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+    if "results" in body:
+        return isinstance(body["results"], list) and all(
+            isinstance(item, dict) and "error" not in item for item in body["results"]
+        )
+    return body.get("scores") is not None
+
+
+class BrokerClient:
+    """
+    Client of the `EvaluationBroker`, sending requests over one connection per thread.
+
+    Args:
+        address (str): The broker address, "host:port" or "unix:/path/to/socket".
+    """
+
+    def __init__(self, address: str):
+        self.family, self.address = parse_address(address)
+        self._local = threading.local()
+
+    def post(self, url: str, json: dict, timeout=None, cache: bool = True) -> requests.Response:
+        """
+        Posts an evaluation request through the broker.
+
+        Args:
+            url (str): The evalmy.ai service URL.
+            json (dict): The request payload, named as in `requests.post`.
+            timeout (float or tuple, optional): The timeout of the request to the service.
+            cache (bool, optional): If `False`, the request is always sent to the service, neither answered
+                from the cache nor joined to an identical request in flight. Defaults to `True`.
+
+        Returns:
+            requests.Response: The response of the service.
+
+        Raises:
+            requests.exceptions.Timeout: If the service does not answer in time.
+            requests.exceptions.ConnectionError: If the broker or the service cannot be reached.
+        """
+        request = {"url": url, "task": json, "timeout": timeout}
+        if not cache:
+            request["cache"] = False
+        reply = self._call(request, timeout)
+
+        if "error" in reply:
+            if reply["error"] == "Timeout":
+                raise requests.exceptions.Timeout(reply["message"])
+            raise requests.exceptions.ConnectionError(reply["message"])
+
+        response = requests.Response()
+        response.status_code = reply["status_code"]
+        response.reason = reply["reason"]
+        response.url = reply["url"]
+        response._content = reply["content"].encode()
+        response.encoding = "utf-8"
+        return response
+
+    def stats(self) -> dict:
+        """Returns the broker statistics, see `EvaluationBroker.stats`."""
+        return self._call({"op": "stats"})
+
+    def _call(self, request: dict, timeout=None) -> dict:
+        read = timeout[-1] if isinstance(timeout, tuple) else timeout
+        data = json.dumps(request).encode() + b"\n"
+
+        for attempt in range(2):
+            try:
+                stream = self._connect()
+                stream.raw.settimeout(None if read is None else read + BROKER_TIMEOUT_MARGIN)
+                stream.write(data)
+                stream.flush()
+            except OSError as e:
+                # The request was not sent, it is safe to reconnect and send it again.
+                self._close()
+                if attempt == 1:
+                    raise requests.exceptions.ConnectionError(
+                        f"Broker not reachable: {e}"
+                    ) from e
+                continue
+
+            try:
+                line = stream.readline()
+            except socket.timeout as e:
+                # The request may still be running, it is not sent again.
+                self._close()
+                raise requests.exceptions.Timeout(f"Broker did not answer in time: {e}") from e
+            except ConnectionResetError:
+                line = b""
+            except OSError as e:
+                self._close()
+                raise requests.exceptions.ConnectionError(f"Broker connection failed: {e}") from e
+
+            if line:
+                return json.loads(line)
+            # The broker closed a stale connection without reading the request, reconnect once.
+            self._close()
+
+        raise requests.exceptions.ConnectionError("Broker closed the connection.")
+
+    def _connect(self):
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            sock.connect(self.address)
+            stream = self._local.stream = _SocketStream(sock)
+        return stream
+
+    def _close(self):
+        stream = getattr(self._local, "stream", None)
+        if stream is not None:
+            stream.close()
+            self._local.stream = None
+
+
+class _SocketStream:
+    """A buffered line stream over a socket."""
+
+    def __init__(self, sock: socket.socket):
+        self.raw = sock
+        self._file = sock.makefile("rwb")
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def readline(self) -> bytes:
+        return self._file.readline()
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        finally:
+            self.raw.close()
@@ -0,0 +1,144 @@
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+import pandas as pd
+
+from evalmyai._result import Reasoning
+
+
+def iter_windows(chunks: Iterable, window: int = None) -> Iterator[pd.DataFrame]:
+    """Iterates over DataFrame chunks of at most `window` rows.
+
+    Args:
+        chunks (Iterable): DataFrames, e.g. `pd.read_csv(..., chunksize=...)`, or objects with a `to_pandas`
+            method, e.g. pyarrow record batches of Parquet row groups.
+        window (int, optional): The maximal number of rows of a yielded chunk, larger chunks are split.
+            Defaults to `None`, chunks are yielded as they are.
+
+    Yields:
+        pd.DataFrame: The chunks.
+
+    Raises:
+        ValueError: If the window is not a positive integer or a chunk is not a DataFrame.
+    """
+    if window is not None and (not isinstance(window, int) or window < 1):
+        raise ValueError("Window must be a positive integer.")
+
+    for chunk in chunks:
+        if hasattr(chunk, "to_pandas") and not isinstance(chunk, pd.DataFrame):
+            chunk = chunk.to_pandas()
+        if not isinstance(chunk, pd.DataFrame):
+            raise ValueError(
+                f"'DataFrame' chunk expected, but '{type(chunk).__name__}' found."
+            )
+
+        if window is None or len(chunk) <= window:
+            yield chunk
+        else:
+            for start in range(0, len(chunk), window):
+                yield chunk.iloc[start:start + window]
+
+
+class FileSink:
+    """
+    Appends result chunks to a CSV or Parquet file.
+
+    The `scores_*` dictionaries are stored JSON-encoded and errors as strings. Parquet requires
+    the optional `pyarrow` package, the schema of the result columns is fixed (see `_result_schema`),
+    so a first chunk without any error or context does not narrow the column types for the later ones.
+
+    Args:
+        path (str): The output file, the format is given by the extension, '.csv' or '.parquet'.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+        ImportError: If writing Parquet and `pyarrow` is not installed.
+    """
+
+    def __init__(self, path: str):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in (".csv", ".parquet"):
+            raise ValueError(f"Unsupported sink format '{ext}', '.csv' or '.parquet' expected.")
+
+        if ext == ".parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "Writing Parquet requires the 'pyarrow' package, install it by `pip install pyarrow`."
+                ) from e
+
+        self.path = path
+        self.format = ext[1:]
+        self._writer = None
+        self._started = False
+
+    def __call__(self, chunk: pd.DataFrame) -> None:
+        chunk = _to_storable(chunk)
+
+        if self.format == "csv":
+            chunk.to_csv(self.path, mode="a" if self._started else "w", header=not self._started)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, _result_schema(table.schema))
+            self._writer.write_table(table.cast(self._writer.schema))
+
+        self._started = True
+
+    def close(self) -> None:
+        """Finishes the file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def make_sink(sink: str | Callable) -> Callable:
+    """Converts a path to a `FileSink`, a callable is returned as it is."""
+    if isinstance(sink, (str, os.PathLike)):
+        return FileSink(str(sink))
+    if not callable(sink):
+        raise ValueError("Sink must be a callable or a path to a '.csv' or '.parquet' file.")
+    return sink
+
+
+def _result_schema(schema):
+    """Replaces the inferred types of the result columns by their fixed types, other columns are kept."""
+    import pyarrow as pa
+
+    fields = []
+    for field in schema:
+        name = field.name
+        if name in ("expected", "actual", "context", "error") or name.startswith(("scores_", "reason_")):
+            field = field.with_type(pa.string())
+        elif name.startswith("samples_"):
+            field = field.with_type(pa.int64())
+        elif name.startswith("std_"):
+            field = field.with_type(pa.float64())
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def _to_storable(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Converts the object columns of a result chunk to strings."""
+    chunk = chunk.copy(deep=False)
+    for column in chunk.columns:
+        if column.startswith("scores_"):
+            chunk[column] = [json.dumps(v) for v in chunk[column]]
+        elif column.startswith("reason_"):
+            chunk[column] = [_reasoning_json(v) for v in chunk[column]]
+        elif column == "error":
+            chunk[column] = [None if e is None else str(e) for e in chunk[column]]
+    return chunk
+
+
+def _reasoning_json(reasoning) -> str:
+    """Returns the JSON string of a reasoning, kept as it is if already a string."""
+    if isinstance(reasoning, str):
+        return reasoning
+    if isinstance(reasoning, Reasoning):
+        return reasoning.json
+    return json.dumps(dict(reasoning), ensure_ascii=False)
@@ -0,0 +1,63 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from evalmyai._sampling import SamplingPolicy
+
+
+@dataclass(frozen=True)
+class EvaluationConfig:
+    """
+    Immutable configuration of an evaluation call.
+
+    A config is created once by `Evaluator.make_config` and can be shared by any number of concurrent calls,
+    later changes of the evaluator scoring (`Evaluator.set_scoring`) do not affect it. The scoring is frozen
+    into read-only mappings.
+
+    Args:
+        symbols (tuple): The evaluated symbols.
+        scoring (Mapping): The scoring criteria of each symbol.
+        retry_cnt (int, optional): Number of times to retry evaluation in case of server errors. Defaults to 1.
+        sampling (SamplingPolicy, optional): Evaluates each symbol repeatedly until its score is stable.
+            Defaults to `None`, a single evaluation.
+
+    Examples
+    --------
+    ```{python}
+    config = evaluator.make_config(symbols=["contradictions", "f1"], retry_cnt=3)
+
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(lambda entry: evaluator.evaluate(entry, config=config), data))
+    ```
+    """
+
+    symbols: tuple
+    scoring: Mapping
+    retry_cnt: int = 1
+    sampling: SamplingPolicy = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "symbols", tuple(self.symbols))
+        object.__setattr__(self, "scoring", _freeze(self.scoring))
+
+    def symbol_scoring(self, symbol: str) -> dict:
+        """Returns the scoring of a symbol as a new plain dictionary, e.g. for a request payload."""
+        return _thaw(self.scoring[symbol])
+
+
+def _freeze(value):
+    """Converts nested dictionaries and lists to read-only mappings and tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Converts the result of `_freeze` back to dictionaries and lists."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+from evalmyai._summary import _group_keys, _key_names
+from evalmyai._validators import _str_lengths
+
+
+def stratum_keys(
+    data: pd.DataFrame, by: str | Sequence[str] = None, length_buckets: int = 4
+) -> tuple:
+    """Assigns the rows of a dataset to strata.
+
+    Args:
+        data (pd.DataFrame): The dataset.
+        by (str or Sequence[str], optional): Index level or column names defining the strata. Defaults to `None`,
+            the strata are given by the text length.
+        length_buckets (int, optional): The number of text length quantile buckets used if `by` is not set.
+            Defaults to 4.
+
+    Returns:
+        tuple: A tuple (codes, labels) where `codes` is an array with the integer stratum of each row and
+            `labels` is an Index with the name of each stratum, the values of `by` or the length bucket number.
+
+    Raises:
+        ValueError: If a name of `by` is not found or the number of buckets is not a positive integer.
+    """
+    if by is not None:
+        codes, labels = pd.MultiIndex.from_arrays(_group_keys(data, by)).factorize()
+        labels = labels.set_names(_key_names(by))
+        return codes, labels if labels.nlevels > 1 else labels.get_level_values(0)
+
+    if not isinstance(length_buckets, int) or length_buckets < 1:
+        raise ValueError("Length buckets must be a positive integer.")
+
+    buckets = min(length_buckets, len(data))
+    if buckets <= 1:
+        codes = np.zeros(len(data), dtype=int)
+    else:
+        length = pd.Series(
+            np.nan_to_num(_str_lengths(data["expected"])) + np.nan_to_num(_str_lengths(data["actual"]))
+        )
+        codes = pd.qcut(length.rank(method="first"), buckets, labels=False).to_numpy(dtype=int)
+    return codes, pd.RangeIndex(max(buckets, 1), name="length_bucket")
+
+
+def sampling_order(strata: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Orders the rows randomly so that every prefix is a proportionally stratified sample.
+
+    The rows of each stratum are shuffled and spread evenly over the order, the k-th row of a stratum
+    of size N gets the position (k + u) / N for a random u from [0, 1).
+
+    Args:
+        strata (np.ndarray): The stratum code of each row.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        np.ndarray: The row positions in the sampling order.
+    """
+    n = len(strata)
+    shuffled = rng.permutation(n)
+    codes = pd.Series(strata[shuffled])
+    rank = codes.groupby(codes).cumcount().to_numpy()
+    size = codes.map(codes.value_counts()).to_numpy()
+    position = (rank + rng.random(n)) / size
+    return shuffled[np.argsort(position, kind="stable")]
+
+
+def stratified_estimate(
+    values: np.ndarray, strata: np.ndarray, sizes: pd.Series, confidence: float = 0.95
+) -> OrderedDict:
+    """Estimates the population mean from a stratified sample.
+
+    The strata means are weighted by the strata sizes, strata without any sample are left out and
+    the weights of the others renormalized. The variance includes the finite population correction,
+    strata with a single sample use the pooled sample variance.
+
+    Args:
+        values (np.ndarray): The sampled values, NaN values are ignored.
+        strata (np.ndarray): The stratum code of each sampled value.
+        sizes (pd.Series): The number of rows of each stratum in the population, by the stratum code.
+        confidence (float, optional): The confidence level of the interval. Defaults to 0.95.
+
+    Returns:
+        OrderedDict: The 'estimate', 'ci_low', 'ci_high', 'half_width' and 'strata', a DataFrame with
+            the 'rows', 'evaluated', 'mean', 'std' and 'weight' of each stratum.
+    """
+    valid = ~np.isnan(values)
+    sample = pd.Series(values[valid]).groupby(strata[valid])
+    table = pd.DataFrame({"rows": sizes})
+    table["evaluated"] = sample.count().reindex(table.index, fill_value=0)
+    table["mean"] = sample.mean()
+    table["std"] = sample.std()
+
+    sampled = table["evaluated"] > 0
+    estimate = ci_low = ci_high = half_width = np.nan
+
+    if sampled.any():
+        table["weight"] = np.where(sampled, table["rows"], 0) / table.loc[sampled, "rows"].sum()
+        pooled = np.var(values[valid], ddof=1) if valid.sum() > 1 else np.nan
+        var = table["std"].pow(2).where(table["evaluated"] > 1, pooled)
+
+        s = table[sampled]
+        fpc = 1 - s["evaluated"] / s["rows"]
+        estimate = float((s["weight"] * s["mean"]).sum())
+        terms = s["weight"] ** 2 * var[sampled] / s["evaluated"] * fpc
+        se = float(np.sqrt(terms.where(fpc > 0, 0.0).sum()))
+        half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * se
+        ci_low, ci_high = estimate - half_width, estimate + half_width
+    else:
+        table["weight"] = 0.0
+
+    return OrderedDict(
+        estimate=estimate,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        half_width=half_width,
+        strata=table,
+    )
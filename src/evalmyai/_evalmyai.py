@@ -1,16 +1,41 @@
-import json
 import copy
+import functools
+import json
+import os
+import threading
+import time
 from collections import OrderedDict
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
+from urllib.parse import urlsplit
+import numpy as np
 import pandas as pd
 import requests
 from evalmyai._validators import (
     validate_single_input_data,
     validate_dict,
-    validate_single_output_score,
     validate_test_case_data,
+    row_problems,
+)
+from evalmyai._result import SymbolResult, Reasoning
+from evalmyai._config import EvaluationConfig
+from evalmyai._sampling import SamplingPolicy
+from evalmyai._batching import BatchingPolicy, BATCH_PATH
+from evalmyai._hedging import HedgingPolicy
+from evalmyai._broker import BrokerClient
+from evalmyai._sharding import select_shard
+from evalmyai._jobs import EvaluationJob
+from evalmyai._scheduler import (
+    run_tasks,
+    deadline_from,
+    expired,
+    estimate_cost,
+    ScheduleReport,
+    REQUEST_OVERHEAD_CHARS,
 )
-from evalmyai._utils import order_output_dict, order_contradictions, order_f1
+from evalmyai._estimation import stratum_keys, sampling_order, stratified_estimate
+from evalmyai._summary import score_frame
+from evalmyai._chunks import iter_windows, make_sink, FileSink
+from evalmyai._suite import find_test_cases, finish_test_case, output_paths, write_summary
 
 SYMBOLS = ["contradictions", "missing_facts", "f1"]
 DEFAULT_SYMBOLS = [SYMBOLS[0]]
@@ -21,6 +46,9 @@ URL_HOST = "https://evalmy.ai"
 URL_API = f"{URL_HOST}/api"
 URL_EVAL = f"{URL_API}/symbol/evaluate"
 
+# The (connect, read) timeout of a single request in seconds.
+DEFAULT_TIMEOUT = (10, 300)
+
 DEFAULT_SCORING = {
     "contradictions": {
         "name": "linear",
@@ -146,6 +174,19 @@ class Evaluator:
     Args:
         auth (OpenAIAuth or AzureAuth): Authentication details, either for OpenAI or Azure OpenAI. See [examples](#examples).
         token (str): evalmyai API token.
+        timeout (float or tuple, optional): The timeout of a single request in seconds, either a number or
+            a (connect, read) tuple, `None` waits forever. Defaults to (10, 300).
+        row_timeout (float, optional): The time budget of a single entry in seconds, covering all its
+            symbols and retries. Defaults to `None`, no limit.
+        hedging (HedgingPolicy, optional): Sends a duplicate of a request that takes too long, see `HedgingPolicy`.
+            Defaults to `None`, no hedging.
+        broker (str, optional): The address of a local `EvaluationBroker`, "host:port" or "unix:/path/to/socket",
+            all requests are sent through it. Defaults to `None`, requests are sent directly.
+        url (str, optional): The address of the evalmy.ai API, e.g. of a `SimulatedServer`.
+            Defaults to "https://evalmy.ai/api".
+        batching (BatchingPolicy, optional): Packs the entries of `evaluate_batch` and `evaluate_dataset` into
+            batch requests, see `BatchingPolicy`. Defaults to `None`, a request for each entry and symbol.
+            The evalmy.ai service has no batch endpoint, batching requires another `url`.
     Raises:
         ValueError: If any input is empty or invalid.
     Examples
@@ -193,7 +234,17 @@ class Evaluator:
 
     """
 
-    def __init__(self, auth: OpenAIAuth | AzureAuth, token: str):
+    def __init__(
+        self,
+        auth: OpenAIAuth | AzureAuth,
+        token: str,
+        timeout: float | tuple = DEFAULT_TIMEOUT,
+        row_timeout: float = None,
+        hedging: HedgingPolicy = None,
+        broker: str = None,
+        url: str = URL_API,
+        batching: BatchingPolicy = None,
+    ):
         if not isinstance(auth, (OpenAIAuth, AzureAuth)):
             raise ValueError("Invalid auth object. Must be OpenAIAuth or AzureAuth.")
 
@@ -202,14 +253,64 @@ class Evaluator:
         if len(token) != 64:
             raise ValueError("Evalmyai token must be 64 characters long.")
 
+        if timeout is not None:
+            timeouts = timeout if isinstance(timeout, tuple) else (timeout,)
+            if len(timeouts) not in (1, 2) or not all(
+                isinstance(t, (int, float)) and t > 0 for t in timeouts
+            ):
+                raise ValueError(
+                    "Timeout must be a positive number or a (connect, read) tuple."
+                )
+
+        if row_timeout is not None and (
+            not isinstance(row_timeout, (int, float)) or row_timeout <= 0
+        ):
+            raise ValueError("Row timeout must be a positive number.")
+
+        if hedging is not None and not isinstance(hedging, HedgingPolicy):
+            raise ValueError("Invalid hedging object. Must be HedgingPolicy.")
+
+        if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+            raise ValueError("URL must be an 'http://' or 'https://' address.")
+
+        if batching is not None and not isinstance(batching, BatchingPolicy):
+            raise ValueError("Invalid batching object. Must be BatchingPolicy.")
+
+        if batching is not None and _is_live_service(url):
+            raise ValueError(
+                "Batching requires a `url` providing the batch endpoint, e.g. SimulatedServer, "
+                "the evalmy.ai service does not provide it."
+            )
+
         self.auth = auth
         self.token = token
+        self.timeout = timeout
+        self.row_timeout = row_timeout
+        self.hedging = hedging
+        self.broker = BrokerClient(broker) if broker is not None else None
+        self.url = url.rstrip("/")
+        self.batching = batching
+        self._local = threading.local()
         self.scoring = copy.deepcopy(DEFAULT_SCORING)
 
+    @property
+    def last_schedule_report(self) -> ScheduleReport:
+        """
+        ScheduleReport: The estimated versus actual costs of the last batch evaluated in the current thread,
+        `None` if there was none.
+        """
+        return getattr(self._local, "schedule_report", None)
+
+    def _set_schedule_report(self, report: ScheduleReport) -> None:
+        self._local.schedule_report = report
+
     def set_scoring(self, symbol: str, scoring: dict) -> None:
         """
         Sets the scoring criteria for a specified symbol.
 
+        The scoring dictionary is replaced, not modified, so evaluations running in other threads
+        and configs made before keep their scoring.
+
         Args:
             symbol (str): The symbol for which scoring is to be replaced.
             scoring (dict): The scoring criteria. See `self.scoring` for default values.
@@ -223,7 +324,56 @@ class Evaluator:
         if not (v := validate_dict(DEFAULT_SCORING[symbol], scoring))[0]:
             raise ValueError(f"Wrong scoring format with msg: {v[1]}.")
 
-        self.scoring[symbol] = scoring
+        scoring_all = dict(self.scoring)
+        scoring_all[symbol] = copy.deepcopy(scoring)
+        self.scoring = scoring_all
+
+    def make_config(
+        self,
+        symbols: list = DEFAULT_SYMBOLS,
+        scoring: dict = None,
+        retry_cnt: int = 1,
+        sampling: SamplingPolicy = None,
+    ) -> EvaluationConfig:
+        """
+        Creates an immutable evaluation config, to be shared by concurrent calls.
+
+        Args:
+            symbols (list, optional): A list of symbols to be evaluated. Defaults to ["contradictions"].
+            scoring (dict, optional): The scoring criteria by symbol. Symbols not set or set to `None`
+                use the current default from `self.scoring`.
+            retry_cnt (int, optional): Number of times to retry evaluation in case of server errors. Defaults to 1.
+            sampling (SamplingPolicy, optional): Evaluates each symbol repeatedly until its score is stable,
+                see `SamplingPolicy`. Defaults to `None`, a single evaluation.
+
+        Returns:
+            EvaluationConfig: The config, pass it as the `config` argument of the evaluation methods.
+
+        Raises:
+            ValueError: If the symbols, scoring format, retry count or sampling are invalid.
+        """
+        if not set(symbols) <= set(SYMBOLS):
+            raise ValueError(f"Wrong symbols value. Should be subset of {SYMBOLS}")
+
+        if not isinstance(retry_cnt, int) or retry_cnt < 1:
+            raise ValueError("Retry count must be a positive integer.")
+
+        if sampling is not None and not isinstance(sampling, SamplingPolicy):
+            raise ValueError("Invalid sampling object. Must be SamplingPolicy.")
+
+        # A single read, `set_scoring` replaces the dictionary instead of modifying it.
+        defaults = self.scoring
+        resolved = {}
+
+        for symbol in symbols:
+            value = scoring.get(symbol) if scoring else None
+            if value is None:
+                value = defaults[symbol]
+            elif not (v := validate_dict(DEFAULT_SCORING[symbol], value))[0]:
+                raise ValueError(f"Wrong scoring format with msg: {v[1]}.")
+            resolved[symbol] = value
+
+        return EvaluationConfig(symbols, resolved, retry_cnt, sampling)
 
     def evaluate(
         self,
@@ -231,44 +381,71 @@ class Evaluator:
         symbols: list = DEFAULT_SYMBOLS,
         scoring: dict = None,
         retry_cnt: int = 1,
+        config: EvaluationConfig = None,
     ) -> OrderedDict:
         """
         Evaluates a single entry.
 
+        Neither `data` nor `scoring` is modified, so the same objects and the same evaluator can be used
+        by many threads at once.
+
         Args:
             data (dict): A dictionary with textual keys "expected", "actual", and "context".
             symbols (list, optional): A list of symbols to be evaluated. Defaults to ["contradictions"].
             scoring (dict, optional): The scoring criteria. If not set, default from `self.scoring` is used.
             retry_cnt (int, optional): Number of times to retry evaluation in case of server errors. Defaults to 1.
+            config (EvaluationConfig, optional): A config made by `make_config`, replaces `symbols`, `scoring`
+                and `retry_cnt`.
 
         Returns:
-            OrderedDict: A dictionary with keys given by symbols and values by evaluated score.
+            OrderedDict: A dictionary with keys given by symbols and values by evaluated score. Each value is
+                a `SymbolResult`, a read-only dictionary with keys "scores" and "reasoning".
 
         Raises:
             ValueError: If input data or symbols are invalid, or if the output format is incorrect.
+            TimeoutError: If the evaluation does not finish within `row_timeout`.
         """
-        if "context" not in data:
-            data["context"] = ""
+        if config is None:
+            config = self.make_config(symbols, scoring, retry_cnt)
+        return self._evaluate(data, config)
 
-        if not set(symbols) <= set(SYMBOLS):
-            raise ValueError(f"Wrong symbols value. Should be subset of {SYMBOLS}")
+    def _evaluate(
+        self,
+        data: dict,
+        config: EvaluationConfig,
+        run_deadline: float = None,
+        shared_context: str = "",
+    ) -> OrderedDict:
+        """
+        Evaluates a single entry, see `evaluate`.
 
-        if not scoring:
-            scoring = self.scoring
-        else:
-            for symbol in symbols:
-                if symbol in scoring and scoring[symbol] is None:
-                    scoring[symbol] = self.scoring[symbol]
+        Args:
+            run_deadline (float, optional): The `time.monotonic()` value at which the whole run expires.
+                The time budget of the entry never exceeds it.
+            shared_context (str, optional): A context common to many entries, preceding the context of the entry.
+                It is joined to the entry context only in the request payload, never stored per entry.
+        """
+        row_deadline = deadline_from(self.row_timeout)
+        if run_deadline is not None:
+            row_deadline = (
+                run_deadline if row_deadline is None else min(row_deadline, run_deadline)
+            )
+
+        # A shallow copy, the caller's dictionary is never modified.
+        input_data = {"context": "", **data}
 
-        if not (v := validate_single_input_data(data))[0]:
+        if not (v := validate_single_input_data(input_data))[0]:
             raise ValueError(f"Wrong input data format with msg: {v[1]}.")
 
+        if shared_context:
+            input_data["context"] = _join_context(shared_context, input_data["context"])
+
         result = OrderedDict()
 
-        for symbol in symbols:
+        for symbol in config.symbols:
             task = {
-                "input_data": data,
-                "scoring": scoring[symbol],
+                "input_data": input_data,
+                "scoring": config.symbol_scoring(symbol),
                 "aggregation": {
                     "n_calls": 1,
                     "agg_method": "mean",
@@ -277,47 +454,308 @@ class Evaluator:
                 "api_token": self.token,
             }
 
-            for i in range(retry_cnt):
-                response = requests.post(
-                    f"{URL_EVAL}/{symbol}/v{SYMBOLS_VERSION[symbol]}".lower(), json=task
+            if config.sampling is None:
+                result[symbol] = self._evaluate_symbol(
+                    symbol, task, config.retry_cnt, row_deadline
+                )
+            else:
+                # Repeated samples must reach the service, not the broker cache.
+                result[symbol] = config.sampling.run(
+                    functools.partial(
+                        self._evaluate_symbol,
+                        symbol, task, config.retry_cnt, row_deadline, cache=False,
+                    )
                 )
-
-                if response.status_code == 200:
-                    res = response.json()
-
-                    if (
-                        "scores" not in res or res["scores"] is None
-                    ) and i == retry_cnt - 1:
-                        raise BaseException(res["reasoning"])
-
-                    res["reasoning"] = json.loads(res["reasoning"])
-                    result[symbol] = order_output_dict(
-                        res, order_f1 if symbol == "f1" else order_contradictions
-                    )  # TBD!
-                    break
-
-                elif i == retry_cnt - 1:
-                    try:
-                        response.raise_for_status()
-                    except requests.exceptions.HTTPError:
-                        error_message = (
-                            f"HTTPError: {response.status_code} {response.reason}\n"
-                            f"for URL: {response.url}\n"
-                            f"Response Content: {response.json()}"
-                        )
-                        raise requests.exceptions.HTTPError(error_message,response=response)
-
-        if not (v := validate_single_output_score(result))[0]:
-            raise ValueError(f"Wrong output data format with msg: {v[1]}.")
 
         return result
 
+    def _evaluate_symbol(
+        self,
+        symbol: str,
+        task: dict,
+        retry_cnt: int,
+        deadline: float = None,
+        cache: bool = True,
+    ) -> SymbolResult:
+        """
+        Sends a single symbol evaluation to the server, retrying on server errors and timeouts.
+
+        Args:
+            symbol (str): The evaluated symbol.
+            task (dict): The request payload.
+            retry_cnt (int): Number of attempts.
+            deadline (float, optional): The `time.monotonic()` value after which no attempt is started
+                and the running one is cut off.
+            cache (bool, optional): Whether the broker may answer from its cache. Defaults to `True`.
+
+        Returns:
+            SymbolResult: The evaluated symbol.
+
+        Raises:
+            TimeoutError: If the deadline expires.
+            requests.exceptions.RequestException: If the last attempt fails.
+        """
+        url = f"{self.url}/symbol/evaluate/{symbol}/v{SYMBOLS_VERSION[symbol]}"
+
+        for i in range(retry_cnt):
+            last = i == retry_cnt - 1
+
+            try:
+                response = self._post(url, task, self._request_timeout(deadline), cache)
+            except (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+            ) as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("Time budget of the entry exceeded.") from e
+                if last:
+                    raise
+                continue
+
+            if response.status_code == 200:
+                res = response.json()
+
+                if "scores" not in res or res["scores"] is None:
+                    if last:
+                        raise RuntimeError(res["reasoning"])
+                    continue
+
+                return SymbolResult(symbol, res["scores"], res["reasoning"])
+
+            elif last:
+                raise _http_error(response)
+
+    def _run_entries(
+        self,
+        entries: list,
+        config: EvaluationConfig,
+        max_workers: int,
+        run_deadline: float = None,
+        shared_context: str = "",
+        on_done: Callable = None,
+        cancel: threading.Event = None,
+    ) -> list:
+        """
+        Evaluates a list of entries, one by one or in batch requests if `batching` is set.
+
+        Returns:
+            list: A list of (result, error) tuples in the order of entries, see `run_tasks`. The
+                `on_done(i, result, error)` callback is called as soon as the i-th entry ends.
+        """
+        if self.batching is None or config.sampling is not None:
+            return run_tasks(
+                lambda entry, run_deadline: self._evaluate(
+                    entry, config, run_deadline, shared_context
+                ),
+                entries,
+                max_workers=max_workers,
+                deadline=run_deadline,
+                on_done=on_done,
+                cost=lambda entry: estimate_cost(entry, len(config.symbols)),
+                report=self._set_schedule_report,
+                cancel=cancel,
+            )
+
+        outcomes = [None] * len(entries)
+        items = []
+        positions = []
+
+        for i, entry in enumerate(entries):
+            input_data = {"context": "", **entry}
+            if not (v := validate_single_input_data(input_data))[0]:
+                outcomes[i] = (None, ValueError(f"Wrong input data format with msg: {v[1]}."))
+                if on_done is not None:
+                    on_done(i, *outcomes[i])
+            else:
+                items.append(input_data)
+                positions.append(i)
+
+        sizes = [estimate_cost(item) - REQUEST_OVERHEAD_CHARS for item in items]
+        batches = self.batching.pack(sizes)
+        if self.batching.combine_symbols:
+            groups = [config.symbols]
+        else:
+            groups = [(symbol,) for symbol in config.symbols]
+        tasks = [(batch, symbols) for symbols in groups for batch in batches]
+
+        results = [OrderedDict() for _ in items]
+        errors = [None] * len(items)
+        # The number of symbol groups not yet evaluated for each item.
+        pending = [len(groups)] * len(items)
+        lock = threading.Lock()
+
+        def on_batch_done(t, res, err):
+            finished = []
+            with lock:
+                for k, j in enumerate(tasks[t][0]):
+                    row = err if err is not None else res[k]
+                    if isinstance(row, BaseException):
+                        errors[j] = errors[j] or row
+                    else:
+                        results[j].update(row)
+                    pending[j] -= 1
+                    if not pending[j]:
+                        finished.append(j)
+
+            for j in finished:
+                i = positions[j]
+                if errors[j] is not None:
+                    outcomes[i] = (None, errors[j])
+                else:
+                    outcomes[i] = (OrderedDict((s, results[j][s]) for s in config.symbols), None)
+                if on_done is not None:
+                    on_done(i, *outcomes[i])
+
+        run_tasks(
+            lambda task, run_deadline: self._evaluate_packed(
+                [items[j] for j in task[0]], task[1], config, run_deadline, shared_context
+            ),
+            tasks,
+            max_workers=max_workers,
+            deadline=run_deadline,
+            on_done=on_batch_done,
+            cost=lambda task: sum(sizes[j] for j in task[0]) + REQUEST_OVERHEAD_CHARS * len(task[1]),
+            report=self._set_schedule_report,
+            cancel=cancel,
+        )
+
+        return outcomes
+
+    def _evaluate_packed(
+        self,
+        items: list,
+        symbols: tuple,
+        config: EvaluationConfig,
+        deadline: float = None,
+        shared_context: str = "",
+    ) -> list:
+        """
+        Evaluates a batch of entries by the batch endpoint, retrying the failed entries.
+
+        Args:
+            items (list): The validated input data of the entries.
+            symbols (tuple): The evaluated symbols.
+            config (EvaluationConfig): The evaluation config.
+            deadline (float, optional): The `time.monotonic()` value after which no attempt is started.
+            shared_context (str, optional): The context preceding the context of every entry, sent once.
+
+        Returns:
+            list: For each entry either an OrderedDict of `SymbolResult` by symbol or the exception.
+
+        Raises:
+            TimeoutError: If the deadline expires.
+            requests.exceptions.RequestException: If the last attempt of the whole batch fails.
+        """
+        url = f"{self.url}/{BATCH_PATH}"
+        task = {
+            "auth": self.auth.to_dict(),
+            "api_token": self.token,
+            "context": shared_context,
+            "symbols": {
+                symbol: {
+                    "version": SYMBOLS_VERSION[symbol],
+                    "scoring": config.symbol_scoring(symbol),
+                    "aggregation": {"n_calls": 1, "agg_method": "mean"},
+                }
+                for symbol in symbols
+            },
+        }
+
+        results = [None] * len(items)
+        pending = list(range(len(items)))
+
+        for i in range(config.retry_cnt):
+            last = i == config.retry_cnt - 1
+            payload = dict(task, items=[items[j] for j in pending])
+
+            try:
+                response = self._post(url, payload, self._request_timeout(deadline))
+            except (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+            ) as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("Time budget of the batch exceeded.") from e
+                if last:
+                    raise
+                continue
+
+            if response.status_code != 200:
+                if last:
+                    raise _http_error(response)
+                continue
+
+            returned = response.json().get("results")
+            if not isinstance(returned, list) or len(returned) != len(pending):
+                # The results cannot be matched to the entries, all of them failed.
+                count = len(returned) if isinstance(returned, list) else 0
+                error = ValueError(f"The batch response has {count} results, {len(pending)} expected.")
+                returned = [error] * len(pending)
+
+            failed = []
+            for j, res in zip(pending, returned):
+                try:
+                    if isinstance(res, Exception):
+                        raise res
+                    if "error" in res:
+                        raise _item_error(response, res["error"])
+                    results[j] = OrderedDict(
+                        (s, SymbolResult(s, res[s]["scores"], res[s]["reasoning"])) for s in symbols
+                    )
+                except (requests.exceptions.HTTPError, KeyError, TypeError, ValueError) as e:
+                    results[j] = e
+                    failed.append(j)
+
+            pending = failed
+            if not pending:
+                break
+
+        return results
+
+    def _post(self, url: str, task: dict, timeout, cache: bool = True) -> requests.Response:
+        """Posts the request payload, through the broker and hedged if set."""
+        if self.broker is None:
+            post = requests.post
+        else:
+            post = functools.partial(self.broker.post, cache=cache)
+        if self.hedging is None:
+            return post(url, json=task, timeout=timeout)
+
+        duplicate = None
+        if self.broker is not None:
+            # The broker would join the duplicate to the original request still in flight.
+            duplicate = lambda: self.broker.post(url, json=task, timeout=timeout, cache=False)
+        return self.hedging.run(lambda: post(url, json=task, timeout=timeout), duplicate)
+
+    def _request_timeout(self, deadline: float = None):
+        """
+        Computes the `requests` timeout of the next attempt, shortened to fit the deadline.
+
+        Raises:
+            TimeoutError: If the deadline has already expired.
+        """
+        if deadline is None:
+            return self.timeout
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Time budget of the entry exceeded.")
+
+        if self.timeout is None:
+            return remaining
+        if isinstance(self.timeout, tuple):
+            return tuple(min(t, remaining) for t in self.timeout)
+        return min(self.timeout, remaining)
+
     def evaluate_batch(
         self,
         data: list,
         symbols: list = DEFAULT_SYMBOLS,
         scoring: dict = None,
         retry_cnt: int = 1,
+        deadline: float = None,
+        max_workers: int = 1,
+        config: EvaluationConfig = None,
     ) -> list:
         """
         Evaluates a list of entries.
@@ -327,36 +765,41 @@ class Evaluator:
             symbols (list, optional): A list of symbols to be evaluated. Defaults to ["contradictions"].
             scoring (dict, optional): Scoring criteria. If not set, default from `self.scoring` is used.
             retry_cnt (int, optional): Number of times to retry evaluation in case of server errors. Defaults to 1.
+            deadline (float, optional): The time limit of the whole batch in seconds. Entries not started before
+                it expires are not evaluated and get a `TimeoutError`. Defaults to `None`, no limit.
+            max_workers (int, optional): The number of entries evaluated concurrently. Defaults to 1. Concurrent
+                entries are dispatched from the longest one, see `last_schedule_report`.
+            config (EvaluationConfig, optional): A config made by `make_config`, replaces `symbols`, `scoring`
+                and `retry_cnt`.
 
         Returns:
             list: A tuple (results, errors) where `results` is a list of dictionaries with the scoring similar to
                   a single call of `evaluate` function or `None` if an error occurs, and `errors` is a list of
                   errors that occurred during evaluation or `None` if no error occurs.
         """
-        result = list()
-        errors = list()
+        if config is None:
+            config = self.make_config(symbols, scoring, retry_cnt)
 
-        for entry in data:
-            try:
-                res = self.evaluate(
-                    data=entry, symbols=symbols, scoring=scoring, retry_cnt=retry_cnt
-                )
-                result.append(res)
-                errors.append(None)
-            except Exception as e:
-                result.append(None)
-                errors.append(e)
+        outcomes = self._run_entries(data, config, max_workers, deadline_from(deadline))
+
+        result = [res for res, _ in outcomes]
+        errors = [err for _, err in outcomes]
 
         return result, errors
 
     def evaluate_test_case(
-        self, test_case: dict, actual_values: Iterable[str] = None, retry_cnt: int = 1
+        self,
+        test_case: dict,
+        actual_values: Iterable[str] = None,
+        retry_cnt: int = 1,
+        deadline: float = None,
+        max_workers: int = 1,
     ) -> OrderedDict:
         """
         Evaluates a test case based on the provided test case data and actual values.
 
         Validates the test case data and scoring format, applies the context to each item,
-        and evaluates each item using the provided actual values.
+        and evaluates each item using the provided actual values. The test case itself is not modified.
 
         Args:
             test_case: A dictionary containing the test case data. The expected structure is:
@@ -376,6 +819,10 @@ class Evaluator:
                 does not have an "actual" key, values from this iterable will be used.
             retry_cnt: The number of times to retry the evaluation of a single entry in case of a server error
                 (e.g., GPT capacity issue). Default is 1.
+            deadline: The time limit of the whole test case in seconds. Items not started before it expires
+                get the error "Run deadline exceeded...". Default is `None`, no limit.
+            max_workers: The number of items evaluated concurrently. Default is 1. Concurrent items are
+                dispatched from the longest one, see `last_schedule_report`.
 
         Returns:
             An OrderedDict representing the evaluation results. The structure of the result is:
@@ -385,7 +832,8 @@ class Evaluator:
                         {
                             "expected": str,
                             "actual": str,
-                            "context": str,  # If context was provided.
+                            "context": str,  # The item context, if provided. The test case context is
+                                             # not repeated in the items, it is kept once above.
                             "symbol1": result,  # Result for symbol1.
                             "symbol2": result,  # Result for symbol2.
                             ...
@@ -397,22 +845,45 @@ class Evaluator:
         Raises:
             ValueError: If the input data format or scoring format is incorrect.
         """
+        result, tasks = self._prepare_test_case(test_case, actual_values, retry_cnt)
+
+        run_tasks(
+            lambda task, run_deadline: self._evaluate(task[1], task[2], run_deadline, task[3]),
+            tasks,
+            max_workers=max_workers,
+            deadline=deadline_from(deadline),
+            on_done=lambda i, res, err: _finish_test_case_item(tasks[i][0], res, err),
+            cost=lambda task: estimate_cost(task[1], len(task[2].symbols)),
+            report=self._set_schedule_report,
+        )
 
+        return result
+
+    def _prepare_test_case(
+        self, test_case: dict, actual_values: Iterable[str] = None, retry_cnt: int = 1
+    ) -> tuple:
+        """
+        Validates a test case and prepares its items for evaluation, see `evaluate_test_case`.
+
+        Returns:
+            tuple: A tuple (result, tasks) where `result` is the test case result with items not yet evaluated
+                and `tasks` is a list of (res_item, entry, config, shared_context) tuples, one for each
+                item of the result to be evaluated.
+
+        Raises:
+            ValueError: If the input data format or scoring format is incorrect.
+        """
         if not (v := validate_test_case_data(test_case))[0]:
             raise ValueError(f"Wrong input data format with msg: {v[1]}.")
 
         if "scoring" in test_case:
-            scoring = test_case["scoring"]
-            symbols = scoring.keys()
+            symbols = list(test_case["scoring"].keys())
             for symbol in symbols:
-                if scoring[symbol] is not None:
-                    if not (
-                        v := validate_dict(DEFAULT_SCORING[symbol], scoring[symbol])
-                    )[0]:
-                        raise ValueError(f"Wrong scoring format with msg: {v[1]}.")
+                if symbol not in SYMBOLS:
+                    raise ValueError(f"Wrong symbol: {symbol}, one of {SYMBOLS} expected.")
+            config = self.make_config(symbols, test_case["scoring"], retry_cnt)
         else:
-            scoring = None
-            symbols = DEFAULT_SYMBOLS
+            config = self.make_config(DEFAULT_SYMBOLS, None, retry_cnt)
 
         context = test_case["context"] if "context" in test_case else ""
 
@@ -422,134 +893,611 @@ class Evaluator:
 
         for key in test_case:
             if key != "items":
-                result[key] = copy.deepcopy(test_case[key])
+                result[key] = test_case[key]
 
         result["items"] = []
+        tasks = []
 
         for item in test_case["items"]:
-            if context:
-                item["context"] = (
-                    context + ("\n" + item["context"]) if "context" in item else ""
-                )
+            item_context = item.get("context")
 
-            if "actual" not in item:
+            actual = item.get("actual")
+            if "actual" not in item and act_iter is not None:
                 actual = next(act_iter, None)
-                if actual:
-                    item["actual"] = actual
-            else:
-                actual = item["actual"]
 
             res_item = OrderedDict()
 
-            if "context" in item:
-                res_item["context"] = item["context"]
+            if item_context is not None:
+                res_item["context"] = item_context
 
             res_item["expected"] = item["expected"]
-            res_item["actual"] = item["actual"]
+            res_item["actual"] = actual
 
             if actual:
-                try:
-                    res = self.evaluate(
-                        item, symbols=symbols, scoring=scoring, retry_cnt=retry_cnt
-                    )
-                    for symbol in res:
-                        res_item[symbol] = order_output_dict(
-                            res[symbol], order_contradictions
-                        )
-                except requests.exceptions.HTTPError as e:
-                    res_item["error"] = OrderedDict(
-                        code=e.response.status_code, text=str(e)
-                    )
-                except Exception as e:
-                    res_item["error"] = str(e)
-
+                entry = {"expected": item["expected"], "actual": actual}
+                if item_context is not None:
+                    entry["context"] = item_context
+                tasks.append((res_item, entry, config, context))
             else:
                 res_item["error"] = "No actual value."
 
             result["items"].append(res_item)
 
-        return result
+        return result, tasks
+
+    def evaluate_suite(
+        self,
+        paths: str | Iterable[str],
+        output_dir: str = None,
+        retry_cnt: int = 1,
+        deadline: float = None,
+        max_workers: int = 8,
+    ) -> OrderedDict:
+        """
+        Evaluates a whole suite of test cases stored in JSON files.
+
+        The items of all test cases are evaluated by a single pool of workers, so at most `max_workers`
+        requests are running at any time. The result of every test case is written to `output_dir`
+        as soon as all its items are evaluated.
+
+        Args:
+            paths: A directory with test case JSON files, a glob pattern (e.g. "suite/**/*.json"),
+                a path to a single file or an iterable of any of these.
+            output_dir: The directory for the results, one JSON file named after each test case and
+                a `summary.json`. The results keep the subdirectories of the test cases relative to their
+                common directory. If not set, nothing is written.
+            retry_cnt: The number of times to retry the evaluation of a single entry in case of a server error
+                (e.g., GPT capacity issue). Default is 1.
+            deadline: The time limit of the whole suite in seconds. Items not started before it expires
+                get the error "Run deadline exceeded...". Default is `None`, no limit.
+            max_workers: The number of items evaluated concurrently across all test cases. Default is 8.
+                The items are dispatched from the longest one, see `last_schedule_report`.
+
+        Returns:
+            An OrderedDict with the suite summary:
+                {
+                    "cases": int,  # Number of test cases.
+                    "items": int,  # Number of items in all test cases.
+                    "errors": int,  # Number of items with an error.
+                    "elapsed": float,  # Run time in seconds.
+                    "test_cases": [
+                        {
+                            "path": str,  # The test case file.
+                            "output": str,  # The result file, if written.
+                            "items": int,
+                            "errors": int,
+                            "scores": {"symbol": float, ...},  # Mean score of each symbol.
+                            "error": str,  # If the test case could not be loaded or its result written.
+                        },
+                        ...
+                    ]
+                }
+
+        Raises:
+            ValueError: If no test case is found.
+        """
+        start = time.monotonic()
+        files = find_test_cases(paths)
+        if not files:
+            raise ValueError(f"No test case found in {paths}.")
+
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+
+        outputs = dict(zip(files, output_paths(files, output_dir))) if output_dir is not None else {}
+        cases = []
+        tasks = []
+
+        for path in files:
+            case = OrderedDict(path=path)
+            cases.append(case)
+            try:
+                with open(path, encoding="utf-8") as fi:
+                    result, case_tasks = self._prepare_test_case(
+                        json.load(fi), retry_cnt=retry_cnt
+                    )
+            except (OSError, ValueError) as e:
+                case["error"] = str(e)
+                continue
+
+            case["result"] = result
+            case["pending"] = len(case_tasks)
+            tasks.extend((case, *task) for task in case_tasks)
+
+        lock = threading.Lock()
+
+        def on_done(i, res, err):
+            case = tasks[i][0]
+            _finish_test_case_item(tasks[i][1], res, err)
+            with lock:
+                case["pending"] -= 1
+                if case["pending"] > 0:
+                    return
+            finish_test_case(case, outputs.get(case["path"]))
+
+        for case in cases:
+            if case.get("pending") == 0:
+                finish_test_case(case, outputs.get(case["path"]))
+
+        run_tasks(
+            lambda task, run_deadline: self._evaluate(task[2], task[3], run_deadline, task[4]),
+            tasks,
+            max_workers=max_workers,
+            deadline=deadline_from(deadline),
+            on_done=on_done,
+            cost=lambda task: estimate_cost(task[2], len(task[3].symbols)),
+            report=self._set_schedule_report,
+        )
+
+        return write_summary(cases, time.monotonic() - start, output_dir)
 
     def evaluate_dataset(
         self,
-        data: pd.DataFrame,
+        data: pd.DataFrame | Iterable[pd.DataFrame],
         symbols: list = DEFAULT_SYMBOLS,
         context: str = "",
         retry_cnt: int = 1,
-    ) -> pd.DataFrame:
+        shard: tuple = None,
+        deadline: float = None,
+        max_workers: int = 1,
+        window: int = None,
+        sink: str | Callable = None,
+        keep_inputs: bool = True,
+        config: EvaluationConfig = None,
+        on_invalid: str = "error",
+    ) -> pd.DataFrame | Iterator[pd.DataFrame] | None:
         """
         Evaluates an entire pandas DataFrame dataset.
 
+        Datasets larger than memory are evaluated chunk by chunk, pass an iterable of DataFrames
+        instead, e.g. `pd.read_csv(path, chunksize=10000)`, and process the result chunks as they come.
+
         Args:
-            data: A DataFrame with string columns 'expected' and 'actual', and optionally 'context'.
+            data: A DataFrame with string columns 'expected' and 'actual', and optionally 'context',
+                or an iterable of such DataFrames (chunks).
             symbols: A list of symbols to evaluate, defaults to ["contradictions"].
             context: A general context to precede the context of each row, defaults to an empty string.
             retry_cnt: The number of times to retry the evaluation of a single entry in case of a server error
                 (e.g., GPT capacity issue). Default is 1.
+            shard: A tuple (shard_index, shard_count) to evaluate only the rows of the given shard, chosen by
+                a stable hash of the row index. The shard results are joined back by `merge_shards`.
+            deadline: The time limit of the whole dataset in seconds. Rows not started before it expires are
+                not evaluated and get a `TimeoutError`. Default is `None`, no limit.
+            max_workers: The number of rows evaluated concurrently. Default is 1. Concurrent rows are
+                dispatched from the longest one, see `last_schedule_report`.
+            window: The maximal number of rows evaluated and held in memory at once, larger chunks are split.
+                Setting it evaluates also a single DataFrame chunk by chunk. Default is `None`, no limit.
+            sink: A callable receiving each result chunk, or a path to a '.csv' or '.parquet' file the result
+                chunks are appended to. Default is `None`.
+            keep_inputs: If `False`, the 'expected', 'actual' and 'context' columns are not copied to the
+                result. Default is `True`.
+            config: A config made by `make_config`, replaces `symbols` and `retry_cnt` and sets the scoring.
+                Default is `None`, the default scoring is used.
+            on_invalid: What to do with invalid rows found by `preflight_dataset` before any request is sent:
+                "error" keeps them in the result with the problem as the error, "skip" leaves them out of the
+                result and "raise" raises a `ValueError`. Invalid rows are never sent. Default is "error".
 
         Returns:
             pd.DataFrame: A DataFrame containing the evaluation results. The output DataFrame has the same index as
-            the input DataFrame and includes the following columns:
+            the input DataFrame (or its shard) and includes the following columns:
                 - 'expected': str, same as in the input dataset.
                 - 'actual': str, same as in the input dataset.
-                - 'context': str, same as in the input dataset if exists, otherwise the context variable is used.
+                - 'context': str, same as in the input dataset if exists, otherwise the context variable is used,
+                  stored once as a categorical column.
                 - 'score_[sym]': float, the evaluated score value for each given symbol.
-                - 'reason_[sym]': json, the reasoning for each given symbol, a JSON-encoded dictionary.
+                - 'reason_[sym]': dict, the reasoning for each given symbol, a read-only `Reasoning` dictionary
+                  decoded from the server response only when accessed, its `json` attribute gives the JSON string.
+                - 'samples_[sym]', 'std_[sym]': int and float, the number of evaluations and the standard deviation
+                  of the score, only if the `config` has a sampling policy.
                 - 'error': str, the list of errors during evaluation, or None if no error occurred.
 
+            When evaluated in chunks, i.e. `data` is not a DataFrame or `window` is set, an iterator of such
+            result chunks is returned instead. With a `sink`, all chunks are passed to it and `None` is returned.
+
         Raises:
-            ValueError: If 'expected' or 'actual' columns are not found in the dataset.
+            ValueError: If 'expected' or 'actual' columns are not found in the dataset, the shard is invalid,
+                or `on_invalid` is "raise" and an invalid row is found.
         """
+        if on_invalid not in ("error", "skip", "raise"):
+            raise ValueError("On invalid must be one of 'error', 'skip' or 'raise'.")
+
+        run_deadline = deadline_from(deadline)
+        if config is None:
+            config = self.make_config(symbols, None, retry_cnt)
+
+        def evaluate_chunk(chunk):
+            return self._evaluate_frame(
+                chunk, config, context, shard, run_deadline, max_workers, keep_inputs, on_invalid
+            )
+
+        if sink is None:
+            if isinstance(data, pd.DataFrame) and window is None:
+                return evaluate_chunk(data)
+            return map(evaluate_chunk, iter_windows(_as_chunks(data), window))
+
+        sink = make_sink(sink)
+        try:
+            for chunk in iter_windows(_as_chunks(data), window):
+                sink(evaluate_chunk(chunk))
+        finally:
+            if isinstance(sink, FileSink):
+                sink.close()
+
+    def submit_dataset(
+        self,
+        data: pd.DataFrame,
+        symbols: list = DEFAULT_SYMBOLS,
+        context: str = "",
+        retry_cnt: int = 1,
+        shard: tuple = None,
+        deadline: float = None,
+        max_workers: int = 1,
+        keep_inputs: bool = True,
+        config: EvaluationConfig = None,
+        on_invalid: str = "error",
+    ) -> EvaluationJob:
+        """
+        Starts evaluating a dataset in the background and returns immediately.
+
+        The arguments are the same as of `evaluate_dataset`, except that `data` is a single DataFrame.
+        The returned job reports the progress, gives the rows finished so far and can be cancelled,
+        `job.result()` waits for the same result as `evaluate_dataset` returns, with cancelled rows
+        having a `CancelledError`.
+
+        Args:
+            data: A DataFrame with string columns 'expected' and 'actual', and optionally 'context'.
+            symbols: A list of symbols to evaluate, defaults to ["contradictions"].
+            context: A general context to precede the context of each row, defaults to an empty string.
+            retry_cnt: The number of times to retry the evaluation of a single entry in case of a server error.
+                Default is 1.
+            shard: A tuple (shard_index, shard_count) to evaluate only the rows of the given shard.
+            deadline: The time limit of the whole dataset in seconds, counted from the submission.
+                Default is `None`, no limit.
+            max_workers: The number of rows evaluated concurrently. Default is 1.
+            keep_inputs: If `False`, the 'expected', 'actual' and 'context' columns are not copied to the
+                result. Default is `True`.
+            config: A config made by `make_config`, replaces `symbols` and `retry_cnt` and sets the scoring.
+            on_invalid: What to do with invalid rows, see `evaluate_dataset`. Default is "error".
+
+        Returns:
+            EvaluationJob: The handle of the running evaluation.
+
+        Raises:
+            ValueError: If 'expected' or 'actual' columns are not found in the dataset, the shard is invalid,
+                or `on_invalid` is "raise" and an invalid row is found. These are checked before returning.
+        """
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Data must be a DataFrame.")
+
+        if on_invalid not in ("error", "skip", "raise"):
+            raise ValueError("On invalid must be one of 'error', 'skip' or 'raise'.")
+
+        run_deadline = deadline_from(deadline)
+        if config is None:
+            config = self.make_config(symbols, None, retry_cnt)
+
+        data, outcomes, entries, positions = self._prepare_frame(data, shard, on_invalid)
+
+        def run(on_done, cancel):
+            self._run_entries(
+                entries,
+                config,
+                max_workers,
+                run_deadline,
+                context,
+                on_done=lambda i, res, err: on_done(positions[i], res, err),
+                cancel=cancel,
+            )
+            return self.last_schedule_report
+
+        def build(rows, row_outcomes, partial):
+            return self._frame_result(
+                data.iloc[rows], row_outcomes, config, context, keep_inputs, shard
+            )
+
+        return EvaluationJob(len(data), outcomes, run, build)
+
+    def submit_batch(
+        self,
+        data: list,
+        symbols: list = DEFAULT_SYMBOLS,
+        scoring: dict = None,
+        retry_cnt: int = 1,
+        deadline: float = None,
+        max_workers: int = 1,
+        config: EvaluationConfig = None,
+    ) -> EvaluationJob:
+        """
+        Starts evaluating a list of entries in the background and returns immediately.
+
+        The arguments are the same as of `evaluate_batch`. The returned job reports the progress, gives
+        the entries finished so far and can be cancelled, `job.result()` waits for the same (results, errors)
+        tuple as `evaluate_batch` returns, with cancelled entries having a `CancelledError`.
+
+        Args:
+            data (list): A list with entries for the `evaluate` function.
+            symbols (list, optional): A list of symbols to be evaluated. Defaults to ["contradictions"].
+            scoring (dict, optional): Scoring criteria. If not set, default from `self.scoring` is used.
+            retry_cnt (int, optional): Number of times to retry evaluation in case of server errors. Defaults to 1.
+            deadline (float, optional): The time limit of the whole batch in seconds, counted from
+                the submission. Defaults to `None`, no limit.
+            max_workers (int, optional): The number of entries evaluated concurrently. Defaults to 1.
+            config (EvaluationConfig, optional): A config made by `make_config`, replaces `symbols`, `scoring`
+                and `retry_cnt`.
 
+        Returns:
+            EvaluationJob: The handle of the running evaluation.
+        """
+        if config is None:
+            config = self.make_config(symbols, scoring, retry_cnt)
+
+        data = list(data)
+        run_deadline = deadline_from(deadline)
+
+        def run(on_done, cancel):
+            self._run_entries(data, config, max_workers, run_deadline, on_done=on_done, cancel=cancel)
+            return self.last_schedule_report
+
+        def build(positions, outcomes, partial):
+            if not partial:
+                return [res for res, _ in outcomes], [err for _, err in outcomes]
+            columns = {
+                symbol: [None if res is None else res[symbol] for res, _ in outcomes]
+                for symbol in config.symbols
+            }
+            columns["error"] = [err for _, err in outcomes]
+            return pd.DataFrame(columns, index=pd.Index(positions, dtype=int), columns=list(columns))
+
+        return EvaluationJob(len(data), [None] * len(data), run, build)
+
+    def estimate_dataset(
+        self,
+        data: pd.DataFrame,
+        symbol: str = DEFAULT_SYMBOLS[0],
+        margin: float = 0.02,
+        confidence: float = 0.95,
+        by: str | list = None,
+        length_buckets: int = 4,
+        step: int = 50,
+        min_rows: int = 100,
+        max_rows: int = None,
+        context: str = "",
+        retry_cnt: int = 1,
+        deadline: float = None,
+        max_workers: int = 1,
+        seed: int = None,
+        config: EvaluationConfig = None,
+    ) -> OrderedDict:
+        """
+        Estimates the mean score of a dataset from a stratified random subsample.
+
+        The rows are evaluated in random order, `step` rows at a time, every evaluated subset being
+        a proportionally stratified sample. The evaluation stops as soon as the confidence interval
+        of the mean score is at most `margin` wide on each side, or the budget runs out.
+
+        Args:
+            data: A DataFrame with string columns 'expected' and 'actual', and optionally 'context'.
+            symbol: The symbol whose main score ('score' or 'f1') is estimated. Defaults to "contradictions".
+            margin: The requested half-width of the confidence interval. Default is 0.02.
+            confidence: The confidence level of the interval. Default is 0.95.
+            by: Index level or column names defining the strata. Default is `None`, the rows are stratified
+                by their text length.
+            length_buckets: The number of text length quantile buckets used if `by` is not set. Default is 4.
+            step: The number of rows evaluated before the interval is checked again. Default is 50.
+            min_rows: The minimal number of rows evaluated before stopping on the margin. Default is 100.
+            max_rows: The maximal number of rows evaluated. Default is `None`, no limit.
+            context: A general context to precede the context of each row, defaults to an empty string.
+            retry_cnt: The number of times to retry the evaluation of a single entry in case of a server error.
+                Default is 1.
+            deadline: The time limit of the estimation in seconds. Default is `None`, no limit.
+            max_workers: The number of rows evaluated concurrently. Default is 1.
+            seed: The seed of the random sampling order.
+            config: A config made by `make_config`, replaces `retry_cnt`. It must include `symbol`.
+
+        Returns:
+            OrderedDict: The estimation:
+                {
+                    "symbol": str,
+                    "estimate": float,  # The stratified mean score.
+                    "ci_low": float,
+                    "ci_high": float,
+                    "half_width": float,
+                    "confidence": float,
+                    "rows": int,  # Number of evaluated rows.
+                    "total": int,  # Number of rows of the dataset.
+                    "errors": int,  # Number of evaluated rows with an error, not included in the estimate.
+                    "stopped": str,  # "margin", "budget", "deadline" or "exhausted" (all rows evaluated).
+                    "strata": pd.DataFrame,  # The 'rows', 'evaluated', 'mean', 'std' and 'weight' by stratum.
+                    "result": pd.DataFrame,  # The evaluated rows as returned by `evaluate_dataset`.
+                }
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        if symbol not in SYMBOLS:
+            raise ValueError(f"Wrong symbol: {symbol}, one of {SYMBOLS} expected.")
+
+        if not isinstance(margin, (int, float)) or margin <= 0:
+            raise ValueError("Margin must be a positive number.")
+
+        for name, value in (("Step", step), ("Min rows", min_rows), ("Max rows", max_rows)):
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ValueError(f"{name} must be a positive integer.")
+
+        if config is None:
+            config = self.make_config([symbol], None, retry_cnt)
+        elif symbol not in config.symbols:
+            raise ValueError(f"Symbol {symbol} is not evaluated by the config.")
+
+        run_deadline = deadline_from(deadline)
+        codes, labels = stratum_keys(data, by, length_buckets)
+        order = sampling_order(codes, np.random.default_rng(seed))
+        sizes = pd.Series(np.bincount(codes, minlength=len(labels)))
+
+        limit = len(data) if max_rows is None else min(max_rows, len(data))
+        chunks = []
+        values = []
+        evaluated = 0
+        estimate = stratified_estimate(np.array([]), codes[:0], sizes, confidence)
+
+        while True:
+            if evaluated >= limit:
+                stopped = "exhausted" if limit == len(data) else "budget"
+                break
+            if expired(run_deadline):
+                stopped = "deadline"
+                break
+
+            rows = order[evaluated:min(evaluated + step, limit)]
+            chunk = self._evaluate_frame(
+                data.iloc[rows], config, context, None, run_deadline, max_workers, True
+            )
+            chunks.append(chunk)
+            values.append(score_frame(chunk)[symbol[:3]].to_numpy())
+            evaluated += len(rows)
+
+            estimate = stratified_estimate(
+                np.concatenate(values), codes[order[:evaluated]], sizes, confidence
+            )
+            if estimate["half_width"] <= margin and evaluated >= min(min_rows, limit):
+                stopped = "margin"
+                break
+
+        strata = estimate.pop("strata")
+        strata.index = labels
+
+        return OrderedDict(
+            symbol=symbol,
+            **estimate,
+            confidence=confidence,
+            rows=evaluated,
+            total=len(data),
+            errors=int(sum(np.isnan(v).sum() for v in values)),
+            stopped=stopped,
+            strata=strata,
+            result=pd.concat(chunks) if chunks else None,
+        )
+
+    def _evaluate_frame(
+        self,
+        data: pd.DataFrame,
+        config: EvaluationConfig,
+        context: str,
+        shard: tuple,
+        run_deadline: float,
+        max_workers: int,
+        keep_inputs: bool,
+        on_invalid: str = "error",
+    ) -> pd.DataFrame:
+        """
+        Evaluates a single DataFrame (chunk), see `evaluate_dataset`.
+        """
+        data, outcomes, entries, positions = self._prepare_frame(data, shard, on_invalid)
+
+        evaluated = self._run_entries(entries, config, max_workers, run_deadline, context)
+        for i, outcome in zip(positions, evaluated):
+            outcomes[i] = outcome
+
+        return self._frame_result(data, outcomes, config, context, keep_inputs, shard)
+
+    def _prepare_frame(self, data: pd.DataFrame, shard: tuple, on_invalid: str = "error") -> tuple:
+        """
+        Validates a single DataFrame (chunk) and prepares its rows for evaluation, see `evaluate_dataset`.
+
+        Returns:
+            tuple: A tuple (data, outcomes, entries, positions) where `data` are the rows of the result,
+                `outcomes` a list with the (None, error) outcome of each invalid row and `None` for the others,
+                and `entries` the entries to be evaluated for the rows at `positions`.
+
+        Raises:
+            ValueError: If a column is missing, the shard is invalid or `on_invalid` is "raise" and
+                an invalid row is found.
+        """
         if "expected" not in data.columns:
             raise ValueError("Column name 'expected' not found in the dataset.")
 
         if "actual" not in data.columns:
             raise ValueError("Column name 'actual' not found in the dataset.")
 
+        if shard is not None:
+            data = select_shard(data, *shard)
+
+        problems, _ = row_problems(data)
+        invalid = problems != ""
+
+        if invalid.any():
+            if on_invalid == "raise":
+                first = invalid.argmax()
+                raise ValueError(
+                    f"{invalid.sum()} invalid rows found, the first one {data.index[first]}: {problems[first]}."
+                )
+            if on_invalid == "skip":
+                data, problems, invalid = data[~invalid], problems[~invalid], invalid[~invalid]
+
+        # The shared context is joined to the row context only in the request payload.
+        row_contexts = data["context"].tolist() if "context" in data.columns else [None] * len(data)
+        entries = [
+            {"expected": expected, "actual": actual, "context": row_context}
+            if isinstance(row_context, str)
+            else {"expected": expected, "actual": actual}
+            for expected, actual, row_context, bad in zip(
+                data["expected"].tolist(), data["actual"].tolist(), row_contexts, invalid
+            )
+            if not bad
+        ]
+        outcomes = [(None, ValueError(f"Invalid row: {problem}.")) if problem else None for problem in problems]
+        positions = np.flatnonzero(~invalid).tolist()
+
+        return data, outcomes, entries, positions
+
+    def _frame_result(
+        self,
+        data: pd.DataFrame,
+        outcomes: list,
+        config: EvaluationConfig,
+        context: str,
+        keep_inputs: bool,
+        shard: tuple = None,
+    ) -> pd.DataFrame:
+        """
+        Builds the result of a single DataFrame (chunk) from the (result, error) outcome of each row,
+        see `evaluate_dataset`.
+        """
+        symbols = config.symbols
         scores = {k: [] for k in symbols}
         reasons = {k: [] for k in symbols}
         errors = []
 
-        for row in data.itertuples():
-            try:
-                res = self.evaluate(
-                    {
-                        "expected": row.expected,
-                        "actual": row.actual,
-                        "context": context
-                        + ("\n" + row.context if "context" in row else ""),
-                    },
-                    symbols=symbols,
-                    retry_cnt=retry_cnt,
-                )
+        for res, err in outcomes:
+            if err is None:
                 for symbol in res:
-                    scores[symbol].append(res[symbol]["scores"])
-                    reasons[symbol].append(res[symbol]["reasoning"])
+                    scores[symbol].append(res[symbol].scores)
+                    reasons[symbol].append(Reasoning(res[symbol].reasoning_json))
                 errors.append(None)
-            except requests.exceptions.HTTPError as e:
-                for symbol in symbols:
-                    reasons[symbol].append("")
-                    if symbol =="f1":
-                        scores[symbol].append(OrderedDict(f1=float("nan"), correctness=float("nan"), completeness=float("nan")))
-                    else:
-                        scores[symbol].append(OrderedDict(score=float("nan")))
-                        
-                errors.append(str(e) + "\n" + e.response.text)
-            except Exception as e:
-                for symbol in symbols:
-                    reasons[symbol].append("")
-                    if symbol =="f1":
-                        scores[symbol].append(OrderedDict(f1=float("nan"), correctness=float("nan"), completeness=float("nan")))
-                    else:
-                        scores[symbol].append(OrderedDict(score=float("nan")))
-                errors.append(e)
+                continue
 
-        result = {
-            "expected": data["expected"],
-            "actual": data["actual"],
-            "context": data["context"] if "context" in data.columns else context,
-        }
+            for symbol in symbols:
+                reasons[symbol].append("")
+                if symbol == "f1":
+                    scores[symbol].append(OrderedDict(f1=float("nan"), correctness=float("nan"), completeness=float("nan")))
+                else:
+                    scores[symbol].append(OrderedDict(score=float("nan")))
+
+            if isinstance(err, requests.exceptions.HTTPError):
+                errors.append(str(err) + "\n" + err.response.text)
+            else:
+                errors.append(err)
+
+        if keep_inputs:
+            result = {
+                "expected": data["expected"],
+                "actual": data["actual"],
+                "context": data["context"]
+                if "context" in data.columns
+                else pd.Categorical.from_codes(np.zeros(len(data), dtype=int), [context]),
+            }
+        else:
+            result = {}
 
         for symbol in symbols:
             result[f"scores_{symbol[:3]}"] = scores[symbol]
@@ -557,6 +1505,73 @@ class Evaluator:
         for symbol in symbols:
             result[f"reason_{symbol[:3]}"] = reasons[symbol]
 
+        if config.sampling is not None:
+            for symbol in symbols:
+                results = [res[symbol] if err is None else None for res, err in outcomes]
+                result[f"samples_{symbol[:3]}"] = [0 if r is None else r.n_samples for r in results]
+                result[f"std_{symbol[:3]}"] = [float("nan") if r is None else r.std for r in results]
+
         result["error"] = errors
 
-        return pd.DataFrame(data=result, index=data.index)
+        result = pd.DataFrame(data=result, index=data.index)
+
+        if shard is not None:
+            result.attrs["shard"] = tuple(shard)
+
+        return result
+
+
+def _http_error(response: requests.Response) -> requests.exceptions.HTTPError:
+    """Describes an unsuccessful response of the service."""
+    error_message = (
+        f"HTTPError: {response.status_code} {response.reason}\n"
+        f"for URL: {response.url}\n"
+        f"Response Content: {response.json()}"
+    )
+    return requests.exceptions.HTTPError(error_message, response=response)
+
+
+def _item_error(response: requests.Response, error: dict) -> requests.exceptions.HTTPError:
+    """Describes a failed entry of a batch response, as if it failed by its own response."""
+    item_response = requests.Response()
+    item_response.status_code = error.get("status_code", 500)
+    item_response.reason = "Batch item error"
+    item_response.url = response.url
+    item_response._content = json.dumps(error).encode()
+    item_response.encoding = "utf-8"
+    return _http_error(item_response)
+
+
+def _join_context(shared_context: str, context: str) -> str:
+    """Joins the shared context and the context of an entry by a new line, skipping an empty one."""
+    if not context:
+        return shared_context
+    return shared_context + "\n" + context
+
+
+def _as_chunks(data: pd.DataFrame | Iterable[pd.DataFrame]) -> Iterable[pd.DataFrame]:
+    """Wraps a single DataFrame to a list of chunks."""
+    return [data] if isinstance(data, pd.DataFrame) else data
+
+
+def _is_live_service(url: str) -> bool:
+    """Checks whether the URL points to the evalmy.ai service, any scheme, port, path or letter case."""
+    host = urlsplit(url).hostname or ""
+    live = urlsplit(URL_HOST).hostname
+    return host == live or host.endswith("." + live)
+
+
+def _finish_test_case_item(res_item: OrderedDict, res: OrderedDict, error: Exception):
+    """Stores the evaluation result or error of a test case item into its result."""
+    if error is None:
+        # The reasoning is decoded and validated only now, a malformed one is the error of the item.
+        try:
+            decoded = OrderedDict((symbol, res[symbol].to_dict()) for symbol in res)
+        except ValueError as e:
+            res_item["error"] = str(e)
+        else:
+            res_item.update(decoded)
+    elif isinstance(error, requests.exceptions.HTTPError):
+        res_item["error"] = OrderedDict(code=error.response.status_code, text=str(error))
+    else:
+        res_item["error"] = str(error)
@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+
+class HedgingPolicy:
+    """
+    Hedged requests policy, reducing the tail latency of the evaluation.
+
+    When a request takes longer than the given percentile of the recently observed latencies,
+    a duplicate request is sent and the answer arriving first is used. The other one is ignored.
+    The delay is measured from the start of the request, not from its submission, so requests waiting
+    for a free worker are not hedged because of the queueing.
+    The number of duplicate requests is limited by `max_extra_ratio` of all requests, which keeps
+    the additional quota cost bounded.
+
+    Args:
+        percentile (float, optional): The latency percentile after which a duplicate request is sent.
+            Defaults to 95.
+        window (int, optional): The number of recent latencies the percentile is computed from. Defaults to 200.
+        min_samples (int, optional): The number of observed latencies needed before any hedging. Defaults to 20.
+        max_extra_ratio (float, optional): The maximum ratio of duplicate requests to all requests.
+            Defaults to 0.05.
+        max_workers (int, optional): The initial number of threads running the requests. The pool grows with
+            the number of concurrent requests, so a request never waits for a thread of another caller.
+            Defaults to 32.
+
+    Raises:
+        ValueError: If any input is invalid.
+
+    Examples
+    --------
+    ```{python}
+    from evalmyai import Evaluator, HedgingPolicy
+
+    evaluator = Evaluator(auth, token, hedging=HedgingPolicy(percentile=90, max_extra_ratio=0.1))
+    ```
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        window: int = 200,
+        min_samples: int = 20,
+        max_extra_ratio: float = 0.05,
+        max_workers: int = 32,
+    ):
+        if not isinstance(percentile, (int, float)) or not 0 < percentile < 100:
+            raise ValueError("Percentile must be a number between 0 and 100.")
+
+        if not isinstance(window, int) or window < 1:
+            raise ValueError("Window must be a positive integer.")
+
+        if not isinstance(min_samples, int) or not 1 <= min_samples <= window:
+            raise ValueError("Min samples must be a positive integer not greater than window.")
+
+        if not isinstance(max_extra_ratio, (int, float)) or not 0 <= max_extra_ratio <= 1:
+            raise ValueError("Max extra ratio must be a number between 0 and 1.")
+
+        if not isinstance(max_workers, int) or max_workers < 2:
+            raise ValueError("Max workers must be an integer greater than 1.")
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_extra_ratio = max_extra_ratio
+        self.max_workers = max_workers
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._size = 0
+        self._active = 0
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def delay(self) -> float:
+        """
+        Returns the latency after which a duplicate request is sent.
+
+        Returns:
+            float: The latency percentile in seconds, or `None` if not enough latencies were observed yet.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = np.fromiter(self._latencies, dtype=float)
+        return float(np.percentile(latencies, self.percentile))
+
+    def stats(self) -> OrderedDict:
+        """
+        Returns the hedging statistics.
+
+        Returns:
+            OrderedDict: The number of requests, duplicate requests, duplicates answering first
+                and the current hedging delay.
+        """
+        with self._lock:
+            stats = OrderedDict(
+                requests=self._requests, hedged=self._hedged, hedge_wins=self._hedge_wins
+            )
+        stats["delay"] = self.delay()
+        return stats
+
+    def run(self, send: Callable, duplicate: Callable = None):
+        """
+        Runs a request with hedging.
+
+        Args:
+            send (Callable): Sends the request and returns the response, called with no arguments
+                from a worker thread.
+            duplicate (Callable, optional): Sends the duplicate request, e.g. bypassing a cache or
+                deduplication that would join it to the original request. Defaults to `send`.
+
+        Returns:
+            The response arriving first. If both requests fail, the error of the first one is raised.
+        """
+        delay = self.delay()
+
+        with self._lock:
+            self._requests += 1
+            self._active += 1
+        try:
+            return self._run(send, duplicate or send, delay, self._get_executor())
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _run(self, send: Callable, duplicate: Callable, delay: float, executor: ThreadPoolExecutor):
+        """Sends the request and its duplicate after `delay`, see `run`."""
+        started = threading.Event()
+        futures = [executor.submit(self._timed, send, started)]
+        if delay is not None:
+            started.wait()
+        done, _ = wait(futures, timeout=delay)
+
+        if not done and self._acquire_extra():
+            futures.append(executor.submit(self._timed, duplicate))
+
+        pending = set(futures)
+        first_error = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    first_error = first_error or e
+                    continue
+                if future is not futures[0]:
+                    with self._lock:
+                        self._hedge_wins += 1
+                for other in pending:
+                    other.cancel()
+                return response
+
+        raise first_error
+
+    def _timed(self, send: Callable, started: threading.Event = None):
+        """Sends the request and records its latency, `started` is set when the request starts."""
+        start = time.monotonic()
+        if started is not None:
+            started.set()
+        response = send()
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return response
+
+    def _acquire_extra(self) -> bool:
+        """Reserves a duplicate request if the budget allows."""
+        with self._lock:
+            if self._hedged + 1 > self.max_extra_ratio * self._requests:
+                return False
+            self._hedged += 1
+            return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the executor, replaced by one twice as large when the running requests and their
+        possible duplicates do not fit. The replaced executor is only dropped, as callers may still
+        submit to it, and its threads exit once it is garbage collected.
+        """
+        with self._lock:
+            needed = 2 * self._active
+            if self._executor is None or self._size < needed:
+                self._size = max(self.max_workers, 2 * needed)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._size, thread_name_prefix="evalmyai-hedging"
+                )
+            return self._executor
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+class EvaluationJob:
+    """
+    Handle of an evaluation running in the background, returned by `Evaluator.submit_dataset`
+    and `Evaluator.submit_batch`.
+
+    The evaluation runs in a background thread with its own workers, the handle reports the progress,
+    gives the rows finished so far and cancels the run. Cancelling stops sending new requests, the rows
+    in flight are finished and the others end with a `CancelledError`.
+
+    Args:
+        total (int): The number of rows of the job.
+        outcomes (list): The outcome of each row, `None` until it is finished, then a tuple (result, error).
+            Rows finished before the start, e.g. invalid ones, are given already.
+        run (Callable): Runs the evaluation, called as `run(on_done, cancel)` in the background thread,
+            it calls `on_done(i, result, error)` whenever the i-th row ends and returns the `ScheduleReport`.
+        build (Callable): Builds a result from the outcomes, called as `build(positions, outcomes, partial)`
+            with the positions of the finished rows and their outcomes, `partial` is `False` for the final result.
+
+    Examples
+    --------
+    ```{python}
+    job = evaluator.submit_dataset(data, symbols=["contradictions"], max_workers=8)
+
+    job.progress()
+    early = job.partial_result()
+    if early["scores_con"].apply(lambda s: s["score"]).mean() < 0.5:
+        job.cancel()
+
+    result = job.result()
+    ```
+    """
+
+    def __init__(self, total: int, outcomes: list, run: Callable, build: Callable):
+        self._outcomes = outcomes
+        self._build = build
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+        self._report = None
+        self._total = total
+        self._finished = sum(o is not None for o in outcomes)
+        self._errors = sum(o is not None and o[1] is not None for o in outcomes)
+        self._start = time.monotonic()
+        self._end = None
+
+        self._thread = threading.Thread(target=self._run, args=(run,), name="evalmyai-job", daemon=True)
+        self._thread.start()
+
+    def _run(self, run: Callable) -> None:
+        try:
+            self._report = run(self._on_done, self._cancel)
+            self._result = self._build(list(range(self._total)), self._outcomes, False)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._end = time.monotonic()
+            self._done.set()
+
+    def _on_done(self, i: int, result, error: Exception) -> None:
+        with self._lock:
+            self._outcomes[i] = (result, error)
+            self._finished += 1
+            self._errors += error is not None
+
+    @property
+    def schedule_report(self):
+        """
+        ScheduleReport: The estimated versus actual costs of the job's requests, see
+        `Evaluator.last_schedule_report`. `None` until the job ends.
+        """
+        return self._report
+
+    def done(self) -> bool:
+        """Returns `True` if the job has ended, finished, cancelled or failed."""
+        return self._done.is_set()
+
+    def progress(self) -> OrderedDict:
+        """
+        Reports the progress of the job.
+
+        Returns:
+            OrderedDict: The 'state' ("running", "cancelling", "cancelled", "failed" or "finished"),
+                the number of rows in 'total', 'finished' and 'errors' (including cancelled rows),
+                the 'elapsed' seconds and the 'rows_per_sec' so far.
+        """
+        with self._lock:
+            finished, errors = self._finished, self._errors
+
+        if not self._done.is_set():
+            state = "cancelling" if self._cancel.is_set() else "running"
+        elif self._error is not None:
+            state = "failed"
+        else:
+            state = "cancelled" if self._cancel.is_set() else "finished"
+
+        elapsed = (self._end or time.monotonic()) - self._start
+        return OrderedDict(
+            state=state,
+            total=self._total,
+            finished=finished,
+            errors=errors,
+            elapsed=elapsed,
+            rows_per_sec=finished / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def partial_result(self):
+        """
+        Returns the rows finished so far.
+
+        Returns:
+            pd.DataFrame: The result of the finished rows in the format of the full result, for
+                `submit_dataset` indexed as the dataset, for `submit_batch` by the entry position with
+                a column of `SymbolResult` for each symbol and the 'error' column.
+        """
+        with self._lock:
+            positions = [i for i, o in enumerate(self._outcomes) if o is not None]
+            outcomes = [self._outcomes[i] for i in positions]
+        return self._build(positions, outcomes, True)
+
+    def cancel(self) -> None:
+        """Stops the job, no new requests are sent. Wait for the end by `result`."""
+        self._cancel.set()
+
+    def result(self, timeout: float = None):
+        """
+        Waits for the end of the job and returns its result.
+
+        Args:
+            timeout (float, optional): The maximal time to wait in seconds. Defaults to `None`, no limit.
+
+        Returns:
+            The result as returned by `Evaluator.evaluate_dataset` or `Evaluator.evaluate_batch`.
+
+        Raises:
+            TimeoutError: If the job has not ended within `timeout`.
+            Exception: The error that stopped the job, if any.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("The evaluation job has not finished yet.")
+        if self._error is not None:
+            raise self._error
+        return self._result
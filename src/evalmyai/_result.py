@@ -0,0 +1,181 @@
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+from evalmyai._utils import order_output_dict, order_contradictions, order_f1
+from evalmyai._validators import validate_dict, STRUCT_SINGLE_OUTPUT_DATA
+
+SCORE_FIELDS = {
+    "contradictions": ("score",),
+    "missing_facts": ("score",),
+    "f1": ("f1", "correctness", "completeness"),
+}
+
+
+class SymbolResult(Mapping):
+    """
+    The evaluation result of a single symbol.
+
+    A compact replacement of the nested result dictionary. The scores are kept as plain floats
+    and the reasoning is kept as the JSON string received from the server, it is decoded only
+    when accessed for the first time. For backward compatibility the object behaves as a read-only
+    dictionary with keys "scores" and "reasoning". It is not a `dict` though, convert it by `to_dict`
+    before passing it to `json.dumps`.
+
+    Args:
+        symbol (str): The evaluated symbol.
+        scores (dict): The scores, e.g. {"score": 0.5} or {"f1": 0.8, "correctness": 1.0, "completeness": 0.7}.
+        reasoning (str or dict): The JSON-encoded reasoning as returned by the server, or already decoded.
+        n_samples (int, optional): The number of evaluations the scores are the mean of. Defaults to 1.
+        std (float, optional): The standard deviation of the main score over the samples, `None` if not sampled.
+
+    Raises:
+        ValueError: If the symbol is unknown or the scores are not numeric.
+    """
+
+    __slots__ = (
+        "symbol", "score", "f1", "correctness", "completeness", "n_samples", "std", "_reasoning"
+    )
+
+    _keys = ("scores", "reasoning")
+
+    def __init__(
+        self,
+        symbol: str,
+        scores: dict,
+        reasoning: str | dict,
+        n_samples: int = 1,
+        std: float = None,
+    ):
+        if symbol not in SCORE_FIELDS:
+            raise ValueError(f"'{symbol}' is not valid symbol.")
+
+        if not isinstance(scores, dict):
+            raise ValueError(f"'dict' expected, but '{type(scores).__name__}' found at 'scores'.")
+
+        self.symbol = symbol
+        self.score = self.f1 = self.correctness = self.completeness = None
+
+        for field in SCORE_FIELDS[symbol]:
+            value = scores.get(field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(
+                    f"'float' expected, but '{type(value).__name__}' found at 'scores.{field}'."
+                )
+            setattr(self, field, float(value))
+
+        self.n_samples = n_samples
+        self.std = std
+        self._reasoning = reasoning
+
+    @property
+    def scores(self) -> OrderedDict:
+        """OrderedDict: The scores of the symbol."""
+        return OrderedDict((f, getattr(self, f)) for f in SCORE_FIELDS[self.symbol])
+
+    @property
+    def reasoning_json(self) -> str:
+        """str: The JSON-encoded reasoning, without decoding it."""
+        if isinstance(self._reasoning, str):
+            return self._reasoning
+        return json.dumps(self._reasoning, ensure_ascii=False)
+
+    @property
+    def reasoning(self) -> OrderedDict:
+        """
+        OrderedDict: The decoded reasoning, a dictionary with the list of "statements".
+
+        Raises:
+            ValueError: If the reasoning has a wrong format.
+        """
+        if isinstance(self._reasoning, str):
+            reasoning = json.loads(self._reasoning)
+            struct = STRUCT_SINGLE_OUTPUT_DATA[self.symbol]["reasoning"]
+            if not (v := validate_dict(struct, reasoning))[0]:
+                raise ValueError(f"Wrong output data format with msg: {v[1]}.")
+            keys_order = order_f1 if self.symbol == "f1" else order_contradictions
+            self._reasoning = order_output_dict(reasoning, keys_order["reasoning"])
+        return self._reasoning
+
+    def to_dict(self) -> OrderedDict:
+        """
+        Converts the result to the nested dictionary format.
+
+        Returns:
+            OrderedDict: A dictionary with keys "scores" and "reasoning", and "n_samples" and "std"
+                if the result is sampled.
+        """
+        res = OrderedDict(scores=self.scores, reasoning=self.reasoning)
+        if self.std is not None:
+            res["n_samples"] = self.n_samples
+            res["std"] = self.std
+        return res
+
+    def __getitem__(self, key):
+        if key == "scores":
+            return self.scores
+        if key == "reasoning":
+            return self.reasoning
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        scores = ", ".join(f"{k}={v}" for k, v in self.scores.items())
+        if self.std is not None:
+            scores += f", n_samples={self.n_samples}, std={self.std}"
+        return f"SymbolResult({self.symbol}, {scores})"
+
+
+class Reasoning(Mapping):
+    """
+    The reasoning of a symbol as a read-only dictionary, decoded from the JSON string of the server
+    only when accessed for the first time.
+
+    The `reason_*` columns of `Evaluator.evaluate_dataset` hold these values, so they are indexed as
+    the decoded dictionaries, e.g. `result["reason_con"].iloc[0]["statements"]`, while the reasoning
+    of rows never accessed is never decoded. Use `json` for the JSON string and `to_dict` for a plain
+    dictionary, e.g. for `json.dumps`.
+
+    Args:
+        reasoning (str or Mapping): The JSON-encoded reasoning, or already decoded.
+    """
+
+    __slots__ = ("_json", "_data")
+
+    def __init__(self, reasoning: str | Mapping):
+        if isinstance(reasoning, str):
+            self._json, self._data = reasoning, None
+        else:
+            self._json, self._data = None, reasoning
+
+    @property
+    def json(self) -> str:
+        """str: The JSON-encoded reasoning, without decoding it."""
+        if self._json is None:
+            self._json = json.dumps(self._data, ensure_ascii=False)
+        return self._json
+
+    def to_dict(self) -> dict:
+        """Returns the decoded reasoning as a plain dictionary."""
+        return dict(self._decoded())
+
+    def _decoded(self) -> Mapping:
+        if self._data is None:
+            self._data = json.loads(self._json)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._decoded()[key]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self):
+        return len(self._decoded())
+
+    def __repr__(self):
+        return repr(self.to_dict())
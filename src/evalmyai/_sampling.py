@@ -0,0 +1,163 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+import numpy as np
+
+from evalmyai._result import SymbolResult, SCORE_FIELDS
+
+
+class SamplingPolicy:
+    """
+    Sequential sampling policy, evaluating a symbol repeatedly until its score is stable.
+
+    The first `min_calls` evaluations are sent at once, then `step` more at a time until the score
+    is stable or `max_calls` evaluations are done. The score is stable when its standard deviation
+    is at most `max_std` or the half-width of its confidence interval (normal approximation) is at most
+    `max_ci`. The result holds the mean scores, the reasoning of the sample closest to the mean,
+    the number of samples and the standard deviation of the main score ('score' or 'f1').
+
+    Args:
+        max_calls (int, optional): The maximal number of evaluations of a symbol. Defaults to 5.
+        min_calls (int, optional): The number of evaluations sent first. Defaults to 2.
+        step (int, optional): The number of evaluations added at a time. Defaults to 1.
+        max_std (float, optional): The standard deviation at which the sampling stops. Defaults to `None`.
+        max_ci (float, optional): The confidence interval half-width at which the sampling stops. Defaults to 0.1.
+        confidence (float, optional): The confidence level of the interval. Defaults to 0.95.
+        max_workers (int, optional): The number of threads running the evaluations. Defaults to 32.
+
+    Raises:
+        ValueError: If any input is invalid.
+
+    Examples
+    --------
+    ```{python}
+    from evalmyai import SamplingPolicy
+
+    config = evaluator.make_config(sampling=SamplingPolicy(max_calls=7, max_ci=0.05))
+    result = evaluator.evaluate(data, config=config)
+    print(result["contradictions"].n_samples, result["contradictions"].std)
+    ```
+    """
+
+    def __init__(
+        self,
+        max_calls: int = 5,
+        min_calls: int = 2,
+        step: int = 1,
+        max_std: float = None,
+        max_ci: float = 0.1,
+        confidence: float = 0.95,
+        max_workers: int = 32,
+    ):
+        if not isinstance(min_calls, int) or min_calls < 2:
+            raise ValueError("Min calls must be an integer greater than 1.")
+
+        if not isinstance(max_calls, int) or max_calls < min_calls:
+            raise ValueError("Max calls must be an integer not lower than min calls.")
+
+        if not isinstance(step, int) or step < 1:
+            raise ValueError("Step must be a positive integer.")
+
+        for name, value in (("Max std", max_std), ("Max ci", max_ci)):
+            if value is not None and (not isinstance(value, (int, float)) or value < 0):
+                raise ValueError(f"{name} must be a non-negative number.")
+
+        if max_std is None and max_ci is None:
+            raise ValueError("At least one of max std and max ci must be set.")
+
+        if not isinstance(confidence, (int, float)) or not 0 < confidence < 1:
+            raise ValueError("Confidence must be a number between 0 and 1.")
+
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+
+        self.max_calls = max_calls
+        self.min_calls = min_calls
+        self.step = step
+        self.max_std = max_std
+        self.max_ci = max_ci
+        self.confidence = confidence
+        self.max_workers = max_workers
+
+        self._z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def is_stable(self, scores: np.ndarray) -> bool:
+        """
+        Checks whether the sampled scores are stable enough to stop.
+
+        Args:
+            scores (np.ndarray): The main scores of the samples so far.
+
+        Returns:
+            bool: `True` if no more samples are needed.
+        """
+        n = len(scores)
+        if n >= self.max_calls:
+            return True
+        if n < self.min_calls:
+            return False
+
+        std = float(np.std(scores, ddof=1))
+        if self.max_std is not None and std <= self.max_std:
+            return True
+        return self.max_ci is not None and self._z * std / np.sqrt(n) <= self.max_ci
+
+    def run(self, sample: Callable) -> SymbolResult:
+        """
+        Evaluates a symbol repeatedly.
+
+        Args:
+            sample (Callable): Sends a single evaluation and returns its `SymbolResult`, called with
+                no arguments from worker threads.
+
+        Returns:
+            SymbolResult: The mean result with `n_samples` and `std` set.
+
+        Raises:
+            Exception: The error of the first failed sample.
+        """
+        executor = self._get_executor()
+        samples = []
+        count = self.min_calls
+
+        while True:
+            futures = [executor.submit(sample) for _ in range(count)]
+            try:
+                samples.extend(f.result() for f in futures)
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+
+            main = np.array([getattr(s, SCORE_FIELDS[s.symbol][0]) for s in samples])
+            if self.is_stable(main):
+                return _aggregate(samples, main)
+            count = min(self.step, self.max_calls - len(samples))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="evalmyai-sampling"
+                )
+            return self._executor
+
+
+def _aggregate(samples: list, main: np.ndarray) -> SymbolResult:
+    """Averages the samples, the reasoning is taken from the sample closest to the mean."""
+    symbol = samples[0].symbol
+    scores = {
+        field: float(np.mean([getattr(s, field) for s in samples]))
+        for field in SCORE_FIELDS[symbol]
+    }
+    closest = samples[int(np.argmin(np.abs(main - main.mean())))]
+    return SymbolResult(
+        symbol,
+        scores,
+        closest.reasoning_json,
+        n_samples=len(samples),
+        std=float(np.std(main, ddof=1)),
+    )
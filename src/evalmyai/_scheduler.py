@@ -0,0 +1,182 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+RUN_TIMEOUT_MESSAGE = "Run deadline exceeded, the entry was not evaluated."
+
+RUN_CANCELLED_MESSAGE = "Run cancelled, the entry was not evaluated."
+
+# The fixed part of a request cost in characters, covering the prompt of the service.
+REQUEST_OVERHEAD_CHARS = 2000
+
+
+def deadline_from(seconds: float = None) -> float:
+    """Converts a time limit in seconds to a `time.monotonic()` deadline, `None` means no limit."""
+    return None if seconds is None else time.monotonic() + seconds
+
+
+def expired(deadline: float = None) -> bool:
+    """Checks whether a `time.monotonic()` deadline has passed."""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def estimate_cost(entry: dict, n_symbols: int = 1) -> float:
+    """Estimates the relative cost of evaluating an entry from its text lengths.
+
+    Args:
+        entry (dict): The entry with textual keys "expected", "actual" and "context".
+        n_symbols (int, optional): The number of evaluated symbols. Defaults to 1.
+
+    Returns:
+        float: The estimated cost in characters sent to the language model.
+    """
+    chars = REQUEST_OVERHEAD_CHARS
+    for key in ("expected", "actual", "context"):
+        value = entry.get(key)
+        if isinstance(value, str):
+            chars += len(value)
+    return float(chars * n_symbols)
+
+
+class ScheduleReport:
+    """
+    Estimated versus actual costs of the tasks of a single run.
+
+    Attributes:
+        estimated (np.ndarray): The estimated cost of each task, in the task order.
+        actual (np.ndarray): The wall time of each task in seconds, NaN if the task was not run.
+        dispatch_order (np.ndarray): The task indices in the order they were dispatched.
+        makespan (float): The wall time of the whole run in seconds.
+    """
+
+    def __init__(self, estimated: Sequence, dispatch_order: Sequence):
+        self.estimated = np.asarray(estimated, dtype=float)
+        self.actual = np.full(len(self.estimated), np.nan)
+        self.dispatch_order = np.asarray(dispatch_order, dtype=int)
+        self.makespan = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Converts the report to a DataFrame.
+
+        Returns:
+            pd.DataFrame: A DataFrame indexed by the task number with columns 'estimated', 'actual' and
+                'dispatched', the position of the task in the dispatch order.
+        """
+        dispatched = np.empty(len(self.dispatch_order), dtype=int)
+        dispatched[self.dispatch_order] = np.arange(len(self.dispatch_order))
+        return pd.DataFrame(
+            {"estimated": self.estimated, "actual": self.actual, "dispatched": dispatched}
+        )
+
+    def summary(self, quantiles: Sequence = (0.0, 0.5, 0.9, 0.99, 1.0)) -> OrderedDict:
+        """
+        Summarizes the distributions of the estimated and actual costs.
+
+        Args:
+            quantiles (Sequence, optional): The quantiles to be reported.
+
+        Returns:
+            OrderedDict: The number of tasks, the makespan, the quantiles of both costs and the rank
+                correlation between them, i.e. how well the estimate orders the tasks.
+        """
+        frame = self.to_frame()
+        return OrderedDict(
+            tasks=len(frame),
+            makespan=self.makespan,
+            estimated=frame["estimated"].quantile(quantiles).to_dict(),
+            actual=frame["actual"].quantile(quantiles).to_dict(),
+            # Spearman correlation, computed on ranks to avoid the scipy dependency.
+            rank_correlation=frame["estimated"].rank().corr(frame["actual"].rank()),
+        )
+
+    def __repr__(self):
+        return f"ScheduleReport(tasks={len(self.estimated)}, makespan={self.makespan})"
+
+
+def run_tasks(
+    func: Callable,
+    tasks: Sequence,
+    max_workers: int = 1,
+    deadline: float = None,
+    on_done: Callable = None,
+    cost: Callable = None,
+    report: Callable = None,
+    cancel: threading.Event = None,
+) -> list:
+    """Runs `func(task, deadline)` for every task with at most `max_workers` tasks in flight.
+
+    Tasks are dispatched in the given order, or from the most to the least expensive one when `cost`
+    is given and the tasks run concurrently (longest-processing-time-first), so that a large task
+    dispatched last does not prolong the run. Tasks not started before the deadline are not run
+    at all, they end with a `TimeoutError`, likewise tasks not started before `cancel` is set end with
+    a `CancelledError`.
+
+    Args:
+        func (Callable): The function evaluating a single task, called as `func(task, deadline)`.
+        tasks (Sequence): The tasks to be run.
+        max_workers (int, optional): The maximum number of concurrently running tasks. With 1 the tasks
+            run in the calling thread. Defaults to 1.
+        deadline (float, optional): The `time.monotonic()` value at which the run expires.
+        on_done (Callable, optional): Called as `on_done(i, result, error)` as soon as the i-th task ends,
+            possibly from a worker thread.
+        cost (Callable, optional): Estimates the cost of a task, called as `cost(task)`.
+        report (Callable, optional): Called with the `ScheduleReport` of the run when it is finished.
+        cancel (threading.Event, optional): Stops dispatching the remaining tasks once set, the running
+            tasks are finished.
+
+    Returns:
+        list: A list of (result, error) tuples in the order of tasks, `error` is `None` on success and
+            `result` is `None` on error.
+
+    Raises:
+        ValueError: If `max_workers` is not a positive integer.
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("Max workers must be a positive integer.")
+
+    start = time.monotonic()
+    outcomes = [None] * len(tasks)
+
+    estimated = [cost(task) for task in tasks] if cost is not None else [np.nan] * len(tasks)
+    if cost is not None and max_workers > 1:
+        # A stable sort keeps the input order among tasks of equal cost.
+        order = np.argsort(-np.asarray(estimated, dtype=float), kind="stable").tolist()
+    else:
+        order = list(range(len(tasks)))
+
+    schedule = ScheduleReport(estimated, order)
+
+    def run(i):
+        if cancel is not None and cancel.is_set():
+            outcome = (None, CancelledError(RUN_CANCELLED_MESSAGE))
+        elif expired(deadline):
+            outcome = (None, TimeoutError(RUN_TIMEOUT_MESSAGE))
+        else:
+            task_start = time.monotonic()
+            try:
+                outcome = (func(tasks[i], deadline), None)
+            except Exception as e:
+                outcome = (None, e)
+            schedule.actual[i] = time.monotonic() - task_start
+        outcomes[i] = outcome
+        if on_done is not None:
+            on_done(i, *outcome)
+
+    if max_workers == 1:
+        for i in order:
+            run(i)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(run, i) for i in order]:
+                future.result()
+
+    schedule.makespan = time.monotonic() - start
+    if report is not None:
+        report(schedule)
+
+    return outcomes
@@ -0,0 +1,134 @@
+from collections.abc import Iterable
+import numpy as np
+import pandas as pd
+
+
+def shard_ids(index: pd.Index, shard_count: int) -> np.ndarray:
+    """Assigns every row of an index to one of `shard_count` shards.
+
+    The assignment is given by a stable hash of the index labels, so every process
+    or machine computes the same split for the same dataset. Rows sharing a label
+    always land in the same shard.
+
+    Args:
+        index (pd.Index): The index of the dataset to be sharded.
+        shard_count (int): The total number of shards.
+
+    Returns:
+        np.ndarray: An array of shard numbers (0 .. shard_count - 1), one per row.
+
+    Raises:
+        ValueError: If `shard_count` is not a positive integer.
+    """
+    if not isinstance(shard_count, int) or shard_count < 1:
+        raise ValueError("Shard count must be a positive integer.")
+
+    hashes = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    return (hashes % np.uint64(shard_count)).astype(np.int64)
+
+
+def select_shard(data: pd.DataFrame, shard_index: int, shard_count: int) -> pd.DataFrame:
+    """Selects the rows of a dataset belonging to the shard `shard_index` of `shard_count`.
+
+    Args:
+        data (pd.DataFrame): The dataset to be sharded.
+        shard_index (int): The shard to be selected, counted from zero.
+        shard_count (int): The total number of shards.
+
+    Returns:
+        pd.DataFrame: The rows of the shard in their original order.
+
+    Raises:
+        ValueError: If the shard specification is invalid.
+    """
+    if not isinstance(shard_index, int) or not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"Shard index must be an integer between 0 and {shard_count - 1}."
+        )
+
+    return data[shard_ids(data.index, shard_count) == shard_index]
+
+
+def merge_shards(results: Iterable[pd.DataFrame], index: pd.Index) -> pd.DataFrame:
+    """Merges per-shard outputs of `Evaluator.evaluate_dataset` into a single result.
+
+    Each shard result must come from `evaluate_dataset` called with the `shard`
+    argument, the shard numbers are read from its `attrs`. The merged DataFrame is
+    the same as the result of evaluating the whole dataset at once. Shards with rows
+    left out, e.g. by `on_invalid="skip"`, are merged by the index labels, which must
+    be unique then.
+
+    Args:
+        results (Iterable[pd.DataFrame]): The shard results, in any order.
+        index (pd.Index): The index of the original (unsharded) dataset.
+
+    Returns:
+        pd.DataFrame: The merged result in the original index order.
+
+    Raises:
+        ValueError: If a shard is missing, duplicated or does not match the index.
+    """
+    shards = {}
+    shard_count = None
+
+    for res in results:
+        if "shard" not in res.attrs:
+            raise ValueError("Result is not a shard, 'shard' not found in attrs.")
+        shard_index, count = res.attrs["shard"]
+        if shard_count is None:
+            shard_count = count
+        elif count != shard_count:
+            raise ValueError(
+                f"Shard counts do not match, {shard_count} and {count} found."
+            )
+        if shard_index in shards:
+            raise ValueError(f"Shard {shard_index} found more than once.")
+        shards[shard_index] = res
+
+    if shard_count is None:
+        raise ValueError("No shard results to merge.")
+
+    if missing := sorted(set(range(shard_count)) - set(shards)):
+        raise ValueError(f"Missing shards: {missing}.")
+
+    ids = shard_ids(index, shard_count)
+    sizes = np.bincount(ids, minlength=shard_count)
+
+    for shard_index, res in shards.items():
+        if len(res) > sizes[shard_index]:
+            raise ValueError(
+                f"Shard {shard_index} has {len(res)} rows, {sizes[shard_index]} expected."
+            )
+
+    if any(len(res) < sizes[i] for i, res in shards.items()):
+        return _merge_by_labels(shards, index, ids)
+
+    # Every shard keeps the relative order of its rows, so the k-th row of shard s
+    # sits at the position of the k-th occurrence of s in the original index.
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = pd.Series(ids).groupby(ids).cumcount().to_numpy()
+
+    merged = pd.concat([shards[i] for i in range(shard_count)])
+    merged = merged.iloc[offsets[ids] + rank]
+    merged.attrs = {}
+
+    return merged
+
+
+def _merge_by_labels(shards: dict, index: pd.Index, ids: np.ndarray) -> pd.DataFrame:
+    """Merges shards with rows left out, ordering the rows by the position of their labels in the index."""
+    if not index.is_unique:
+        raise ValueError("Shards with skipped rows can be merged only for a unique index.")
+
+    merged = pd.concat([shards[i] for i in sorted(shards)])
+    positions = index.get_indexer(merged.index)
+    shard_of_row = np.repeat(sorted(shards), [len(shards[i]) for i in sorted(shards)])
+
+    if (positions < 0).any() or not np.array_equal(ids[positions], shard_of_row):
+        raise ValueError("Shard rows do not match the index.")
+    if len(np.unique(positions)) != len(positions):
+        raise ValueError("Shard rows are duplicated.")
+
+    merged = merged.iloc[np.argsort(positions, kind="stable")]
+    merged.attrs = {}
+    return merged
@@ -0,0 +1,262 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from evalmyai._batching import BATCH_PATH
+from evalmyai._broker import parse_address
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# The severity of a statement by the share of the words it misses.
+SEVERITY_LIMITS = [(0.5, "critical"), (0.25, "large"), (0.1, "small"), (0.0, "negligible")]
+
+SEVERITY_WEIGHTS = {"critical": 1.0, "large": 0.5, "small": 0.1, "negligible": 0.0}
+
+
+def simulate_symbol(symbol: str, input_data: dict) -> dict:
+    """Evaluates a symbol by comparing the words of the texts, deterministic and without any model.
+
+    Args:
+        symbol (str): The symbol, "contradictions", "missing_facts" or "f1".
+        input_data (dict): The entry with textual keys "expected", "actual" and "context".
+
+    Returns:
+        dict: The response {"scores", "reasoning"} in the format of the evalmy.ai service, the reasoning
+            JSON-encoded.
+    """
+    expected = set(WORD_PATTERN.findall(input_data["expected"].lower()))
+    actual = set(WORD_PATTERN.findall(input_data["actual"].lower()))
+    missing = len(expected - actual) / max(len(expected), 1)
+    extra = len(actual - expected) / max(len(actual), 1)
+
+    statements = []
+    for kind, share in (("missing", missing), ("extra", extra)):
+        if share:
+            severity = next(s for limit, s in SEVERITY_LIMITS if share > limit)
+            statements.append(
+                {
+                    "reasoning": f"{share:.0%} of the words are {kind}.",
+                    "summary": f"{kind} words",
+                    "severity": severity,
+                }
+            )
+
+    def score(found):
+        return max(0.0, 1.0 - sum(SEVERITY_WEIGHTS[s["severity"]] for s in found))
+
+    if symbol == "f1":
+        correctness, completeness = 1.0 - extra, 1.0 - missing
+        f1 = 2 * correctness * completeness / (correctness + completeness or 1.0)
+        scores = {"f1": f1, "correctness": correctness, "completeness": completeness}
+    elif symbol == "missing_facts":
+        scores = {"score": score(statements[:1] if missing else [])}
+    else:
+        scores = {"score": score(statements[-1:] if extra else [])}
+
+    return {"scores": scores, "reasoning": json.dumps({"statements": statements})}
+
+
+class SimulatedServer:
+    """
+    Local stand-in for the evalmy.ai service, for tests and benchmarks without the live service.
+
+    The server answers both the single symbol endpoint and the batch endpoint (see `BatchingPolicy`)
+    under the `url` address. The scores are computed from the word overlap of the texts, so they are
+    deterministic. The response latency and failures follow a configurable profile, a request takes
+    `(latency + per_kchar * characters / 1000)` seconds multiplied by a log-normal noise with
+    the standard deviation `jitter`.
+
+    Args:
+        address (str, optional): The address to listen on, "host:port". Defaults to "127.0.0.1:0", a free port.
+        latency (float, optional): The base latency of a request in seconds. Defaults to 0.
+        per_kchar (float, optional): The latency per thousand characters of the texts in seconds. Defaults to 0.
+        jitter (float, optional): The standard deviation of the log-normal latency noise. Defaults to 0.
+        error_rate (float, optional): The probability of a request (or a batch item) failing with
+            the status 500. Defaults to 0.
+        seed (int, optional): The seed of the latency noise and failures.
+
+    Examples
+    --------
+    ```{python}
+    from evalmyai import SimulatedServer
+
+    server = SimulatedServer(latency=0.2, jitter=0.3, error_rate=0.01).start()
+    evaluator = Evaluator(auth, token, url=server.url)
+    ...
+    server.shutdown()
+    ```
+    """
+
+    def __init__(
+        self,
+        address: str = "127.0.0.1:0",
+        latency: float = 0.0,
+        per_kchar: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        for name, value in (("Latency", latency), ("Per kchar", per_kchar), ("Jitter", jitter)):
+            if not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{name} must be a non-negative number.")
+
+        if not isinstance(error_rate, (int, float)) or not 0 <= error_rate <= 1:
+            raise ValueError("Error rate must be a number between 0 and 1.")
+
+        self.address = parse_address(address)[1]
+        self.latency = latency
+        self.per_kchar = per_kchar
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = OrderedDict(requests=0, batches=0, rows=0, errors=0)
+        self._server = None
+
+    def serve_forever(self) -> None:
+        """Runs the server until `shutdown` is called."""
+        self._get_server().serve_forever()
+
+    def start(self) -> "SimulatedServer":
+        """Runs the server in a background thread."""
+        server = self._get_server()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stops the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        """str: The API address, to be passed as the Evaluator `url`."""
+        host, port = self._get_server().server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def stats(self) -> OrderedDict:
+        """
+        Returns the server statistics.
+
+        Returns:
+            OrderedDict: The number of requests, batch requests, evaluated rows and failures.
+        """
+        with self._lock:
+            return OrderedDict(self._stats)
+
+    def handle(self, path: str, request: dict) -> tuple:
+        """
+        Handles a single request.
+
+        Args:
+            path (str): The request path relative to the API address, e.g. "symbol/evaluate/f1/v1".
+            request (dict): The decoded request payload.
+
+        Returns:
+            tuple: A tuple (status_code, response).
+        """
+        if not request.get("api_token"):
+            return 401, {"detail": "Missing API token."}
+
+        if path == BATCH_PATH:
+            return self._handle_batch(request)
+
+        parts = path.split("/")
+        if len(parts) != 4 or parts[:2] != ["symbol", "evaluate"]:
+            return 404, {"detail": f"Not found: {path}."}
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["rows"] += 1
+
+        self._sleep(_text_chars(request["input_data"]))
+        if self._fails():
+            return 500, {"detail": "Simulated server error."}
+        return 200, simulate_symbol(parts[2], request["input_data"])
+
+    def _handle_batch(self, request: dict) -> tuple:
+        items = request["items"]
+        context = request.get("context") or ""
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["batches"] += 1
+            self._stats["rows"] += len(items)
+
+        chars = len(context) + sum(_text_chars(item) for item in items)
+        self._sleep(chars)
+        if self._fails():
+            return 500, {"detail": "Simulated server error."}
+
+        results = []
+        for item in items:
+            if self._fails():
+                results.append({"error": {"status_code": 500, "message": "Simulated item error."}})
+                continue
+            if context:
+                item = dict(item, context=context + ("\n" + item["context"] if item.get("context") else ""))
+            results.append({symbol: simulate_symbol(symbol, item) for symbol in request["symbols"]})
+
+        return 200, {"results": results}
+
+    def _sleep(self, chars: int) -> None:
+        delay = self.latency + self.per_kchar * chars / 1000
+        if self.jitter:
+            with self._lock:
+                delay *= self._random.lognormvariate(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _fails(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            self._stats["errors"] += failed
+        return failed
+
+    def _get_server(self) -> ThreadingHTTPServer:
+        if self._server is None:
+            simulator = self
+
+            class Handler(BaseHTTPRequestHandler):
+                protocol_version = "HTTP/1.1"
+
+                def do_POST(self):
+                    length = int(self.headers.get("Content-Length", 0))
+                    path = self.path.split("?")[0].strip("/")
+                    try:
+                        request = json.loads(self.rfile.read(length))
+                        if not path.startswith("api/"):
+                            status, response = 404, {"detail": f"Not found: {path}."}
+                        else:
+                            status, response = simulator.handle(path[len("api/"):], request)
+                    except (ValueError, KeyError, TypeError) as e:
+                        status, response = 422, {"detail": f"Invalid request: {e}."}
+
+                    body = json.dumps(response).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            class Server(ThreadingHTTPServer):
+                daemon_threads = True
+
+            self._server = Server(self.address, Handler)
+        return self._server
+
+
+def _text_chars(input_data: dict) -> int:
+    return sum(len(input_data.get(key) or "") for key in ("expected", "actual", "context"))
@@ -0,0 +1,107 @@
+import glob
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Iterable
+
+SUMMARY_FILE = "summary.json"
+
+
+def find_test_cases(paths: str | Iterable[str]) -> list:
+    """Finds the test case JSON files.
+
+    Args:
+        paths (str or Iterable[str]): A directory (all its *.json files are used), a glob pattern,
+            a file or an iterable of any of these.
+
+    Returns:
+        list: Sorted paths of the test case files, without duplicates.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    files = set()
+
+    for path in map(str, paths):
+        if os.path.isdir(path):
+            files.update(glob.glob(os.path.join(path, "*.json")))
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            files.update(p for p in glob.glob(path, recursive=True) if os.path.isfile(p))
+
+    return sorted(f for f in files if os.path.basename(f) != SUMMARY_FILE)
+
+
+def output_paths(files: list, output_dir: str) -> list:
+    """Maps the test case files to their result files.
+
+    The results keep the directory structure of the test cases relative to their common directory,
+    so test cases of the same name in different directories do not overwrite each other.
+
+    Args:
+        files (list): The paths of the test case files.
+        output_dir (str): The directory for the result files.
+
+    Returns:
+        list: The path of the result file of each test case.
+    """
+    if not files:
+        return []
+    dirs = [os.path.dirname(os.path.abspath(f)) for f in files]
+    root = os.path.commonpath(dirs)
+    return [
+        os.path.join(output_dir, os.path.relpath(os.path.abspath(f), root)) for f in files
+    ]
+
+
+def finish_test_case(case: OrderedDict, output_path: str = None) -> None:
+    """Summarizes an evaluated test case and writes its result.
+
+    The test case result is dropped from the memory after it is written. If it cannot be written,
+    the error is recorded in the test case record instead of raised, so the other test cases go on.
+
+    Args:
+        case (OrderedDict): The test case record with keys "path" and "result".
+        output_path (str, optional): The path of the result file, see `output_paths`.
+    """
+    result = case.pop("result")
+    case.pop("pending", None)
+
+    items = result["items"]
+    case["items"] = len(items)
+    case["errors"] = sum("error" in item for item in items)
+
+    scores = OrderedDict()
+    for item in items:
+        for key, value in item.items():
+            if isinstance(value, dict) and "scores" in value:
+                scores.setdefault(key, []).append(next(iter(value["scores"].values())))
+    case["scores"] = OrderedDict((k, sum(v) / len(v)) for k, v in scores.items())
+
+    if output_path is not None:
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as fo:
+                json.dump(result, fo, ensure_ascii=False, indent=4)
+        except OSError as e:
+            case["error"] = f"Writing the result failed: {e}"
+        else:
+            case["output"] = output_path
+
+
+def write_summary(cases: list, elapsed: float, output_dir: str = None) -> OrderedDict:
+    """Builds the suite summary and writes it to `output_dir`, see `Evaluator.evaluate_suite`."""
+    summary = OrderedDict(
+        cases=len(cases),
+        items=sum(case.get("items", 0) for case in cases),
+        errors=sum(case.get("errors", 0) for case in cases),
+        elapsed=elapsed,
+        test_cases=cases,
+    )
+
+    if output_dir is not None:
+        with open(os.path.join(output_dir, SUMMARY_FILE), "w", encoding="utf-8") as fo:
+            json.dump(summary, fo, ensure_ascii=False, indent=4)
+
+    return summary
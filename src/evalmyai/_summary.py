@@ -0,0 +1,317 @@
+import json
+from collections.abc import Mapping, Sequence
+import numpy as np
+import pandas as pd
+
+SEVERITIES = ["critical", "large", "small", "negligible"]
+
+# The score fields by the symbol abbreviation used in the result column names.
+SCORE_FIELDS = {
+    "con": ["score"],
+    "mis": ["score"],
+    "f1": ["f1", "correctness", "completeness"],
+}
+
+# The maximal number of values gathered at once by the bootstrap.
+BOOTSTRAP_CHUNK = 10_000_000
+
+# The maximal number of distinct values for which the bootstrap resamples value counts.
+MULTINOMIAL_MAX_UNIQUE = 1000
+
+
+def score_frame(result: pd.DataFrame) -> pd.DataFrame:
+    """Extracts numeric scores from the `scores_*` columns of an `evaluate_dataset` result.
+
+    Args:
+        result (pd.DataFrame): The result of `Evaluator.evaluate_dataset`.
+
+    Returns:
+        pd.DataFrame: A float DataFrame with the index of `result` and one column per score, named by
+            the symbol abbreviation (e.g. 'con', 'mis'), for f1 also 'f1_correctness' and 'f1_completeness'.
+
+    Raises:
+        ValueError: If `result` has no `scores_*` column.
+    """
+    columns = [c for c in result.columns if c.startswith("scores_")]
+    if not columns:
+        raise ValueError("No 'scores_*' column found in the result.")
+
+    frames = []
+
+    for column in columns:
+        symbol = column[len("scores_"):]
+        values = result[column]
+
+        if pd.api.types.is_numeric_dtype(values):
+            frames.append(values.astype(float).rename(symbol).to_frame())
+            continue
+
+        records = [v if isinstance(v, dict) else {} for v in values.tolist()]
+        fields = SCORE_FIELDS.get(symbol) or list(dict.fromkeys(k for r in records for k in r))
+        scores = pd.DataFrame(
+            {
+                symbol if field in ("score", symbol) else f"{symbol}_{field}": np.fromiter(
+                    (r.get(field, np.nan) for r in records), dtype=float, count=len(records)
+                )
+                for field in fields or ["score"]
+            },
+            index=result.index,
+        )
+        frames.append(scores)
+
+    return pd.concat(frames, axis=1)
+
+
+def summarize(
+    result: pd.DataFrame,
+    by: str | Sequence[str] = None,
+    quantiles: Sequence[float] = (0.1, 0.5, 0.9),
+    confidence: float = 0.95,
+    n_boot: int = 1000,
+    seed: int = None,
+) -> pd.DataFrame:
+    """Summarizes the scores of an `evaluate_dataset` result.
+
+    Args:
+        result (pd.DataFrame): The result of `Evaluator.evaluate_dataset`.
+        by (str or Sequence[str], optional): Index level or column names to group the rows by.
+            Defaults to `None`, all rows together.
+        quantiles (Sequence[float], optional): The score quantiles to be computed. Defaults to (0.1, 0.5, 0.9).
+        confidence (float, optional): The confidence level of the bootstrap interval of the mean. Defaults to 0.95.
+        n_boot (int, optional): The number of bootstrap resamples, 0 skips the interval. Defaults to 1000.
+        seed (int, optional): The seed of the bootstrap random generator.
+
+    Returns:
+        pd.DataFrame: A DataFrame indexed by the groups (if any) and the score name with columns 'count',
+            'errors', 'mean', 'std', 'q[quantile]' and 'ci_low', 'ci_high'. The rows with an error are
+            excluded from all statistics except 'errors'.
+    """
+    scores = score_frame(result)
+    keys = _group_keys(result, by)
+    rng = np.random.default_rng(seed)
+
+    long = scores.melt(var_name="score", ignore_index=True)
+    for i, key in enumerate(keys):
+        long[f"_key{i}"] = np.tile(key, scores.shape[1])
+    group_cols = [f"_key{i}" for i in range(len(keys))] + ["score"]
+
+    grouped = long.groupby(group_cols, sort=False, dropna=False)["value"]
+    summary = pd.DataFrame(
+        {
+            "count": grouped.count(),
+            "errors": grouped.size() - grouped.count(),
+            "mean": grouped.mean(),
+            "std": grouped.std(),
+        }
+    )
+
+    for q in quantiles:
+        summary[f"q{q:g}"] = grouped.quantile(q)
+
+    if n_boot > 0:
+        intervals = grouped.apply(
+            lambda v: _bootstrap_interval(v.dropna().to_numpy(), confidence, n_boot, rng)
+        )
+        summary["ci_low"] = intervals.str[0]
+        summary["ci_high"] = intervals.str[1]
+
+    summary.index = summary.index.set_names(_key_names(by) + ["score"])
+    return summary
+
+
+def severity_counts(result: pd.DataFrame, by: str | Sequence[str] = None) -> pd.DataFrame:
+    """Counts the statements by severity in the `reason_*` columns of an `evaluate_dataset` result.
+
+    Args:
+        result (pd.DataFrame): The result of `Evaluator.evaluate_dataset`.
+        by (str or Sequence[str], optional): Index level or column names to group the rows by.
+            Defaults to `None`, all rows together.
+
+    Returns:
+        pd.DataFrame: A DataFrame indexed by the groups (if any) and the symbol abbreviation with one column
+            per severity, 'critical', 'large', 'small', 'negligible' first.
+
+    Raises:
+        ValueError: If `result` has no `reason_*` column.
+    """
+    columns = [c for c in result.columns if c.startswith("reason_")]
+    if not columns:
+        raise ValueError("No 'reason_*' column found in the result.")
+
+    keys = _group_keys(result, by)
+    names = _key_names(by)
+    counts = []
+
+    for column in columns:
+        rows, severity = _find_severities(result[column].tolist())
+
+        frame = pd.DataFrame(
+            {f"_key{i}": key[rows] for i, key in enumerate(keys)}, index=range(len(rows))
+        )
+        frame["symbol"] = column[len("reason_"):]
+        frame["severity"] = severity
+        counts.append(frame)
+
+    counts = pd.concat(counts, ignore_index=True)
+    table = counts.groupby(list(counts.columns), sort=False).size().unstack(
+        "severity", fill_value=0
+    )
+
+    ordered = SEVERITIES + sorted(c for c in table.columns if c not in SEVERITIES)
+    table = table.reindex(columns=ordered, fill_value=0)
+    table.columns.name = None
+    table.index = table.index.set_names(names + ["symbol"])
+    return table
+
+
+def compare_runs(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    by: str | Sequence[str] = None,
+    confidence: float = 0.95,
+    n_boot: int = 1000,
+    seed: int = None,
+) -> pd.DataFrame:
+    """Compares the scores of two `evaluate_dataset` results row by row.
+
+    The rows are paired by the index, only rows present and evaluated without error in both results
+    are compared.
+
+    Args:
+        baseline (pd.DataFrame): The reference result.
+        candidate (pd.DataFrame): The compared result.
+        by (str or Sequence[str], optional): Index level or column names of the candidate to group the rows by.
+            Defaults to `None`, all rows together.
+        confidence (float, optional): The confidence level of the bootstrap interval of the mean difference.
+            Defaults to 0.95.
+        n_boot (int, optional): The number of bootstrap resamples, 0 skips the interval. Defaults to 1000.
+        seed (int, optional): The seed of the bootstrap random generator.
+
+    Returns:
+        pd.DataFrame: A DataFrame indexed by the groups (if any) and the score name with columns 'count',
+            'mean_baseline', 'mean_candidate', 'diff' (candidate minus baseline), 'improved', 'worsened'
+            and 'ci_low', 'ci_high' of the difference.
+
+    Raises:
+        ValueError: If the index of any result is not unique.
+    """
+    if not baseline.index.is_unique or not candidate.index.is_unique:
+        raise ValueError("Compared results must have a unique index.")
+
+    index = baseline.index.intersection(candidate.index, sort=False)
+    base = score_frame(baseline).loc[index]
+    cand = score_frame(candidate).loc[index]
+    cand = cand[[c for c in cand.columns if c in base.columns]]
+    base = base[cand.columns]
+
+    diff = cand - base
+    keys = _group_keys(candidate.loc[index], by)
+    rng = np.random.default_rng(seed)
+
+    def long(frame):
+        values = frame.melt(var_name="score", ignore_index=True)
+        for i, key in enumerate(keys):
+            values[f"_key{i}"] = np.tile(key, frame.shape[1])
+        return values
+
+    values = long(diff).rename(columns={"value": "diff"})
+    values["baseline"] = long(base)["value"]
+    values["candidate"] = long(cand)["value"]
+    values = values[values["diff"].notna()]
+    values["improved"] = values["diff"] > 0
+    values["worsened"] = values["diff"] < 0
+
+    group_cols = [f"_key{i}" for i in range(len(keys))] + ["score"]
+    grouped = values.groupby(group_cols, sort=False)
+    comparison = pd.DataFrame(
+        {
+            "count": grouped["diff"].count(),
+            "mean_baseline": grouped["baseline"].mean(),
+            "mean_candidate": grouped["candidate"].mean(),
+            "diff": grouped["diff"].mean(),
+            "improved": grouped["improved"].sum(),
+            "worsened": grouped["worsened"].sum(),
+        }
+    )
+
+    if n_boot > 0:
+        intervals = grouped["diff"].apply(
+            lambda v: _bootstrap_interval(v.to_numpy(), confidence, n_boot, rng)
+        )
+        comparison["ci_low"] = intervals.str[0]
+        comparison["ci_high"] = intervals.str[1]
+
+    comparison.index = comparison.index.set_names(_key_names(by) + ["score"])
+    return comparison
+
+
+def _key_names(by: str | Sequence[str] = None) -> list:
+    if by is None:
+        return []
+    return [by] if isinstance(by, str) else list(by)
+
+
+def _group_keys(result: pd.DataFrame, by: str | Sequence[str] = None) -> list:
+    """Resolves the grouping names to arrays, a column takes precedence over an index level."""
+    keys = []
+    for name in _key_names(by):
+        if name in result.columns:
+            keys.append(result[name].to_numpy())
+        elif name in result.index.names:
+            keys.append(result.index.get_level_values(name).to_numpy())
+        else:
+            raise ValueError(f"'{name}' is neither a column nor an index level of the result.")
+    return keys
+
+
+def _find_severities(reasons: list) -> tuple:
+    """Finds the severity field of every statement in reasonings, decoding the JSON-encoded ones.
+
+    Empty or undecodable reasonings, e.g. of failed rows, and statements without a severity are skipped.
+
+    Returns:
+        tuple: A tuple (rows, severities) of arrays, the row position and severity of every statement.
+    """
+    rows, severities = [], []
+    for i, reason in enumerate(reasons):
+        if isinstance(reason, str):
+            try:
+                reason = json.loads(reason) if reason else None
+            except ValueError:
+                continue
+        if not isinstance(reason, Mapping):
+            continue
+        statements = reason.get("statements")
+        if not isinstance(statements, list):
+            continue
+        for statement in statements:
+            if isinstance(statement, Mapping) and isinstance(statement.get("severity"), str):
+                rows.append(i)
+                severities.append(statement["severity"])
+    return np.array(rows, dtype=np.int64), np.array(severities, dtype=object)
+
+
+def _bootstrap_interval(
+    values: np.ndarray, confidence: float, n_boot: int, rng: np.random.Generator
+) -> tuple:
+    """Computes the percentile bootstrap interval of the mean, resampling in memory-bounded chunks."""
+    n = len(values)
+    if n == 0:
+        return (np.nan, np.nan)
+
+    alpha = (1 - confidence) / 2
+    unique, counts = np.unique(values, return_counts=True)
+
+    if len(unique) <= MULTINOMIAL_MAX_UNIQUE:
+        # Scores take only a few distinct values, resampling their counts is equivalent
+        # to resampling the rows and does not depend on the number of rows.
+        means = rng.multinomial(n, counts / n, size=n_boot) @ unique / n
+    else:
+        chunk = max(1, BOOTSTRAP_CHUNK // n)
+        means = np.empty(n_boot)
+        for start in range(0, n_boot, chunk):
+            size = min(chunk, n_boot - start)
+            means[start:start + size] = values[rng.integers(0, n, (size, n))].mean(axis=1)
+
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return (float(low), float(high))
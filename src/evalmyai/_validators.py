@@ -1,3 +1,8 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from evalmyai._scheduler import REQUEST_OVERHEAD_CHARS
+
 def check_structure(struct, obj, path=""):
     """Recursively checks if the structure of `obj` matches the structure of `struct`.
 
@@ -127,3 +132,88 @@ def validate_test_case_data(test_case: dict) -> bool:
         bool: True if the test case data is valid, False otherwise.
     """
     return check_structure(STRUCT_TEST_CASE_DATA, test_case)
+
+
+def preflight_dataset(data: pd.DataFrame) -> tuple:
+    """Validates all rows of a dataset at once, before any of them is evaluated.
+
+    The columns are checked as a whole: 'expected' and 'actual' must be non-empty strings, 'context'
+    (if present) a string or missing.
+
+    Args:
+        data (pd.DataFrame): A DataFrame with string columns 'expected' and 'actual', and optionally 'context'.
+
+    Returns:
+        tuple: A tuple (invalid, stats) where `invalid` is a string Series indexed by the invalid rows giving
+            the problems found, e.g. "actual: missing", and `stats` is an OrderedDict with the number of 'rows',
+            'valid' and 'invalid' rows, the 'chars_[column]' total and 'max_chars_[column]' maximal text length
+            of the valid rows, and 'estimated_chars', the estimated characters sent per evaluated symbol.
+
+    Raises:
+        ValueError: If 'expected' or 'actual' columns are not found in the dataset.
+    """
+    problems, lengths = row_problems(data)
+
+    invalid_mask = problems != ""
+    invalid = pd.Series(problems[invalid_mask], index=data.index[invalid_mask], dtype=object)
+
+    valid = ~invalid_mask
+    stats = OrderedDict(rows=len(data), valid=int(valid.sum()), invalid=int(invalid_mask.sum()))
+    total = 0
+    for column, length in lengths.items():
+        length = length[valid]
+        stats[f"chars_{column}"] = int(length.sum())
+        stats[f"max_chars_{column}"] = int(length.max()) if len(length) else 0
+        total += stats[f"chars_{column}"]
+    stats["estimated_chars"] = total + REQUEST_OVERHEAD_CHARS * stats["valid"]
+
+    return invalid, stats
+
+
+def row_problems(data: pd.DataFrame) -> tuple:
+    """Finds the problems of the dataset rows, see `preflight_dataset`.
+
+    Returns:
+        tuple: A tuple (problems, lengths) where `problems` is an array with a string for each row,
+            empty for valid rows, and `lengths` are the text lengths by column.
+
+    Raises:
+        ValueError: If 'expected' or 'actual' columns are not found in the dataset.
+    """
+    for column in ("expected", "actual"):
+        if column not in data.columns:
+            raise ValueError(f"Column name '{column}' not found in the dataset.")
+
+    columns = [c for c in ("expected", "actual", "context") if c in data.columns]
+    problems = np.full(len(data), "", dtype=object)
+    lengths = {}
+
+    for column in columns:
+        missing = data[column].isna().to_numpy()
+        length = _str_lengths(data[column])
+        checks = [("not a string", np.isnan(length) & ~missing)]
+        if column != "context":
+            checks = [("missing", missing)] + checks
+            checks.append(("empty", _str_lengths(data[column], strip=True) == 0))
+        else:
+            length = np.where(missing, 0, length)
+
+        for problem, mask in checks:
+            problems[mask] += f"; {column}: {problem}"
+        lengths[column] = length
+
+    found = problems != ""
+    problems[found] = [p[2:] for p in problems[found]]
+    return problems, lengths
+
+
+def _str_lengths(values: pd.Series, strip: bool = False) -> np.ndarray:
+    """Lengths of the string values of a Series, NaN for any other value."""
+    if not (pd.api.types.is_string_dtype(values) or values.dtype == object):
+        return np.full(len(values), np.nan)
+    try:
+        strings = values.str.strip() if strip else values
+        return strings.str.len().to_numpy(dtype=float, na_value=np.nan)
+    except AttributeError:
+        # Object columns without any string value.
+        return np.full(len(values), np.nan)
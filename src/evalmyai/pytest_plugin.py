@@ -0,0 +1,298 @@
+"""
+Pytest plugin evaluating the LLM regression tests of a session concurrently.
+
+Tests declare their evaluation by the `evalmyai` marker. All marked tests are submitted to a shared
+pool of workers right after the collection, so by the time a test runs, its result is usually ready:
+
+```python
+import pytest
+from evalmyai.pytest_plugin import assert_score
+
+@pytest.mark.evalmyai(expected="Paris", actual=my_rag("What is the capital of France?"))
+def test_capital(evalmyai_result):
+    assert_score(evalmyai_result, 0.9)
+```
+
+The evaluator is configured once in `conftest.py`:
+
+```python
+def pytest_evalmyai_evaluator(config):
+    return Evaluator(auth, token)
+```
+
+Under pytest-xdist, each worker prefetches only its share of the marked tests (by a stable hash
+of the test id), the rest are evaluated when run. Use it together with a shared `EvaluationBroker`
+(`--evalmyai-broker`), so that a test prefetched by one worker and run by another is answered from
+the broker cache. Without a broker, xdist workers evaluate the tests only when they run.
+
+The plugin is loaded by every pytest session, so the client and its dependencies are imported only
+once an evaluator is requested.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+import pytest
+
+if TYPE_CHECKING:
+    from evalmyai._evalmyai import Evaluator
+
+MARKER = "evalmyai"
+
+# The same as `evalmyai._evalmyai.DEFAULT_SYMBOLS`, which is not imported on the plugin load.
+DEFAULT_SYMBOLS = ["contradictions"]
+
+
+class EvalmyaiHookSpecs:
+    """Hooks of the evalmyai pytest plugin."""
+
+    @pytest.hookspec(firstresult=True)
+    def pytest_evalmyai_evaluator(self, config):
+        """
+        Creates the `Evaluator` used by the tests of the session.
+
+        Args:
+            config (pytest.Config): The pytest config.
+
+        Returns:
+            Evaluator: The evaluator, or `None` if evalmyai is not configured.
+        """
+
+
+class EvaluationEngine:
+    """
+    Concurrent and cached execution of evaluations within a test session.
+
+    Identical evaluations (the same data, symbols and scoring) are run only once.
+
+    Args:
+        evaluator (Evaluator): The evaluator.
+        max_workers (int, optional): The number of concurrent evaluations. Defaults to 16.
+        retry_cnt (int, optional): Number of times to retry evaluation in case of server errors. Defaults to 1.
+    """
+
+    def __init__(self, evaluator: "Evaluator", max_workers: int = 16, retry_cnt: int = 1):
+        from evalmyai._evalmyai import Evaluator
+
+        if not isinstance(evaluator, Evaluator):
+            raise ValueError("Invalid evaluator object. Must be Evaluator.")
+
+        self.evaluator = evaluator
+        self.retry_cnt = retry_cnt
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="evalmyai-pytest"
+        )
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, data: dict, symbols: list = DEFAULT_SYMBOLS, scoring: dict = None
+    ) -> Future:
+        """
+        Submits an evaluation without waiting for it.
+
+        Args:
+            data (dict): A dictionary with textual keys "expected", "actual", and "context".
+            symbols (list, optional): A list of symbols to be evaluated. Defaults to ["contradictions"].
+            scoring (dict, optional): The scoring criteria. If not set, default from the evaluator is used.
+
+        Returns:
+            Future: The future of the `Evaluator.evaluate` result.
+        """
+        key = _request_key(data, symbols, scoring)
+
+        with self._lock:
+            if key not in self._futures:
+                self._futures[key] = self._executor.submit(
+                    self.evaluator.evaluate,
+                    dict(data),
+                    symbols=list(symbols),
+                    scoring=scoring,
+                    retry_cnt=self.retry_cnt,
+                )
+            return self._futures[key]
+
+    def evaluate(
+        self, data: dict, symbols: list = DEFAULT_SYMBOLS, scoring: dict = None
+    ) -> OrderedDict:
+        """Evaluates an entry, waiting for the result, see `submit`."""
+        return self.submit(data, symbols, scoring).result()
+
+    def shutdown(self) -> None:
+        """Stops the workers, the evaluations not started yet are dropped."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def assert_score(
+    result: OrderedDict, min_score: float, symbol: str = DEFAULT_SYMBOLS[0]
+) -> None:
+    """
+    Asserts that the score of a symbol is at least `min_score`.
+
+    Args:
+        result (OrderedDict): The result of `Evaluator.evaluate`.
+        min_score (float): The minimal accepted score.
+        symbol (str, optional): The checked symbol. Defaults to "contradictions".
+
+    Raises:
+        AssertionError: If the score is lower, listing the statements found by the evaluation.
+    """
+    res = result[symbol]
+    score = next(iter(res["scores"].values()))
+    if score < min_score:
+        raise AssertionError(
+            f"{symbol} score {score} is lower than {min_score}.{_describe(res)}"
+        )
+
+
+def assert_no_severity(
+    result: OrderedDict,
+    severities: tuple = ("critical", "large"),
+    symbol: str = DEFAULT_SYMBOLS[0],
+) -> None:
+    """
+    Asserts that the evaluation found no statement of the given severities.
+
+    Args:
+        result (OrderedDict): The result of `Evaluator.evaluate`.
+        severities (tuple, optional): The forbidden severities. Defaults to ("critical", "large").
+        symbol (str, optional): The checked symbol. Defaults to "contradictions".
+
+    Raises:
+        AssertionError: If such a statement is found.
+    """
+    res = result[symbol]
+    found = [s for s in res["reasoning"]["statements"] if s["severity"] in severities]
+    if found:
+        raise AssertionError(
+            f"{symbol}: {len(found)} statement(s) of severity {', '.join(severities)} found.{_describe(res)}"
+        )
+
+
+def _describe(res) -> str:
+    lines = [
+        f"\n  - {s['severity']}: {s['summary']}" for s in res["reasoning"]["statements"]
+    ]
+    return "".join(lines)
+
+
+def _request_key(data: dict, symbols: list, scoring: dict = None) -> str:
+    return hashlib.sha256(
+        json.dumps([data, list(symbols), scoring], sort_keys=True).encode()
+    ).hexdigest()
+
+
+def _marker_request(item: pytest.Item) -> tuple:
+    """Reads the evaluation request (data, symbols, scoring) of a marked test."""
+    marker = item.get_closest_marker(MARKER)
+    kwargs = dict(marker.kwargs)
+    symbols = kwargs.pop("symbols", DEFAULT_SYMBOLS)
+    scoring = kwargs.pop("scoring", None)
+    data = marker.args[0] if marker.args else kwargs
+    return data, symbols, scoring
+
+
+def _prefetched_share(config: pytest.Config, item: pytest.Item) -> bool:
+    """Checks whether the test is prefetched by this process, see the module docs on xdist."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        return True
+    if not config.getoption("evalmyai_broker"):
+        return False
+    worker = int(workerinput["workerid"].lstrip("gw"))
+    digest = hashlib.sha256(item.nodeid.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % workerinput["workercount"] == worker
+
+
+def pytest_addhooks(pluginmanager):
+    pluginmanager.add_hookspecs(EvalmyaiHookSpecs)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("evalmyai")
+    group.addoption(
+        "--evalmyai-workers",
+        type=int,
+        default=16,
+        help="Number of concurrent evalmyai evaluations (default 16).",
+    )
+    group.addoption(
+        "--evalmyai-broker",
+        default=None,
+        help="Address of a shared evalmyai broker, 'host:port' or 'unix:/path'.",
+    )
+    group.addoption(
+        "--evalmyai-retry",
+        type=int,
+        default=1,
+        help="Number of attempts of every evalmyai evaluation (default 1).",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        f"{MARKER}(data=None, *, expected, actual, context, symbols, scoring): "
+        "evaluate the test data with evalmyai, the result is the 'evalmyai_result' fixture.",
+    )
+    config._evalmyai_engine = None
+
+
+def _get_engine(config: pytest.Config) -> EvaluationEngine:
+    if config._evalmyai_engine is None:
+        evaluator = config.hook.pytest_evalmyai_evaluator(config=config)
+        if evaluator is None:
+            return None
+        if config.getoption("evalmyai_broker"):
+            from evalmyai._broker import BrokerClient
+
+            # A copy, the evaluator of the conftest may be used outside the plugin too.
+            evaluator = copy.copy(evaluator)
+            evaluator.broker = BrokerClient(config.getoption("evalmyai_broker"))
+        config._evalmyai_engine = EvaluationEngine(
+            evaluator,
+            max_workers=config.getoption("evalmyai_workers"),
+            retry_cnt=config.getoption("evalmyai_retry"),
+        )
+    return config._evalmyai_engine
+
+
+def pytest_collection_finish(session):
+    if session.config.option.collectonly:
+        return
+
+    items = [item for item in session.items if item.get_closest_marker(MARKER)]
+    if not items or (engine := _get_engine(session.config)) is None:
+        return
+
+    # Longer requests first, so that they do not delay the end of the session.
+    requests = [_marker_request(item) for item in items if _prefetched_share(session.config, item)]
+    requests.sort(key=lambda r: -sum(len(str(v)) for v in r[0].values()))
+    for data, symbols, scoring in requests:
+        engine.submit(data, symbols, scoring)
+
+
+def pytest_unconfigure(config):
+    if getattr(config, "_evalmyai_engine", None) is not None:
+        config._evalmyai_engine.shutdown()
+
+
+@pytest.fixture(scope="session")
+def evalmyai_engine(pytestconfig) -> EvaluationEngine:
+    """The shared `EvaluationEngine` of the session."""
+    engine = _get_engine(pytestconfig)
+    if engine is None:
+        pytest.skip("evalmyai is not configured, implement pytest_evalmyai_evaluator in conftest.py.")
+    return engine
+
+
+@pytest.fixture
+def evalmyai_result(request, evalmyai_engine) -> OrderedDict:
+    """The `Evaluator.evaluate` result of the data given by the `evalmyai` marker of the test."""
+    if request.node.get_closest_marker(MARKER) is None:
+        pytest.fail(f"'evalmyai_result' requires the '{MARKER}' marker.", pytrace=False)
+    return evalmyai_engine.evaluate(*_marker_request(request.node))
@@ -0,0 +1,109 @@
+from unittest import TestCase
+
+import pandas as pd
+import requests
+
+from evalmyai import BatchingPolicy, SimulatedServer
+from evalmyai._simulator import simulate_symbol
+
+from tests.utils import init_evaluator
+
+
+class TestBatchingPolicy(TestCase):
+    def test_pack(self):
+        policy = BatchingPolicy(max_rows=3, max_chars=100)
+        self.assertEqual([[0, 1, 2], [3, 4]], policy.pack([10, 10, 10, 10, 10]))
+        self.assertEqual([[0], [1], [2, 3]], policy.pack([60, 150, 30, 30]))
+        self.assertEqual([], policy.pack([]))
+
+        self.assertRaises(ValueError, BatchingPolicy, max_rows=0)
+        self.assertRaises(ValueError, BatchingPolicy, max_chars=0)
+
+
+class TestSimulatedServer(TestCase):
+    def setUp(self):
+        self.server = SimulatedServer().start()
+        self.addCleanup(self.server.shutdown)
+
+    def test_simulate_symbol(self):
+        res = simulate_symbol("f1", {"expected": "a b", "actual": "a b c d"})
+        self.assertEqual({"f1": 2 / 3, "correctness": 0.5, "completeness": 1.0}, res["scores"])
+        res = simulate_symbol("contradictions", {"expected": "a b", "actual": "a b"})
+        self.assertEqual({"score": 1.0}, res["scores"])
+
+    def test_single_requests(self):
+        evaluator = init_evaluator(url=self.server.url)
+        res = evaluator.evaluate(
+            {"expected": "Paris", "actual": "Paris, France"}, symbols=["contradictions", "missing_facts"]
+        )
+        self.assertEqual(1.0, res["missing_facts"].score)
+        self.assertEqual(0.5, res["contradictions"].score)
+        self.assertEqual("large", res["contradictions"]["reasoning"]["statements"][0]["severity"])
+        self.assertEqual(2, self.server.stats()["requests"])
+
+        self.assertRaises(ValueError, init_evaluator, url="evalmy.ai")
+
+    def test_batch_matches_single(self):
+        data = pd.DataFrame(
+            {
+                "expected": [f"fact {i} is true" for i in range(20)],
+                "actual": [f"fact {i} is {'true' if i % 2 else 'false'}" for i in range(20)],
+                "context": ["question"] * 10 + [None] * 10,
+            }
+        )
+        symbols = ["contradictions", "f1"]
+        single = init_evaluator(url=self.server.url).evaluate_dataset(data, symbols, context="shared")
+        requests_single = self.server.stats()["requests"]
+
+        evaluator = init_evaluator(url=self.server.url, batching=BatchingPolicy(max_rows=8))
+        batched = evaluator.evaluate_dataset(data, symbols, context="shared", max_workers=2)
+
+        pd.testing.assert_frame_equal(single, batched)
+        self.assertEqual(40, requests_single)
+        self.assertEqual(3, self.server.stats()["batches"])
+
+    def test_batch_per_symbol_and_errors(self):
+        evaluator = init_evaluator(
+            url=self.server.url, batching=BatchingPolicy(combine_symbols=False)
+        )
+        data = [{"expected": "a", "actual": "a"}, {"expected": 1, "actual": "b"}]
+        results, errors = evaluator.evaluate_batch(data, symbols=["contradictions", "f1"])
+
+        self.assertEqual(["contradictions", "f1"], list(results[0]))
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], ValueError)
+        self.assertEqual(2, self.server.stats()["batches"])
+
+    def test_batch_retries_failed_items(self):
+        server = SimulatedServer(error_rate=0.3, seed=1).start()
+        self.addCleanup(server.shutdown)
+
+        evaluator = init_evaluator(url=server.url, batching=BatchingPolicy())
+        data = [{"expected": f"a{i}", "actual": f"a{i}"} for i in range(30)]
+
+        _, errors = evaluator.evaluate_batch(data, retry_cnt=1)
+        failed = [e for e in errors if e is not None]
+        self.assertTrue(failed)
+        self.assertTrue(all(isinstance(e, requests.exceptions.HTTPError) for e in failed))
+        self.assertEqual(500, failed[0].response.status_code)
+
+        _, errors = evaluator.evaluate_batch(data, retry_cnt=10)
+        self.assertEqual([None] * 30, errors)
+
+    def test_batch_result_count_mismatch(self):
+        def handle(path, request):
+            return 200, {"results": [{"f1": simulate_symbol("f1", request["items"][0])}]}
+
+        self.server.handle = handle
+        evaluator = init_evaluator(url=self.server.url, batching=BatchingPolicy())
+        data = [{"expected": "a", "actual": "a"}, {"expected": "b", "actual": "b"}]
+        results, errors = evaluator.evaluate_batch(data, symbols=["f1"], retry_cnt=2)
+
+        self.assertEqual([None, None], results)
+        self.assertTrue(all("1 results, 2 expected" in str(e) for e in errors))
+
+    def test_batching_requires_url(self):
+        self.assertRaises(ValueError, init_evaluator, batching=BatchingPolicy())
+        for url in ("https://evalmy.ai/api", "http://EvalMy.ai/api/?x=1", "https://evalmy.ai:443", "https://www.evalmy.ai/api"):
+            self.assertRaises(ValueError, init_evaluator, url=url, batching=BatchingPolicy())
+        init_evaluator(url="https://evalmy.ai.example.com/api", batching=BatchingPolicy())
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import tracemalloc
+from unittest import TestCase
+
+from evalmyai import BatchingPolicy
+from evalmyai.__main__ import main
+from evalmyai._benchmark import run_benchmark, synthetic_entries
+
+
+class TestBenchmark(TestCase):
+    def test_synthetic_entries(self):
+        entries = synthetic_entries(5, 100, seed=1)
+        self.assertEqual(5, len(entries))
+        self.assertTrue(all(99 <= len(e["expected"]) < 120 for e in entries))
+        self.assertEqual(entries, synthetic_entries(5, 100, seed=1))
+
+    def test_run_benchmark(self):
+        report = run_benchmark(
+            concurrency=(1, 4),
+            symbols=(1, 2),
+            latency=(0.0,),
+            rows=10,
+            isolate_server=False,
+        )
+        runs = report["runs"]
+        self.assertEqual(3 * 2 * 2, len(runs))
+        self.assertTrue(all(run["errors"] == 0 and run["rows"] == 10 for run in runs))
+        self.assertTrue(all(run["rows_per_sec"] > 0 and run["peak_alloc_bytes"] > 0 for run in runs))
+        self.assertEqual(["p50", "p90", "p99", "max"], list(runs[0]["task_seconds"]))
+        self.assertIn("process_peak_rss_bytes", runs[0])
+
+        curve = report["curves"][0]
+        self.assertEqual([1, 4], curve["concurrency"])
+        self.assertEqual(6, len(report["curves"]))
+        json.dumps(report)
+
+        self.assertRaises(ValueError, run_benchmark, methods=["evaluate"])
+        self.assertRaises(ValueError, run_benchmark, symbols=[4])
+
+    def test_batching_and_errors(self):
+        report = run_benchmark(
+            methods=["evaluate_dataset"],
+            concurrency=(2,),
+            rows=20,
+            latency=(0.0,),
+            error_rate=0.5,
+            batching=BatchingPolicy(max_rows=5),
+            trace_memory=False,
+            isolate_server=False,
+        )
+        run = report["runs"][0]
+        self.assertEqual(4, run["tasks"])
+        self.assertGreater(run["errors"], 0)
+        self.assertIsNone(run["peak_alloc_bytes"])
+
+    def test_caller_tracing_kept(self):
+        tracemalloc.start()
+        try:
+            report = run_benchmark(
+                methods=["evaluate_batch"], concurrency=(1,), rows=5, latency=(0.0,), isolate_server=False
+            )
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(report["runs"][0]["peak_alloc_bytes"], 0)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            main(
+                ["bench", "--methods", "evaluate_batch", "--concurrency", "2", "--rows", "5",
+                 "--latency", "0", "--output", path]
+            )
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(1, len(report["runs"]))
+        self.assertTrue(report["parameters"]["isolate_server"])
@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from unittest import TestCase, mock
+
+import requests
+
+from evalmyai._sampling import SamplingPolicy
+from evalmyai._hedging import HedgingPolicy
+from evalmyai._broker import EvaluationBroker, BrokerClient, RateLimiter, parse_address, _cacheable
+from tests.utils import init_evaluator, make_response, FakePost
+
+
+class TestBroker(TestCase):
+    def setUp(self):
+        self.broker = EvaluationBroker("127.0.0.1:0").start()
+        self.post = FakePost(delay=0.05)
+        patcher = mock.patch.object(self.broker.session, "post", self.post)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.broker.shutdown)
+
+    def test_parse_address(self):
+        self.assertEqual(("localhost", 8765), parse_address("localhost:8765")[1])
+        self.assertEqual("/tmp/b.sock", parse_address("unix:/tmp/b.sock")[1])
+        self.assertRaises(ValueError, parse_address, "localhost")
+
+    def test_evaluate(self):
+        evaluator = init_evaluator(broker=self.broker.server_address)
+        res = evaluator.evaluate({"expected": "a", "actual": "b"})
+        self.assertEqual(1.0, res["contradictions"].score)
+
+        evaluator.evaluate({"expected": "a", "actual": "b"})
+        self.assertEqual(1, len(self.post.calls))
+        self.assertEqual(1, self.broker.stats()["cache_hits"])
+
+    def test_sampling_bypasses_cache(self):
+        evaluator = init_evaluator(broker=self.broker.server_address)
+        config = evaluator.make_config(sampling=SamplingPolicy(min_calls=3))
+        evaluator.evaluate({"expected": "a", "actual": "b"})
+        res = evaluator.evaluate({"expected": "a", "actual": "b"}, config=config)
+
+        self.assertEqual(3, res["contradictions"].n_samples)
+        self.assertEqual(4, len(self.post.calls))
+        self.assertEqual(0, self.broker.stats()["cache_hits"])
+
+    def test_dedup(self):
+        clients = [init_evaluator(broker=self.broker.server_address) for _ in range(4)]
+        threads = [
+            threading.Thread(
+                target=c.evaluate, args=({"expected": "c", "actual": "d"},)
+            )
+            for c in clients
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, len(self.post.calls))
+        stats = BrokerClient(self.broker.server_address).stats()
+        self.assertEqual(4, stats["requests"])
+        self.assertEqual(3, stats["cache_hits"] + stats["dedup_hits"])
+
+    def test_hedged_duplicate_bypasses_dedup(self):
+        hedging = HedgingPolicy(percentile=50, min_samples=3, max_extra_ratio=1.0)
+        evaluator = init_evaluator(broker=self.broker.server_address, hedging=hedging)
+        for i in range(3):
+            evaluator.evaluate({"expected": "a", "actual": str(i)})
+
+        self.post.delay = lambda task: 2.0 if len(self.post.calls) == 4 else 0.05
+        start = time.monotonic()
+        res = evaluator.evaluate({"expected": "a", "actual": "slow"})
+        self.assertEqual(1.0, res["contradictions"].score)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(5, len(self.post.calls))
+        self.assertEqual(1, hedging.stats()["hedge_wins"])
+        self.assertEqual(0, self.broker.stats()["dedup_hits"])
+
+    def test_errors(self):
+        self.post.status_code = 500
+        evaluator = init_evaluator(broker=self.broker.server_address)
+        self.assertRaises(
+            requests.exceptions.HTTPError, evaluator.evaluate, {"expected": "a", "actual": "b"}
+        )
+        self.assertEqual(0, self.broker.stats()["cached"])
+
+        evaluator = init_evaluator(broker="127.0.0.1:1")
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            evaluator.evaluate,
+            {"expected": "a", "actual": "b"},
+        )
+
+    def test_failures_not_cached(self):
+        failed = make_response()
+        failed._content = json.dumps({"scores": None, "reasoning": "Capacity exceeded."}).encode()
+        responses = [failed, make_response(score=0.5)]
+        self.post.calls = []
+
+        def post(url, json=None, timeout=None):
+            self.post.calls.append(url)
+            return responses[min(len(self.post.calls), len(responses)) - 1]
+
+        with mock.patch.object(self.broker.session, "post", post):
+            evaluator = init_evaluator(broker=self.broker.server_address)
+            res = evaluator.evaluate({"expected": "a", "actual": "b"}, retry_cnt=3)
+
+        self.assertEqual(0.5, res["contradictions"].score)
+        self.assertEqual(2, len(self.post.calls))
+        self.assertEqual(0, self.broker.stats()["cache_hits"])
+
+        def reply(body):
+            return {"status_code": 200, "content": json.dumps(body)}
+
+        self.assertTrue(_cacheable(reply({"results": [{"f1": {"scores": {}}}]})))
+        self.assertFalse(_cacheable(reply({"results": [{"error": {"status_code": 500}}]})))
+        self.assertFalse(_cacheable(reply({"scores": None})))
+
+    def test_read_timeout_not_resent(self):
+        self.post.delay = 0.5
+        client = BrokerClient(self.broker.server_address)
+        with mock.patch("evalmyai._broker.BROKER_TIMEOUT_MARGIN", 0):
+            self.assertRaises(
+                requests.exceptions.Timeout,
+                client.post,
+                "https://evalmy.ai/api/symbol/evaluate/f1/v1",
+                json={"x": 1},
+                timeout=(1, 0.1),
+                cache=False,
+            )
+        time.sleep(0.6)
+        self.assertEqual(1, self.broker.stats()["upstream"])
+
+    def test_forwards_only_to_api(self):
+        client = BrokerClient(self.broker.server_address)
+        self.assertRaises(
+            requests.exceptions.ConnectionError, client.post, "http://169.254.169.254/latest", json={}
+        )
+        self.assertRaises(
+            requests.exceptions.ConnectionError, client.post, "https://evalmy.ai.example.com/api/x", json={}
+        )
+        self.assertEqual(0, len(self.post.calls))
+        self.assertRaises(ValueError, EvaluationBroker, api_url="evalmy.ai")
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
@@ -0,0 +1,76 @@
+import importlib.util
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+
+import pandas as pd
+
+from evalmyai._chunks import iter_windows
+from tests.utils import init_evaluator, FakePost
+
+
+class TestChunks(TestCase):
+    data = pd.DataFrame(
+        {"expected": [f"e{i}" for i in range(10)], "actual": [f"a{i}" for i in range(10)]},
+        index=[f"row{i}" for i in range(10)],
+    )
+
+    def test_iter_windows(self):
+        sizes = [len(c) for c in iter_windows([self.data, self.data.iloc[:2]], window=4)]
+        self.assertEqual([4, 4, 2, 2], sizes)
+        self.assertRaises(ValueError, list, iter_windows([self.data], window=0))
+        self.assertRaises(ValueError, list, iter_windows([[1, 2]]))
+
+    def test_chunked_dataset(self):
+        chunks = pd.read_csv(io.StringIO(self.data.to_csv()), index_col=0, chunksize=3)
+        with FakePost().patch():
+            results = init_evaluator().evaluate_dataset(chunks, window=2, keep_inputs=False)
+            results = list(results)
+
+        self.assertEqual([2, 1, 2, 1, 2, 1, 1], [len(r) for r in results])
+        result = pd.concat(results)
+        self.assertTrue(result.index.equals(self.data.index))
+        self.assertEqual(["scores_con", "reason_con", "error"], list(result.columns))
+        self.assertEqual([], result["reason_con"].iloc[0]["statements"])
+
+    def test_sink(self):
+        collected = []
+        with FakePost().patch():
+            self.assertIsNone(
+                init_evaluator().evaluate_dataset(self.data, window=4, sink=collected.append)
+            )
+        self.assertEqual(3, len(collected))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "result.csv")
+            with FakePost().patch():
+                init_evaluator().evaluate_dataset(self.data, window=4, sink=path)
+            result = pd.read_csv(path, index_col=0)
+            self.assertEqual(10, len(result))
+            self.assertEqual(1.0, json.loads(result["scores_con"].iloc[-1])["score"])
+            self.assertEqual({"statements": []}, json.loads(result["reason_con"].iloc[-1]))
+
+            self.assertRaises(
+                ValueError,
+                init_evaluator().evaluate_dataset,
+                self.data,
+                sink=os.path.join(tmp, "result.txt"),
+            )
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_sink(self):
+        data = self.data.copy()
+        data.loc["row6", "actual"] = None
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "result.parquet")
+            with FakePost().patch():
+                init_evaluator().evaluate_dataset(data, window=4, sink=path)
+            result = pd.read_parquet(path)
+
+        self.assertEqual(10, len(result))
+        self.assertTrue(result["error"].iloc[:4].isna().all())
+        self.assertIn("Invalid row", result["error"].loc["row6"])
+        self.assertEqual(1.0, json.loads(result["scores_con"].iloc[-1])["score"])
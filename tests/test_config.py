@@ -0,0 +1,98 @@
+import copy
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from evalmyai import EvaluationConfig
+from evalmyai._evalmyai import DEFAULT_SCORING
+
+from tests.utils import init_evaluator, FakePost
+
+SCORING = {
+    "name": "linear",
+    "params": {"weights": {"critical": 1, "large": 0.9, "small": 0.2, "negligible": 0}},
+}
+
+
+class TestEvaluationConfig(TestCase):
+    def test_make_config(self):
+        evaluator = init_evaluator()
+        config = evaluator.make_config(
+            ["contradictions", "f1"], {"f1": SCORING, "contradictions": None}, retry_cnt=3
+        )
+
+        self.assertIsInstance(config, EvaluationConfig)
+        self.assertEqual(("contradictions", "f1"), config.symbols)
+        self.assertEqual(3, config.retry_cnt)
+        self.assertEqual(SCORING, config.symbol_scoring("f1"))
+        self.assertEqual(DEFAULT_SCORING["contradictions"], config.symbol_scoring("contradictions"))
+
+        self.assertRaises(ValueError, evaluator.make_config, ["unknown"])
+        self.assertRaises(ValueError, evaluator.make_config, retry_cnt=0)
+        self.assertRaises(ValueError, evaluator.make_config, scoring={"contradictions": {"name": 1}})
+
+    def test_config_is_immutable(self):
+        scoring = copy.deepcopy(SCORING)
+        config = init_evaluator().make_config(scoring={"contradictions": scoring})
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.retry_cnt = 2
+        with self.assertRaises(TypeError):
+            config.scoring["contradictions"]["params"]["weights"]["large"] = 0.0
+
+        scoring["params"]["weights"]["large"] = 0.0
+        self.assertEqual(0.9, config.scoring["contradictions"]["params"]["weights"]["large"])
+
+    def test_set_scoring_copy_on_write(self):
+        evaluator = init_evaluator()
+        config = evaluator.make_config()
+        defaults = evaluator.scoring
+
+        evaluator.set_scoring("contradictions", SCORING)
+
+        self.assertIsNot(defaults, evaluator.scoring)
+        self.assertEqual(DEFAULT_SCORING["contradictions"], defaults["contradictions"])
+        self.assertEqual(DEFAULT_SCORING["contradictions"], config.symbol_scoring("contradictions"))
+        self.assertEqual(SCORING, evaluator.make_config().symbol_scoring("contradictions"))
+
+    def test_evaluate_does_not_modify_inputs(self):
+        evaluator = init_evaluator()
+        data = {"expected": "a", "actual": "b"}
+        scoring = {"contradictions": None}
+        post = FakePost()
+
+        with post.patch():
+            evaluator.evaluate(data, scoring=scoring)
+
+        self.assertEqual({"expected": "a", "actual": "b"}, data)
+        self.assertEqual({"contradictions": None}, scoring)
+        self.assertEqual("", post.calls[0][1]["input_data"]["context"])
+        self.assertEqual(DEFAULT_SCORING["contradictions"], post.calls[0][1]["scoring"])
+
+    def test_shared_inputs_across_threads(self):
+        evaluator = init_evaluator()
+        data = {"expected": "a", "actual": "b"}
+        config = evaluator.make_config(["contradictions", "missing_facts"])
+        post = FakePost(delay=0.01)
+
+        with post.patch(), ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(lambda _: evaluator.evaluate(data, config=config), range(32))
+            )
+
+        self.assertEqual(32, len(results))
+        self.assertTrue(all(list(r) == ["contradictions", "missing_facts"] for r in results))
+        self.assertEqual(64, len(post.calls))
+        self.assertEqual({"expected": "a", "actual": "b"}, data)
+
+    def test_evaluate_test_case_with_retry(self):
+        evaluator = init_evaluator()
+        test_case = {"items": [{"expected": "a", "actual": "b"}]}
+        post = FakePost(status_code=500)
+
+        with post.patch():
+            result = evaluator.evaluate_test_case(test_case, retry_cnt=2)
+
+        self.assertEqual(2, len(post.calls))
+        self.assertEqual(500, result["items"][0]["error"]["code"])
+        self.assertEqual({"items": [{"expected": "a", "actual": "b"}]}, test_case)
@@ -0,0 +1,44 @@
+import sys
+from unittest import TestCase
+
+import pandas as pd
+
+from tests.utils import init_evaluator, FakePost
+
+
+class TestSharedContext(TestCase):
+    shared = "Shared instructions. " * 1000
+
+    def test_dataset_row_context(self):
+        data = pd.DataFrame(
+            {"expected": ["a", "b", "c"], "actual": ["x", "y", "z"], "context": ["q1", None, ""]}
+        )
+        post = FakePost()
+        with post.patch():
+            result = init_evaluator().evaluate_dataset(data, context="Shared.")
+
+        contexts = sorted(call[1]["input_data"]["context"] for call in post.calls)
+        self.assertEqual(["Shared.", "Shared.", "Shared.\nq1"], contexts)
+        self.assertEqual(data["context"].tolist(), result["context"].tolist())
+
+    def test_dataset_shared_context_stored_once(self):
+        data = pd.DataFrame({"expected": ["a"] * 100, "actual": ["b"] * 100})
+        with FakePost().patch():
+            result = init_evaluator().evaluate_dataset(data, context=self.shared)
+
+        self.assertIsInstance(result["context"].dtype, pd.CategoricalDtype)
+        self.assertEqual([self.shared], result["context"].cat.categories.tolist())
+        self.assertLess(result["context"].memory_usage(deep=True), 2 * sys.getsizeof(self.shared))
+
+    def test_test_case_context_not_repeated(self):
+        test_case = {
+            "context": self.shared,
+            "items": [{"expected": "a", "actual": "b", "context": "q"}] * 10,
+        }
+        post = FakePost()
+        with post.patch():
+            result = init_evaluator().evaluate_test_case(test_case)
+
+        self.assertIs(self.shared, result["context"])
+        self.assertTrue(all(item["context"] == "q" for item in result["items"]))
+        self.assertEqual(self.shared + "\nq", post.calls[0][1]["input_data"]["context"])
@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from evalmyai._estimation import stratum_keys, sampling_order, stratified_estimate
+
+from tests.utils import init_evaluator, FakePost
+
+
+def length_score(json):
+    return 1.0 if len(json["input_data"]["expected"]) % 2 else 0.0
+
+
+def make_data(n=400):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "expected": ["a" * k for k in rng.integers(1, 50, n)],
+            "actual": "b",
+            "group": rng.choice(["x", "y"], n, p=[0.8, 0.2]),
+        }
+    )
+
+
+class TestEstimation(TestCase):
+    def test_stratum_keys(self):
+        data = make_data(100)
+        codes, labels = stratum_keys(data, by="group")
+        self.assertEqual("group", labels.name)
+        self.assertEqual(data["group"].tolist(), labels[codes].tolist())
+
+        codes, labels = stratum_keys(data, length_buckets=4)
+        self.assertEqual([25, 25, 25, 25], np.bincount(codes).tolist())
+        self.assertEqual(4, len(labels))
+        self.assertRaises(ValueError, stratum_keys, data, length_buckets=0)
+
+    def test_sampling_order_is_stratified(self):
+        strata = np.array([0] * 80 + [1] * 20)
+        order = sampling_order(strata, np.random.default_rng(1))
+        self.assertEqual(list(range(100)), sorted(order))
+        for n in (10, 25, 50):
+            self.assertAlmostEqual(0.2 * n, (strata[order[:n]] == 1).sum(), delta=1)
+
+    def test_stratified_estimate(self):
+        sizes = pd.Series([8, 2])
+        est = stratified_estimate(np.array([1.0, 0.0, 1.0, 0.0]), np.array([0, 0, 1, 1]), sizes)
+        self.assertAlmostEqual(0.5, est["estimate"])
+        self.assertEqual(2, est["strata"].loc[1, "evaluated"])
+
+        # A fully evaluated population has no sampling error.
+        est = stratified_estimate(np.array([1.0, 0.5]), np.array([0, 1]), pd.Series([1, 1]))
+        self.assertEqual(0.0, est["half_width"])
+        self.assertEqual(0.75, est["estimate"])
+
+    def test_estimate_dataset(self):
+        data = make_data()
+        truth = np.mean([length_score({"input_data": {"expected": e}}) for e in data["expected"]])
+        evaluator = init_evaluator()
+
+        with FakePost(score=length_score).patch():
+            est = evaluator.estimate_dataset(data, margin=0.08, step=20, min_rows=40, seed=3, max_workers=4)
+
+        self.assertEqual("margin", est["stopped"])
+        self.assertLess(est["rows"], len(data))
+        self.assertEqual(est["rows"], len(est["result"]))
+        self.assertLessEqual(est["half_width"], 0.08)
+        self.assertLess(abs(est["estimate"] - truth), 0.2)
+        self.assertTrue(est["result"].index.isin(data.index).all())
+
+    def test_budget_and_exhausted(self):
+        data = make_data(60)
+        evaluator = init_evaluator()
+
+        with FakePost(score=length_score).patch():
+            est = evaluator.estimate_dataset(data, by="group", margin=0.001, max_rows=30, step=25)
+            self.assertEqual(("budget", 30), (est["stopped"], est["rows"]))
+
+            est = evaluator.estimate_dataset(data, margin=0.001, step=25)
+            self.assertEqual(("margin", 60), (est["stopped"], est["rows"]))
+            self.assertEqual(0.0, est["half_width"])
+
+        self.assertRaises(ValueError, evaluator.estimate_dataset, data, margin=0)
+        self.assertRaises(ValueError, evaluator.estimate_dataset, data, symbol="f1", config=evaluator.make_config())
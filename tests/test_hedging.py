@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from evalmyai._hedging import HedgingPolicy
+from tests.utils import init_evaluator, FakePost
+
+
+class TestHedging(TestCase):
+    def test_delay(self):
+        policy = HedgingPolicy(percentile=50, window=4, min_samples=2)
+        self.assertIsNone(policy.delay())
+        for _ in range(4):
+            policy.run(lambda: time.sleep(0.01))
+        self.assertGreaterEqual(policy.delay(), 0.01)
+
+        self.assertRaises(ValueError, HedgingPolicy, percentile=100)
+        self.assertRaises(ValueError, HedgingPolicy, window=10, min_samples=20)
+
+    def test_hedged_request(self):
+        policy = HedgingPolicy(percentile=50, min_samples=5, max_extra_ratio=0.5)
+        for _ in range(5):
+            policy.run(lambda: time.sleep(0.01))
+
+        calls = []
+
+        def send():
+            calls.append(None)
+            time.sleep(1.0 if len(calls) == 1 else 0.01)
+            return len(calls)
+
+        start = time.monotonic()
+        self.assertEqual(2, policy.run(send))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(1, policy.stats()["hedge_wins"])
+
+    def test_budget(self):
+        policy = HedgingPolicy(percentile=50, min_samples=1, max_extra_ratio=0.25)
+        policy.run(lambda: None)
+        for _ in range(7):
+            policy.run(lambda: time.sleep(0.01))
+        self.assertLessEqual(policy.stats()["hedged"], 2)
+
+    def test_queued_request_not_hedged(self):
+        policy = HedgingPolicy(percentile=50, min_samples=2, max_extra_ratio=1.0, max_workers=2)
+        for _ in range(2):
+            policy.run(lambda: time.sleep(0.01))
+
+        # Both workers are busy, the request waits in the queue much longer than the hedging delay.
+        executor = policy._get_executor()
+        for _ in range(2):
+            executor.submit(time.sleep, 0.2)
+
+        self.assertEqual(1, policy.run(lambda: 1))
+        self.assertEqual(0, policy.stats()["hedged"])
+
+    def test_pool_grows_with_callers(self):
+        policy = HedgingPolicy(max_workers=2)
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            start = time.monotonic()
+            futures = [callers.submit(policy.run, lambda: time.sleep(0.2)) for _ in range(8)]
+            for future in futures:
+                future.result()
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    def test_failure(self):
+        policy = HedgingPolicy()
+        self.assertRaises(ZeroDivisionError, policy.run, lambda: 1 / 0)
+
+    def test_evaluator(self):
+        evaluator = init_evaluator(hedging=HedgingPolicy(min_samples=1))
+        post = FakePost()
+        with post.patch():
+            res = evaluator.evaluate({"expected": "a", "actual": "b"})
+        self.assertEqual(1.0, res["contradictions"].score)
+        self.assertRaises(ValueError, init_evaluator, hedging=0.95)
@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest import TestCase
+
+import pandas as pd
+
+from evalmyai import BatchingPolicy, EvaluationJob, SimulatedServer
+from evalmyai._scheduler import run_tasks
+
+from tests.utils import init_evaluator
+
+
+class TestJobs(TestCase):
+    def setUp(self):
+        self.server = SimulatedServer(latency=0.02).start()
+        self.addCleanup(self.server.shutdown)
+        self.data = pd.DataFrame(
+            {
+                "expected": [f"fact {i}" for i in range(30)],
+                "actual": [f"fact {i} and more" for i in range(30)],
+            },
+            index=range(100, 130),
+        )
+
+    def test_run_tasks_cancel(self):
+        cancel = threading.Event()
+
+        def func(task, deadline):
+            if task == 2:
+                cancel.set()
+            return task
+
+        outcomes = run_tasks(func, list(range(5)), cancel=cancel)
+        self.assertEqual([(0, None), (1, None), (2, None)], outcomes[:3])
+        self.assertTrue(all(isinstance(err, CancelledError) for _, err in outcomes[3:]))
+
+    def test_submit_dataset(self):
+        evaluator = init_evaluator(url=self.server.url)
+        expected = evaluator.evaluate_dataset(self.data, symbols=["contradictions", "f1"])
+
+        job = evaluator.submit_dataset(self.data, symbols=["contradictions", "f1"], max_workers=4)
+        self.assertIsInstance(job, EvaluationJob)
+        result = job.result(timeout=10)
+
+        pd.testing.assert_frame_equal(expected, result)
+        pd.testing.assert_frame_equal(expected, job.partial_result())
+        progress = job.progress()
+        self.assertEqual("finished", progress["state"])
+        self.assertEqual((30, 30, 0), (progress["total"], progress["finished"], progress["errors"]))
+
+        self.assertRaises(ValueError, evaluator.submit_dataset, self.data[["expected"]])
+
+    def test_partial_result_and_cancel(self):
+        evaluator = init_evaluator(url=self.server.url)
+        data = self.data.copy()
+        data.loc[105, "actual"] = None
+
+        job = evaluator.submit_dataset(data, max_workers=2)
+        self.assertRaises(TimeoutError, job.result, timeout=0.001)
+
+        while job.progress()["finished"] < 6:
+            time.sleep(0.005)
+        partial = job.partial_result()
+        self.assertGreaterEqual(len(partial), 6)
+        self.assertIn(105, partial.index)
+        self.assertTrue(partial.index.isin(data.index).all())
+
+        job.cancel()
+        result = job.result(timeout=10)
+        self.assertTrue(job.done())
+        self.assertEqual("cancelled", job.progress()["state"])
+        self.assertEqual(30, len(result))
+        errors = result["error"].tolist()
+        self.assertTrue(any(isinstance(e, CancelledError) for e in errors))
+        self.assertTrue(sum(e is None for e in errors) >= 5)
+
+    def test_submit_batch(self):
+        evaluator = init_evaluator(
+            url=self.server.url, batching=BatchingPolicy(max_rows=4, combine_symbols=False)
+        )
+        entries = self.data.to_dict("records")
+        expected = evaluator.evaluate_batch(entries, symbols=["contradictions", "f1"])
+
+        job = evaluator.submit_batch(entries, symbols=["contradictions", "f1"], max_workers=3)
+        results, errors = job.result(timeout=10)
+
+        self.assertEqual([None] * 30, errors)
+        self.assertEqual(
+            [r["f1"].scores for r in expected[0]], [r["f1"].scores for r in results]
+        )
+        partial = job.partial_result()
+        self.assertEqual(["contradictions", "f1", "error"], list(partial.columns))
+        self.assertEqual(list(range(30)), sorted(partial.index))
+
+    def test_null_scores_and_schedule_report(self):
+        def handle(path, request):
+            if request["input_data"]["expected"] == "fact 3":
+                return 200, {"scores": None, "reasoning": "Model capacity exceeded."}
+            return SimulatedServer.handle(self.server, path, request)
+
+        self.server.handle = handle
+        evaluator = init_evaluator(url=self.server.url)
+        job = evaluator.submit_dataset(self.data, max_workers=4)
+        result = job.result(timeout=10)
+
+        self.assertEqual("finished", job.progress()["state"])
+        self.assertIsInstance(result["error"].loc[103], RuntimeError)
+        self.assertEqual("Model capacity exceeded.", str(result["error"].loc[103]))
+        self.assertEqual(29, result["error"].isna().sum())
+        self.assertEqual(30, job.schedule_report.summary()["tasks"])
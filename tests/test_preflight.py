@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from evalmyai import preflight_dataset
+
+from tests.utils import init_evaluator, FakePost
+
+
+def make_data():
+    return pd.DataFrame(
+        {
+            "expected": ["a", "", None, "bb", "c"],
+            "actual": ["x", "y", "z", np.nan, 5],
+            "context": ["ctx", None, "ctx", "ctx", 1],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+
+class TestPreflight(TestCase):
+    def test_report(self):
+        invalid, stats = preflight_dataset(make_data())
+
+        self.assertEqual([11, 12, 13, 14], invalid.index.tolist())
+        self.assertEqual("expected: empty", invalid[11])
+        self.assertEqual("expected: missing", invalid[12])
+        self.assertEqual("actual: missing", invalid[13])
+        self.assertEqual("actual: not a string; context: not a string", invalid[14])
+
+        self.assertEqual(5, stats["rows"])
+        self.assertEqual(1, stats["valid"])
+        self.assertEqual(4, stats["invalid"])
+        self.assertEqual(3, stats["chars_context"])
+        self.assertEqual(2005, stats["estimated_chars"])
+
+    def test_valid_and_non_string_columns(self):
+        data = pd.DataFrame({"expected": ["a", "b"], "actual": ["c", "d"]})
+        invalid, stats = preflight_dataset(data)
+        self.assertTrue(invalid.empty)
+        self.assertEqual(2, stats["valid"])
+
+        invalid, _ = preflight_dataset(pd.DataFrame({"expected": ["a"], "actual": [1.5]}))
+        self.assertEqual("actual: not a string", invalid[0])
+
+        self.assertRaises(ValueError, preflight_dataset, pd.DataFrame({"expected": ["a"]}))
+
+    def test_invalid_rows_are_not_sent(self):
+        evaluator = init_evaluator()
+        post = FakePost()
+
+        with post.patch():
+            result = evaluator.evaluate_dataset(make_data(), max_workers=2)
+
+        self.assertEqual(1, len(post.calls))
+        self.assertEqual([10, 11, 12, 13, 14], result.index.tolist())
+        self.assertIsNone(result["error"][10])
+        self.assertEqual("Invalid row: expected: empty.", str(result["error"][11]))
+        self.assertTrue(np.isnan(result["scores_con"][12]["score"]))
+
+    def test_on_invalid(self):
+        evaluator = init_evaluator()
+        post = FakePost()
+
+        with post.patch():
+            result = evaluator.evaluate_dataset(make_data(), on_invalid="skip")
+            self.assertRaisesRegex(
+                ValueError,
+                "4 invalid rows found, the first one 11",
+                evaluator.evaluate_dataset,
+                make_data(),
+                on_invalid="raise",
+            )
+
+        self.assertEqual([10], result.index.tolist())
+        self.assertEqual(1, len(post.calls))
+        self.assertRaises(ValueError, evaluator.evaluate_dataset, make_data(), on_invalid="drop")
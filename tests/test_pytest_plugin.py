@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from unittest import TestCase, mock
+
+from evalmyai._result import SymbolResult
+from evalmyai._broker import BrokerClient
+from evalmyai._evalmyai import DEFAULT_SYMBOLS
+from evalmyai.pytest_plugin import EvaluationEngine, assert_score, assert_no_severity, _get_engine
+from evalmyai import pytest_plugin
+from tests.utils import init_evaluator, FakePost
+
+CONFTEST = """
+from tests.utils import init_evaluator, FakePost
+
+post = FakePost(delay=0.2)
+post.patch().start()
+
+
+def pytest_evalmyai_evaluator(config):
+    return init_evaluator()
+"""
+
+
+class TestPytestPlugin(TestCase):
+    def test_engine(self):
+        post = FakePost()
+        engine = EvaluationEngine(init_evaluator(), max_workers=4)
+        with post.patch():
+            futures = [engine.submit({"expected": "a", "actual": "b"}) for _ in range(3)]
+            self.assertEqual(1.0, futures[0].result()["contradictions"].score)
+            self.assertIs(futures[0], futures[2])
+            engine.evaluate({"expected": "a", "actual": "c"})
+        self.assertEqual(2, len(post.calls))
+        engine.shutdown()
+
+    def test_assertions(self):
+        reasoning = '{"statements": [{"severity": "large", "summary": "Wrong city.", "reasoning": ""}]}'
+        result = {"contradictions": SymbolResult("contradictions", {"score": 0.5}, reasoning)}
+        assert_score(result, 0.5)
+        with self.assertRaisesRegex(AssertionError, "Wrong city"):
+            assert_score(result, 0.9)
+        assert_no_severity(result, ("critical",))
+        self.assertRaises(AssertionError, assert_no_severity, result)
+
+    def test_lazy_import(self):
+        self.assertEqual(DEFAULT_SYMBOLS, pytest_plugin.DEFAULT_SYMBOLS)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run(
+            [sys.executable, "-c", "import sys, evalmyai.pytest_plugin; print('pandas' in sys.modules)"],
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=os.path.join(root, "src")),
+        )
+        self.assertEqual("False", proc.stdout.strip(), proc.stderr)
+
+    def test_broker_option_keeps_evaluator(self):
+        evaluator = init_evaluator()
+        config = mock.Mock(_evalmyai_engine=None)
+        config.hook.pytest_evalmyai_evaluator.return_value = evaluator
+        config.getoption = {"evalmyai_broker": "127.0.0.1:1", "evalmyai_workers": 2, "evalmyai_retry": 1}.get
+
+        engine = _get_engine(config)
+        self.assertIsInstance(engine.evaluator.broker, BrokerClient)
+        self.assertIsNone(evaluator.broker)
+        engine.shutdown()
+
+    def test_session(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "conftest.py"), "w") as fo:
+                fo.write(CONFTEST)
+            with open(os.path.join(tmp, "test_llm.py"), "w") as fo:
+                fo.write(
+                    textwrap.dedent(
+                        """
+                        import pytest
+                        from evalmyai.pytest_plugin import assert_score
+
+                        @pytest.mark.parametrize(
+                            "actual",
+                            [
+                                pytest.param(
+                                    i, marks=pytest.mark.evalmyai(expected="a", actual=f"b{i}")
+                                )
+                                for i in range(10)
+                            ],
+                        )
+                        def test_answer(actual, evalmyai_result):
+                            assert_score(evalmyai_result, 0.9)
+
+                        def test_unmarked(evalmyai_result):
+                            pass
+                        """
+                    )
+                )
+
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(root, "src"), root]))
+            proc = subprocess.run(
+                [sys.executable, "-m", "pytest", "-p", "evalmyai.pytest_plugin", "-q",
+                 "--durations=0", "-p", "no:cacheprovider", tmp],
+                capture_output=True,
+                text=True,
+                env=env,
+                cwd=tmp,
+            )
+
+        self.assertIn("10 passed, 1 error", proc.stdout, proc.stdout + proc.stderr)
+        # The evaluations run concurrently, only the first test waits for its result.
+        self.assertLessEqual(proc.stdout.count("s setup"), 2, proc.stdout)
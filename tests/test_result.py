@@ -0,0 +1,55 @@
+import json
+from unittest import TestCase
+
+from evalmyai._result import SymbolResult, Reasoning
+
+
+class TestSymbolResult(TestCase):
+    statements = [{"severity": "large", "summary": "bad", "reasoning": "seems wrong"}]
+
+    def test_scores(self):
+        res = SymbolResult("contradictions", {"score": 1}, "{}")
+        self.assertEqual(1.0, res.score)
+        self.assertIsNone(res.f1)
+        self.assertEqual({"score": 1.0}, res["scores"])
+
+        res = SymbolResult(
+            "f1", {"f1": 0.5, "correctness": 1.0, "completeness": 0.25}, "{}"
+        )
+        self.assertEqual(["f1", "correctness", "completeness"], list(res.scores))
+
+        self.assertRaises(ValueError, SymbolResult, "contradictions", {"score": "0"}, "")
+        self.assertRaises(ValueError, SymbolResult, "contradictions", {}, "")
+        self.assertRaises(ValueError, SymbolResult, "unknown", {"score": 1.0}, "")
+
+    def test_lazy_reasoning(self):
+        raw = json.dumps({"statements": self.statements})
+        res = SymbolResult("missing_facts", {"score": 0.5}, raw)
+        self.assertIs(raw, res.reasoning_json)
+        self.assertEqual(
+            ["severity", "summary", "reasoning"], list(res["reasoning"]["statements"][0])
+        )
+
+        res = SymbolResult("missing_facts", {"score": 0.5}, '{"statements": [{}]}')
+        self.assertRaises(ValueError, lambda: res.reasoning)
+
+    def test_dict_view(self):
+        raw = json.dumps({"statements": self.statements})
+        res = SymbolResult("contradictions", {"score": 0.5}, raw)
+        self.assertEqual(["scores", "reasoning"], list(res))
+        self.assertEqual(res.to_dict(), dict(res))
+        self.assertEqual(
+            {"scores": {"score": 0.5}, "reasoning": {"statements": self.statements}},
+            json.loads(json.dumps(res.to_dict())),
+        )
+        self.assertRaises(AttributeError, setattr, res, "other", 1)
+
+    def test_reasoning_mapping(self):
+        raw = json.dumps({"statements": self.statements})
+        reasoning = Reasoning(raw)
+        self.assertIs(raw, reasoning.json)
+        self.assertEqual("large", reasoning["statements"][0]["severity"])
+        self.assertEqual({"statements": self.statements}, reasoning)
+        self.assertEqual(raw, json.dumps(reasoning.to_dict()))
+        self.assertEqual(repr({"statements": self.statements}), repr(reasoning))
+        self.assertEqual(json.loads(Reasoning({"statements": []}).json), {"statements": []})
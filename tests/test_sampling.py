@@ -0,0 +1,93 @@
+import itertools
+import json
+import threading
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from evalmyai import SamplingPolicy
+from evalmyai._result import SymbolResult
+
+from tests.utils import init_evaluator, FakePost
+
+
+def cycling(*scores):
+    values = itertools.cycle(scores)
+    lock = threading.Lock()
+
+    def score(json):
+        with lock:
+            return next(values)
+
+    return score
+
+
+class TestSamplingPolicy(TestCase):
+    def test_validation(self):
+        self.assertRaises(ValueError, SamplingPolicy, min_calls=1)
+        self.assertRaises(ValueError, SamplingPolicy, min_calls=3, max_calls=2)
+        self.assertRaises(ValueError, SamplingPolicy, step=0)
+        self.assertRaises(ValueError, SamplingPolicy, max_std=None, max_ci=None)
+        self.assertRaises(ValueError, SamplingPolicy, confidence=1)
+
+    def test_is_stable(self):
+        policy = SamplingPolicy(min_calls=2, max_calls=4, max_ci=0.1)
+        self.assertFalse(policy.is_stable(np.array([0.5])))
+        self.assertTrue(policy.is_stable(np.array([0.5, 0.5])))
+        self.assertFalse(policy.is_stable(np.array([0.0, 1.0, 0.0])))
+        self.assertTrue(policy.is_stable(np.array([0.0, 1.0, 0.0, 1.0])))
+
+        policy = SamplingPolicy(max_std=0.2, max_ci=None)
+        self.assertTrue(policy.is_stable(np.array([0.5, 0.7])))
+        self.assertFalse(policy.is_stable(np.array([0.5, 1.0])))
+
+    def test_run_stops_early(self):
+        policy = SamplingPolicy(min_calls=2, max_calls=5)
+        res = policy.run(lambda: SymbolResult("contradictions", {"score": 0.5}, "{}"))
+        self.assertEqual(2, res.n_samples)
+        self.assertEqual(0.0, res.std)
+        self.assertEqual(0.5, res.score)
+
+    def test_run_aggregates(self):
+        samples = iter([0.0, 1.0, 0.0, 1.0, 0.75])
+        lock = threading.Lock()
+
+        def sample():
+            with lock:
+                score = next(samples)
+            return SymbolResult("f1", {"f1": score, "correctness": 1.0, "completeness": score}, f'{{"statements": [], "id": {score}}}')
+
+        res = SamplingPolicy(min_calls=2, max_calls=5, step=2).run(sample)
+        self.assertEqual(5, res.n_samples)
+        self.assertAlmostEqual(0.55, res.f1)
+        self.assertEqual(1.0, res.correctness)
+        self.assertEqual(0.75, json.loads(res.reasoning_json)["id"])
+        self.assertEqual(["scores", "reasoning", "n_samples", "std"], list(res.to_dict()))
+
+    def test_evaluate(self):
+        evaluator = init_evaluator()
+        config = evaluator.make_config(
+            sampling=SamplingPolicy(min_calls=2, max_calls=4, max_ci=0.1)
+        )
+        post = FakePost(score=cycling(0.0, 1.0))
+
+        with post.patch():
+            res = evaluator.evaluate({"expected": "a", "actual": "b"}, config=config)
+
+        self.assertEqual(4, len(post.calls))
+        self.assertEqual(4, res["contradictions"].n_samples)
+        self.assertEqual(0.5, res["contradictions"].score)
+        self.assertRaises(ValueError, evaluator.make_config, sampling=3)
+
+    def test_evaluate_dataset_columns(self):
+        evaluator = init_evaluator()
+        config = evaluator.make_config(sampling=SamplingPolicy(min_calls=3))
+        data = pd.DataFrame({"expected": ["a", "b", ""], "actual": ["c", "d", "e"]})
+
+        with FakePost(score=0.8).patch():
+            result = evaluator.evaluate_dataset(data, config=config, max_workers=2)
+
+        self.assertEqual([3, 3, 0], result["samples_con"].tolist())
+        np.testing.assert_allclose([0.0, 0.0], result["std_con"][:2], atol=1e-9)
+        self.assertTrue(np.isnan(result["std_con"][2]))
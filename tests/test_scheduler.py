@@ -0,0 +1,69 @@
+import threading
+import time
+from unittest import TestCase
+
+import pandas as pd
+
+from evalmyai._scheduler import run_tasks, estimate_cost, deadline_from
+from tests.utils import init_evaluator, FakePost
+
+
+class TestScheduler(TestCase):
+    def test_longest_first(self):
+        started = []
+        lock = threading.Lock()
+
+        def func(task, deadline):
+            with lock:
+                started.append(task)
+            time.sleep(task / 1000)
+            return task * 2
+
+        reports = []
+        tasks = [1, 50, 3, 20, 20]
+        outcomes = run_tasks(
+            func, tasks, max_workers=1, cost=float, report=reports.append
+        )
+        self.assertEqual(tasks, started)
+
+        started.clear()
+        outcomes = run_tasks(
+            func, tasks, max_workers=2, cost=float, report=reports.append
+        )
+        self.assertEqual([50, 20], sorted(started[:2], reverse=True))
+        self.assertEqual([(t * 2, None) for t in tasks], outcomes)
+        self.assertEqual([1, 3, 4, 2, 0], list(reports[-1].dispatch_order))
+        self.assertEqual(5, reports[-1].summary()["tasks"])
+        self.assertGreater(reports[-1].summary()["rank_correlation"], 0)
+
+    def test_deadline(self):
+        outcomes = run_tasks(
+            lambda task, deadline: time.sleep(0.05),
+            range(5),
+            deadline=deadline_from(0.08),
+        )
+        self.assertIsNone(outcomes[0][1])
+        self.assertIsInstance(outcomes[-1][1], TimeoutError)
+        self.assertRaises(ValueError, run_tasks, print, [], max_workers=0)
+
+    def test_estimate_cost(self):
+        self.assertLess(
+            estimate_cost({"expected": "a", "actual": "b"}),
+            estimate_cost({"expected": "a", "actual": "b", "context": "c" * 100}),
+        )
+        self.assertEqual(
+            2 * estimate_cost({"expected": "a", "actual": "b"}),
+            estimate_cost({"expected": "a", "actual": "b"}, 2),
+        )
+
+    def test_dataset_order(self):
+        data = pd.DataFrame(
+            {"expected": ["a", "b" * 5000, "c"], "actual": ["x", "y", "z" * 100]}
+        )
+        post = FakePost()
+        evaluator = init_evaluator()
+        with post.patch():
+            result = evaluator.evaluate_dataset(data, max_workers=2)
+        self.assertEqual("b" * 5000, post.calls[0][1]["input_data"]["expected"])
+        self.assertTrue(result.index.equals(data.index))
+        self.assertEqual([1, 2, 0], list(evaluator.last_schedule_report.dispatch_order))
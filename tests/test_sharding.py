@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from evalmyai._sharding import shard_ids, select_shard, merge_shards
+from tests.utils import init_evaluator, FakePost
+
+
+class TestSharding(TestCase):
+    data = pd.DataFrame(
+        data={
+            "expected": [f"e{i}" for i in range(50)],
+            "actual": [f"a{i}" for i in range(50)],
+        },
+        index=[f"row{i % 40}" for i in range(50)],
+    )
+
+    def test_shard_ids(self):
+        ids = shard_ids(self.data.index, 4)
+        self.assertTrue(np.array_equal(ids, shard_ids(self.data.index.copy(), 4)))
+        self.assertTrue(((ids >= 0) & (ids < 4)).all())
+        self.assertRaises(ValueError, shard_ids, self.data.index, 0)
+
+    def test_select_shard(self):
+        shards = [select_shard(self.data, i, 3) for i in range(3)]
+        self.assertEqual(len(self.data), sum(len(s) for s in shards))
+        self.assertRaises(ValueError, select_shard, self.data, 3, 3)
+
+    def test_merge_shards(self):
+        shards = []
+        for i in reversed(range(3)):
+            shard = select_shard(self.data, i, 3).copy()
+            shard.attrs["shard"] = (i, 3)
+            shards.append(shard)
+
+        merged = merge_shards(shards, self.data.index)
+        self.assertTrue(merged.equals(self.data))
+
+        self.assertRaises(ValueError, merge_shards, shards[:2], self.data.index)
+        self.assertRaises(ValueError, merge_shards, shards + shards[:1], self.data.index)
+
+    def test_merge_skipped_shards(self):
+        data = self.data.iloc[:40].copy()
+        data.iloc[[3, 17], 1] = None
+        evaluator = init_evaluator()
+
+        with FakePost().patch():
+            shards = [evaluator.evaluate_dataset(data, shard=(i, 3), on_invalid="skip") for i in range(3)]
+            whole = evaluator.evaluate_dataset(data, on_invalid="skip")
+
+        merged = merge_shards(shards, data.index)
+        pd.testing.assert_frame_equal(whole, merged)
+        self.assertEqual(38, len(merged))
+
+        self.assertRaises(ValueError, merge_shards, shards, self.data.index)
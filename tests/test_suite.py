@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from tests.utils import init_evaluator, make_response, FakePost
+
+
+class TestSuite(TestCase):
+    test_case = {
+        "name": "geography",
+        "context": "School test.",
+        "scoring": {"contradictions": None},
+        "items": [
+            {"context": "Question: Capital of France?", "expected": "Paris", "actual": "Paris."},
+            {"expected": "Europe", "actual": "Australia."},
+            {"expected": "Nile"},
+        ],
+    }
+
+    def test_evaluate_test_case_does_not_modify_input(self):
+        test_case = json.loads(json.dumps(self.test_case))
+        post = FakePost()
+        with post.patch():
+            result = init_evaluator().evaluate_test_case(test_case, max_workers=2)
+
+        self.assertEqual(self.test_case, test_case)
+        self.assertEqual("School test.", result["context"])
+        self.assertEqual("Question: Capital of France?", result["items"][0]["context"])
+        self.assertNotIn("context", result["items"][1])
+        self.assertEqual(
+            ["School test.", "School test.\nQuestion: Capital of France?"],
+            sorted(call[1]["input_data"]["context"] for call in post.calls),
+        )
+        self.assertEqual(1.0, result["items"][1]["contradictions"]["scores"]["score"])
+        self.assertEqual("No actual value.", result["items"][2]["error"])
+
+    def test_evaluate_suite(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3):
+                with open(os.path.join(tmp, f"case_{i}.json"), "w") as fo:
+                    json.dump(self.test_case, fo)
+            with open(os.path.join(tmp, "broken.json"), "w") as fo:
+                fo.write("{")
+
+            output_dir = os.path.join(tmp, "out")
+            post = FakePost()
+            with post.patch():
+                summary = init_evaluator().evaluate_suite(tmp, output_dir)
+
+            self.assertEqual(6, len(post.calls))
+            self.assertEqual(4, summary["cases"])
+            self.assertEqual(9, summary["items"])
+            self.assertEqual(3, summary["errors"])
+            self.assertIn("error", summary["test_cases"][0])
+            self.assertEqual({"contradictions": 1.0}, summary["test_cases"][1]["scores"])
+
+            with open(os.path.join(output_dir, "case_0.json")) as fi:
+                self.assertEqual(3, len(json.load(fi)["items"]))
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "summary.json")))
+
+        self.assertRaises(ValueError, init_evaluator().evaluate_suite, "/nonexistent/*.json")
+
+    def test_evaluate_suite_nested(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a", "b"):
+                os.makedirs(os.path.join(tmp, "suite", name))
+                with open(os.path.join(tmp, "suite", name, "case.json"), "w") as fo:
+                    json.dump(dict(self.test_case, name=name), fo)
+
+            output_dir = os.path.join(tmp, "out")
+            with FakePost().patch():
+                summary = init_evaluator().evaluate_suite(os.path.join(tmp, "suite", "**", "*.json"), output_dir)
+
+            outputs = [case["output"] for case in summary["test_cases"]]
+            self.assertEqual(
+                [os.path.join(output_dir, "a", "case.json"), os.path.join(output_dir, "b", "case.json")], outputs
+            )
+            for name, output in zip(("a", "b"), outputs):
+                with open(output) as fi:
+                    self.assertEqual(name, json.load(fi)["name"])
+
+    def test_evaluate_suite_write_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(2):
+                with open(os.path.join(tmp, f"case_{i}.json"), "w") as fo:
+                    json.dump(self.test_case, fo)
+
+            # A directory in place of the first result file makes its writing fail.
+            output_dir = os.path.join(tmp, "out")
+            os.makedirs(os.path.join(output_dir, "case_0.json"))
+            with FakePost().patch():
+                summary = init_evaluator().evaluate_suite(tmp, output_dir)
+
+            failed, written = summary["test_cases"]
+            self.assertIn("Writing the result failed", failed["error"])
+            self.assertNotIn("output", failed)
+            self.assertEqual(3, failed["items"])
+            self.assertTrue(os.path.isfile(written["output"]))
+            self.assertNotIn("error", written)
+
+    def test_malformed_reasoning(self):
+        with mock.patch("evalmyai._evalmyai.requests.post", lambda *a, **kw: make_response(statements=[{"severity": 1}])):
+            result = init_evaluator().evaluate_test_case(self.test_case)
+
+        self.assertIn("Wrong output data format", result["items"][0]["error"])
+        self.assertNotIn("contradictions", result["items"][0])
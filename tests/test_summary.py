@@ -0,0 +1,84 @@
+import json
+from collections import OrderedDict
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from evalmyai._result import Reasoning
+from evalmyai._summary import score_frame, summarize, severity_counts, compare_runs
+
+
+def make_result(scores, groups):
+    reasons = [
+        json.dumps({"statements": [{"severity": "large" if s < 1 else "negligible"}]})
+        if s == s
+        else ""
+        for s in scores
+    ]
+    return pd.DataFrame(
+        {
+            "scores_con": [OrderedDict(score=s) for s in scores],
+            "reason_con": reasons,
+            "scores_f1": [
+                OrderedDict(f1=s, correctness=s, completeness=1.0) for s in scores
+            ],
+            "error": [None if s == s else "error" for s in scores],
+        },
+        index=pd.MultiIndex.from_arrays(
+            [groups, range(len(scores))], names=["group", "row"]
+        ),
+    )
+
+
+class TestSummary(TestCase):
+    result = make_result([1.0, 0.5, np.nan, 0.0], ["a", "a", "b", "b"])
+
+    def test_score_frame(self):
+        scores = score_frame(self.result)
+        self.assertEqual(
+            ["con", "f1", "f1_correctness", "f1_completeness"], list(scores.columns)
+        )
+        self.assertEqual(0.5, scores["con"].iloc[1])
+        self.assertTrue(np.isnan(scores["con"].iloc[2]))
+        self.assertRaises(ValueError, score_frame, self.result[["error"]])
+
+    def test_summarize(self):
+        summary = summarize(self.result, n_boot=200, seed=0)
+        self.assertEqual(3, summary.loc["con", "count"])
+        self.assertEqual(1, summary.loc["con", "errors"])
+        self.assertEqual(0.5, summary.loc["con", "mean"])
+        self.assertLessEqual(summary.loc["con", "ci_low"], 0.5)
+        self.assertGreaterEqual(summary.loc["con", "ci_high"], 0.5)
+
+        summary = summarize(self.result, by="group", n_boot=0)
+        self.assertEqual(0.75, summary.loc[("a", "con"), "mean"])
+        self.assertEqual(0.0, summary.loc[("b", "con"), "q0.5"])
+        self.assertNotIn("ci_low", summary.columns)
+
+    def test_severity_counts(self):
+        counts = severity_counts(self.result)
+        self.assertEqual(2, counts.loc["con", "large"])
+        self.assertEqual(1, counts.loc["con", "negligible"])
+        self.assertEqual(0, counts.loc["con", "critical"])
+
+        result = self.result.assign(
+            reason_con=[{"statements": [{"severity": "critical"}]}] * 4
+        )
+        counts = severity_counts(result, by="group")
+        self.assertEqual(2, counts.loc[("b", "con"), "critical"])
+
+        statement = {"severity": "small", "summary": "Says 'severity': 'critical' instead."}
+        reason = json.dumps({"statements": [statement]})
+        result = self.result.assign(reason_con=[reason, Reasoning(reason), "", "not json"])
+        counts = severity_counts(result)
+        self.assertEqual(2, counts.loc["con", "small"])
+        self.assertEqual(0, counts.loc["con", "critical"])
+
+    def test_compare_runs(self):
+        candidate = make_result([1.0, 1.0, 1.0, 0.0], ["a", "a", "b", "b"])
+        comparison = compare_runs(self.result, candidate, n_boot=100, seed=0)
+        self.assertEqual(3, comparison.loc["con", "count"])
+        self.assertAlmostEqual(0.5 / 3, comparison.loc["con", "diff"])
+        self.assertEqual(1, comparison.loc["con", "improved"])
+        self.assertEqual(0, comparison.loc["con", "worsened"])
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+import pandas as pd
+import requests
+
+from tests.utils import init_evaluator, FakePost
+
+
+class TestTimeouts(TestCase):
+    def test_request_timeout(self):
+        evaluator = init_evaluator(timeout=(1, 2))
+        post = FakePost()
+        with post.patch():
+            evaluator.evaluate({"expected": "a", "actual": "b"})
+        self.assertEqual((1, 2), post.calls[0][2])
+
+        self.assertRaises(ValueError, init_evaluator, timeout=(1, 2, 3))
+        self.assertRaises(ValueError, init_evaluator, row_timeout=0)
+
+    def test_retry_after_timeout(self):
+        evaluator = init_evaluator(timeout=0.05)
+        with FakePost(delay=0.1).patch():
+            self.assertRaises(
+                requests.exceptions.Timeout,
+                evaluator.evaluate,
+                {"expected": "a", "actual": "b"},
+                retry_cnt=2,
+            )
+
+    def test_row_timeout(self):
+        evaluator = init_evaluator(timeout=1, row_timeout=0.15)
+        post = FakePost(delay=0.1, status_code=500)
+        with post.patch():
+            self.assertRaises(
+                TimeoutError,
+                evaluator.evaluate,
+                {"expected": "a", "actual": "b"},
+                retry_cnt=5,
+            )
+        self.assertEqual(2, len(post.calls))
+        self.assertLess(post.calls[1][2], 0.1)
+
+    def test_run_deadline(self):
+        evaluator = init_evaluator()
+        data = pd.DataFrame({"expected": ["a"] * 10, "actual": ["b"] * 10})
+        with FakePost(delay=0.05).patch():
+            result = evaluator.evaluate_dataset(data, deadline=0.12)
+        timed_out = result["error"].map(lambda e: isinstance(e, TimeoutError))
+        self.assertTrue(timed_out.iloc[-1])
+        self.assertIsNone(result["error"].iloc[0])
+        self.assertEqual(1.0, result["scores_con"].iloc[0]["score"])
+
+        with FakePost(delay=0.05).patch():
+            results, errors = evaluator.evaluate_batch(
+                [{"expected": "a", "actual": "b"}] * 10, deadline=0.12
+            )
+        self.assertIsNotNone(results[0])
+        self.assertIsInstance(errors[-1], TimeoutError)
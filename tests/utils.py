@@ -0,0 +1,54 @@
+import json
+import time
+from unittest import mock
+
+import requests
+
+from evalmyai._evalmyai import Evaluator, OpenAIAuth
+
+token = "x" * 64
+
+auth = OpenAIAuth(api_key="sk-test", model="gpt-4o")
+
+
+def init_evaluator(**kwargs):
+    return Evaluator(auth, token, **kwargs)
+
+
+def make_response(status_code=200, score=1.0, statements=None):
+    """Builds a `requests.Response` as returned by the evalmy.ai service."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "OK" if status_code == 200 else "Error"
+    response.url = "http://test"
+    body = {
+        "scores": {"score": score, "f1": score, "correctness": score, "completeness": score},
+        "reasoning": json.dumps({"statements": statements or []}),
+    }
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class FakePost:
+    """Replacement of `requests.post` answering with a fixed response after a delay."""
+
+    def __init__(self, delay=0.0, score=1.0, status_code=200):
+        self.delay = delay
+        self.score = score
+        self.status_code = status_code
+        self.calls = []
+
+    def __call__(self, url, json=None, timeout=None, **kwargs):
+        self.calls.append((url, json, timeout))
+        delay = self.delay(json) if callable(self.delay) else self.delay
+        if timeout is not None:
+            read = timeout[1] if isinstance(timeout, tuple) else timeout
+            if delay > read:
+                time.sleep(read)
+                raise requests.exceptions.ReadTimeout("Read timed out.")
+        time.sleep(delay)
+        score = self.score(json) if callable(self.score) else self.score
+        return make_response(self.status_code, score)
+
+    def patch(self):
+        return mock.patch("evalmyai._evalmyai.requests.post", self)